@@ -1,123 +1,147 @@
 import streamlit as st
 import os
-import json
+import time
+import hashlib
 from src.config import load_config
-from src.jd_processing import load_jd, split_jd, embed_and_save_chunks
-from src.kor_extraction import extract_structured_info
-from src.title_generation import generate_alternate_titles
-from src.tavily_search import search_linkedin_profiles
-from src.rapidapi_enrich import enrich_profiles_with_rapidapi
-from src.scoring import score_candidates
-from src.messaging import craft_linkedin_messages
+from src.background_run import BackgroundPipelineRun
+from src.candidate import get_profile_name
+from src.metrics import METRICS
 
-def get_profile_name(profile):
-    # Try common name fields
-    for key in ['name', 'full_name']:
-        if key in profile and profile[key]:
-            return profile[key]
-    # Try first_name + last_name
-    if profile.get('first_name') or profile.get('last_name'):
-        return f"{profile.get('first_name', '')} {profile.get('last_name', '')}".strip()
-    # Fallback: use headline or 'N/A'
-    return profile.get('headline', 'N/A')
 
-st.title("LinkedIn AI Sourcing Agent (Text Output)")
-st.write("""
-Upload a job description and run the sourcing pipeline. Results will be shown in a readable text format at each step.
-""")
+def render_metrics():
+    """
+    Shows where time and money went: per-stage timings, HTTP retries, cache hit rates and LLM usage.
+    """
+    snap = METRICS.snapshot()
+    with st.expander(f"Performance (estimated LLM cost ${snap['llm_cost_usd']:.4f})"):
+        if snap["stages"]:
+            st.markdown("**Stages:**")
+            st.table([{"stage": name, **entry} for name, entry in snap["stages"].items()])
+        if snap["http"]:
+            st.markdown("**HTTP providers:**")
+            st.table([{"provider": name, **entry} for name, entry in snap["http"].items()])
+        if snap["caches"]:
+            st.markdown("**Caches:**")
+            st.table([{"cache": name, **entry} for name, entry in snap["caches"].items()])
+        if snap["llm"]:
+            st.markdown("**LLM usage:**")
+            st.table([{"model": name, **entry} for name, entry in snap["llm"].items()])
+        col_json, col_prom, col_reset = st.columns(3)
+        col_json.download_button("Metrics JSON", METRICS.to_json(), file_name="metrics.json")
+        col_prom.download_button("Prometheus text", METRICS.to_prometheus(), file_name="metrics.prom")
+        if col_reset.button("Reset metrics"):
+            METRICS.reset()
 
-config = load_config()
 
-# Step 1: Upload JD file
-jd_file = st.file_uploader("Upload Job Description (.txt)", type=["txt"])
-jd_text = None
-if jd_file:
-    jd_text = jd_file.read().decode("utf-8")
-    st.markdown("**Job Description Preview:**")
-    st.write(jd_text[:1000] + ("..." if len(jd_text) > 1000 else ""))
+def render_run(state):
+    """
+    Renders whatever the background run has produced so far.
+    """
+    if state["error"]:
+        st.error(f"Pipeline failed: {state['error']}")
+    elif not state["done"]:
+        st.info(f"Running: {state['stage']}...")
 
-# Step 2: Extract structured info
-if st.button("Extract Structured Info") and jd_text:
-    structured_info = extract_structured_info(jd_text, config)
+    structured_info = state["structured_info"]
+    if structured_info is None:
+        return
     st.markdown("**Extracted Info:**")
-    for job in structured_info.get("job_info", []):
+    job_info = structured_info.get("job_info", [])
+    for job in job_info if isinstance(job_info, list) else [job_info]:
         st.write(f"Title: {job.get('title', '')}")
         st.write(f"Location: {job.get('location', '')}")
         st.write(f"Keywords: {job.get('keywords', '')}")
 
-# Step 3: Generate alternate titles
-    suggested_titles = generate_alternate_titles(structured_info, config)
+    if state["titles"] is None:
+        return
     st.markdown("**Suggested Titles:**")
-    for t in suggested_titles:
+    for t in state["titles"]:
         st.write(f"- {t}")
 
-# Step 4: Tavily search
-    linkedin_urls = search_linkedin_profiles(suggested_titles, config)
+    if state["linkedin_urls"] is None:
+        return
     st.markdown("**LinkedIn URLs Found:**")
-    for url in linkedin_urls:
+    for url in state["linkedin_urls"]:
         st.write(url)
 
-# Step 5: RapidAPI enrich (first 10 links)
-    enriched_profiles = enrich_profiles_with_rapidapi(linkedin_urls[:10], config)
-    # Flatten the structure to handle double 'data' nesting
-    flattened_profiles = []
-    for p in enriched_profiles:
-        if isinstance(p, dict) and 'data' in p:
-            if isinstance(p['data'], dict) and 'data' in p['data']:
-                flattened_profiles.append(p['data']['data'])
-            else:
-                flattened_profiles.append(p['data'])
-        else:
-            flattened_profiles.append(p)
-    # Filter for valid profiles with a linkedin_url
-    valid_profiles = [p for p in flattened_profiles if p.get('linkedin_url')]
+    valid_profiles = state["valid_profiles"]
+    if valid_profiles is None:
+        return
     if not valid_profiles:
-        st.warning("No valid enriched profiles were returned from RapidAPI. Scoring and messaging steps will be skipped.")
-    else:
-        st.markdown("**Enriched Profiles (first 10):**")
-        for idx, profile in enumerate(valid_profiles, 1):
-            name = get_profile_name(profile)
-            url = profile.get('linkedin_url', 'N/A')
-            headline = profile.get('headline', 'N/A')
-            st.write(f"{idx}. {name} | {headline}")
-            st.write(f"   {url}")
+        if state["done"]:
+            st.warning("No valid enriched profiles were returned from RapidAPI. Scoring and messaging steps will be skipped.")
+        return
+    st.markdown("**Enriched Profiles (first 10):**")
+    for idx, candidate in enumerate(valid_profiles, 1):
+        st.write(f"{idx}. {candidate.name} | {candidate.headline}")
+        st.write(f"   {candidate.linkedin_url}")
+    shortlisted = state["shortlisted_profiles"]
+    st.write(f"Pre-filter kept {len(shortlisted)} of {len(valid_profiles)} profiles for LLM scoring.")
 
-        # Step 6: Score candidates
+    scored = state["scored_candidates"]
+    messages = state["messages"]
+    st.markdown(f"**Scored Candidates ({len(scored)}/{len(shortlisted)}):**")
+    if state["first_candidate_at"] and state["started_at"]:
+        st.caption(f"First candidate after {state['first_candidate_at'] - state['started_at']:.1f}s")
+    for idx in sorted(scored):
+        cand = scored[idx]
+        name = get_profile_name(cand)
+        score = cand.get('fit_score', 'N/A')
+        url = cand.get('linkedin_url', 'N/A')
+        breakdown = cand.get('score_breakdown', {})
+        explanation = cand.get('explanation', None)
+        st.write(f"{name} | Score: {score}")
+        st.write(f"   {url}")
+        if breakdown:
+            st.markdown("**Score Breakdown:**")
+            for k, v in breakdown.items():
+                st.write(f"- {k.capitalize()}: {v}")
+        if explanation:
+            st.markdown("**Explanation:**")
+            st.write(explanation)
+        msg = messages.get(idx)
+        if msg:
+            st.markdown("**Outreach Message:**")
+            st.write(f"To: {msg.get('name', 'N/A')} ({msg.get('linkedin_url', 'N/A')})")
+            st.write(msg.get('message', ''))
+        st.markdown("---")
+
+
+st.title("LinkedIn AI Sourcing Agent (Text Output)")
+st.write("""
+Upload a job description and run the sourcing pipeline. Results will be shown in a readable text format at each step.
+""")
+
+config = load_config()
+# Runs are kept per JD so widget interactions re-render stored results instead of re-running the pipeline
+if "runs" not in st.session_state:
+    st.session_state["runs"] = {}
+
+# Step 1: Upload JD file
+jd_file = st.file_uploader("Upload Job Description (.txt)", type=["txt"])
+jd_text = None
+if jd_file:
+    jd_text = jd_file.read().decode("utf-8")
+    st.markdown("**Job Description Preview:**")
+    st.write(jd_text[:1000] + ("..." if len(jd_text) > 1000 else ""))
+
+if jd_text:
+    jd_key = hashlib.sha256(jd_text.encode("utf-8")).hexdigest()
+    # Steps 2-7 run on a background thread and stream into the page as they finish
+    if st.button("Run Sourcing Pipeline"):
         rubric_path = os.path.join("src", "score_fit_rubics", "SWE_ML.txt")
         with open(rubric_path, "r") as f:
             rubric = f.read()
-        scored_candidates = score_candidates(valid_profiles, rubric, config)
-        st.markdown("**Scored Candidates:**")
-        for cand in scored_candidates:
-            name = get_profile_name(cand)
-            score = cand.get('fit_score', 'N/A')
-            url = cand.get('linkedin_url', 'N/A')
-            breakdown = cand.get('score_breakdown', {})
-            explanation = cand.get('explanation', None)
-            st.write(f"{name} | Score: {score}")
-            st.write(f"   {url}")
-            if breakdown:
-                st.markdown("**Score Breakdown:**")
-                for k, v in breakdown.items():
-                    st.write(f"- {k.capitalize()}: {v}")
-            if explanation:
-                st.markdown("**Explanation:**")
-                st.write(explanation)
-
-        # Step 7: Craft messages
-        messages = craft_linkedin_messages(scored_candidates, config)
-        st.markdown("**Outreach Messages:**")
-        for msg in messages:
-            name = msg.get('name', 'N/A')
-            url = msg.get('linkedin_url', 'N/A')
-            message = msg.get('message', '')
-            st.write(f"To: {name} ({url})")
-            st.write(message)
-            st.markdown("---")
-
-    if valid_profiles:
-        st.write("DEBUG: First enriched profile:", valid_profiles[0])
-    else:
-        st.write("DEBUG: No profiles returned at all.")
+        st.session_state["runs"][jd_key] = BackgroundPipelineRun(jd_text, config, rubric).start()
 
-    st.write("DEBUG: Raw enriched_profiles:", enriched_profiles) 
\ No newline at end of file
+    run = st.session_state["runs"].get(jd_key)
+    if run is not None:
+        placeholder = st.empty()
+        while True:
+            state = run.snapshot()
+            with placeholder.container():
+                render_run(state)
+            if state["done"]:
+                break
+            time.sleep(0.5)
+        render_metrics()
@@ -0,0 +1,183 @@
+"""
+Local stand-ins for Tavily, RapidAPI and OpenAI used by the benchmark harness.
+Responses are built from the recorded fixtures in benchmarks/fixtures, with configurable
+latency and (for the HTTP providers) a server-side rate limit that answers 429 + Retry-After.
+"""
+from typing import Callable, Dict, List, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from src.rate_limit import TokenBucket
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+LOCATIONS = ["Mountain View, California, United States", "Austin, Texas, United States",
+             "New York, New York, United States", "Seattle, Washington, United States", "Remote"]
+
+
+def load_fixture(name: str):
+    with open(os.path.join(FIXTURES_DIR, name), "r") as f:
+        return json.load(f)
+
+
+def _slug_number(slug: str) -> int:
+    return int(hashlib.sha256(slug.encode("utf-8")).hexdigest()[:8], 16)
+
+
+class FakeProviderServer:
+    """
+    One local HTTP server answering Tavily searches (POST /search) and RapidAPI profile lookups
+    (GET /get-linkedin-profile). `latency` is added to every response; with `rate_limit`
+    (requests per second, 0 = unlimited) excess requests get a 429 and a Retry-After header.
+    A fraction `overlap` of each search's hits are profiles that every query returns, with
+    varying URL spellings, so deduplication is exercised too.
+    """
+
+    def __init__(self, latency: float = 0.02, rate_limit: float = 0, overlap: float = 0.1):
+        self.latency = latency
+        self.limiter = TokenBucket(rate_limit) if rate_limit else None
+        self.overlap = overlap
+        self.profile = load_fixture("profile.json")
+        self.counts = {"search": 0, "profile": 0, "throttled": 0}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> "FakeProviderServer":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive like the real providers, so the pooled sessions are exercised
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: Dict, headers: Optional[Dict] = None):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _throttled(self) -> bool:
+                if fake.limiter and not fake.limiter.try_acquire():
+                    fake._count("throttled")
+                    self._reply(429, {"message": "Too many requests"}, {"Retry-After": "0.2"})
+                    return True
+                time.sleep(fake.latency)
+                return False
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self._throttled():
+                    return
+                fake._count("search")
+                self._reply(200, {"results": fake.search_results(body.get("query", ""), int(body.get("max_results", 5)))})
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                if self._throttled():
+                    return
+                fake._count("profile")
+                self._reply(200, fake.profile_for(query.get("linkedin_url", [""])[0]))
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            # The default backlog of 5 makes bursts wait on SYN retransmits and skews p95
+            request_queue_size = 256
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def search_results(self, query: str, max_results: int) -> List[Dict]:
+        prefix = hashlib.sha256(query.encode("utf-8")).hexdigest()[:8]
+        shared_every = int(1 / self.overlap) if self.overlap else 0
+        results = []
+        for i in range(max_results):
+            if shared_every and i % shared_every == shared_every - 1:
+                url = f"https://uk.linkedin.com/in/shared-{i}/?trk=public_profile"
+            else:
+                url = f"https://www.linkedin.com/in/{prefix}-{i}"
+            results.append({"url": url, "title": f"Candidate {i}", "score": 1.0 - i / (max_results + 1)})
+        return results
+
+    def profile_for(self, url: str) -> Dict:
+        slug = url.rstrip("/").rsplit("/", 1)[-1]
+        number = _slug_number(slug)
+        payload = copy.deepcopy(self.profile)
+        data = payload["data"]
+        data["linkedin_url"] = url
+        data["first_name"], data["last_name"] = "Candidate", slug
+        data["full_name"] = f"Candidate {slug}"
+        data["location"] = LOCATIONS[number % len(LOCATIONS)]
+        # Vary the skill mix so the pre-filter has something to rank
+        skills = data["skills"].split("|")
+        data["skills"] = "|".join(skills[:3 + number % (len(skills) - 2)])
+        return payload
+
+
+class FakeOpenAI:
+    """
+    Drop-in for the OpenAI client's `chat.completions.create`, for use with set_llm_client.
+    Scoring requests get one fixture breakdown per candidate in the prompt, title requests get
+    the fixture title list and everything else gets the fixture outreach message. Every call
+    sleeps `latency` seconds and reports rough token usage. `on_call` receives each call's duration.
+    """
+
+    def __init__(self, latency: float = 0.05, on_call: Optional[Callable[[float], None]] = None):
+        self.latency = latency
+        self.on_call = on_call
+        self.responses = load_fixture("llm_responses.json")
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def _content(self, kwargs: Dict) -> str:
+        prompt = kwargs["messages"][-1]["content"]
+        if kwargs.get("response_format"):
+            ids = [int(i) for i in re.findall(r'"candidate_id": (\d+)', prompt)]
+            return json.dumps({"candidates": [
+                {"candidate_id": i, "name": f"Candidate {i}", "score_breakdown": self.responses["score_breakdown"]}
+                for i in ids
+            ]})
+        if "alternate job titles" in prompt:
+            return self.responses["titles"]
+        name = re.search(r"Candidate name: (.*)", prompt)
+        return self.responses["message"].format(name=name.group(1) if name else "there")
+
+    def create(self, **kwargs):
+        started = time.perf_counter()
+        time.sleep(self.latency)
+        content = self._content(kwargs)
+        with self._lock:
+            self.calls += 1
+        prompt_chars = sum(len(m["content"]) for m in kwargs["messages"])
+        if self.on_call:
+            self.on_call(time.perf_counter() - started)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=prompt_chars // 4, completion_tokens=len(content) // 4),
+        )
@@ -0,0 +1,263 @@
+"""
+Offline benchmark for the sourcing pipeline.
+Runs title generation, search, enrichment, pre-filtering, scoring and messaging against local
+fakes (benchmarks/fakes.py) at several candidate counts, reports throughput, p50/p95 latency and
+peak memory per stage, and exits non-zero when a result regresses past the saved baseline.
+Timings are the best of `--repeat` untraced passes; peak memory comes from one more pass under
+tracemalloc, which would otherwise slow the timed code down several times.
+
+    python benchmarks/run.py                      # N = 10, 100, 1000
+    python benchmarks/run.py --save-baseline      # record the current numbers as the baseline
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+# Allow `python benchmarks/run.py` to resolve the `src` package like src/main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeOpenAI, FakeProviderServer
+from src.candidate import normalize_candidates
+from src.clients import ClientRegistry
+from src.config import load_config
+from src.llm import set_llm_client
+from src.messaging import craft_linkedin_messages
+from src.metrics import METRICS
+from src.prefilter import prefilter_candidates
+from src.rapidapi_enrich import enrich_profiles_with_rapidapi
+from src.scoring import score_candidates
+from src.tavily_search import search_linkedin_profiles
+from src.title_generation import generate_alternate_titles
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results.json")
+STRUCTURED_INFO = {"job_info": [{"title": "Senior Machine Learning Engineer", "location": "Mountain View, CA",
+                                 "keywords": "Python, PyTorch, Kubernetes, MLOps, Spark"}]}
+RUBRIC_PATH = os.path.join(os.path.dirname(BENCH_DIR), "src", "score_fit_rubics", "SWE_ML.txt")
+# Absolute changes below these are scheduler/allocator noise, whatever the relative change
+P95_SLACK_MS = 15
+PEAK_SLACK_MB = 1
+
+
+class LatencyRecorder:
+    """
+    Collects per-operation latencies (HTTP requests including rate-limit waits and retries,
+    LLM calls) for whichever stage is currently running.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage = None
+        self.samples: Dict[str, List[float]] = {}
+
+    def begin(self, stage: str) -> None:
+        with self._lock:
+            self.stage = stage
+            self.samples[stage] = []
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            if self.stage:
+                self.samples[self.stage].append(seconds)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+
+def _time_requests(recorder: LatencyRecorder) -> None:
+    original = ClientRegistry.request
+
+    def timed_request(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            recorder.record(time.perf_counter() - started)
+    ClientRegistry.request = timed_request
+
+
+def bench_config(server: FakeProviderServer, args) -> dict:
+    config = load_config()
+    config.update({
+        "OPENAI_API_KEY": "fake", "TAVILY_API_KEY": "fake", "RAPIDAPI_KEY": "fake", "RAPIDAPI_HOST": "fake",
+        "TAVILY_SEARCH_URL": f"{server.base_url}/search", "RAPIDAPI_BASE_URL": server.base_url,
+        "TAVILY_REQUESTS_PER_SECOND": args.client_rps, "RAPIDAPI_REQUESTS_PER_SECOND": args.client_rps,
+        "OPENAI_REQUESTS_PER_SECOND": args.client_rps,
+        "TAVILY_MAX_CONCURRENCY": args.concurrency, "RAPIDAPI_MAX_CONCURRENCY": args.concurrency,
+        "OPENAI_MAX_CONCURRENCY": args.concurrency,
+        # Every run starts cold: no disk caches, no identities remembered from earlier runs
+        "PROFILE_CACHE_PATH": "", "LLM_CACHE_PATH": "", "IDENTITY_INDEX_PATH": "",
+        "PREFILTER_TOP_K": 0, "PREFILTER_MIN_SCORE": 0.0, "MESSAGE_MIN_FIT_SCORE": 0.0,
+    })
+    return config
+
+
+def run_stage(name: str, fn: Callable, recorder: LatencyRecorder, results: Dict) -> object:
+    recorder.begin(name)
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+        baseline_memory = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    output = fn()
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] - baseline_memory if tracing else 0
+    items = len(output)
+    samples = recorder.samples[name]
+    results[name] = {
+        "items": items,
+        "seconds": round(seconds, 4),
+        "throughput": round(items / seconds, 2) if seconds else 0.0,
+        "operations": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "peak_mb": round(max(0, peak) / 1e6, 3),
+    }
+    return output
+
+
+def run_size(n: int, config: dict, recorder: LatencyRecorder) -> Dict:
+    with open(RUBRIC_PATH, "r") as f:
+        rubric = f.read()
+    METRICS.reset()
+    results: Dict[str, Dict] = {}
+    titles = run_stage("titles", lambda: generate_alternate_titles(STRUCTURED_INFO, config), recorder, results)
+    # Ask for enough hits per title that N unique profiles remain after cross-title overlap
+    per_title = math.ceil(n * 1.3 / max(1, len(titles)))
+    urls = run_stage("search", lambda: search_linkedin_profiles(titles, config, max_results_per_title=per_title,
+                                                                max_total=n), recorder, results)
+    enriched = run_stage("enrich", lambda: enrich_profiles_with_rapidapi(urls, config, limit=n), recorder, results)
+    shortlisted = run_stage("prefilter", lambda: prefilter_candidates(normalize_candidates(enriched),
+                                                                      STRUCTURED_INFO, config), recorder, results)
+    scored = run_stage("score", lambda: score_candidates(shortlisted, rubric, config), recorder, results)
+    run_stage("messages", lambda: craft_linkedin_messages(scored, config, structured_info=STRUCTURED_INFO,
+                                                          profiles=shortlisted), recorder, results)
+    http = METRICS.snapshot()["http"]
+    for stage, provider in (("search", "tavily"), ("enrich", "rapidapi")):
+        results[stage]["retries"] = http.get(provider, {}).get("retries", 0)
+    return results
+
+
+def best_of(runs: List[Dict]) -> Dict:
+    """
+    Merges repeated runs of one size, keeping each stage's fastest pass to filter out scheduler noise.
+    """
+    best = {}
+    for stage in runs[0]:
+        best[stage] = max((run[stage] for run in runs), key=lambda r: (r["throughput"], -r["p95_ms"]))
+    return best
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Returns a description of every stage that got slower, more variable or hungrier than the
+    baseline by more than `tolerance` (a fraction). Tiny absolute changes are ignored.
+    """
+    failures = []
+    for size, stages in current["runs"].items():
+        for stage, result in stages.items():
+            base = baseline.get("runs", {}).get(size, {}).get(stage)
+            if not base:
+                continue
+            # Stages that finish in a few milliseconds are too noisy to compare on throughput
+            if (base["throughput"] and max(result["seconds"], base["seconds"]) > 0.1
+                    and result["throughput"] < base["throughput"] * (1 - tolerance)):
+                failures.append(f"N={size} {stage}: throughput {result['throughput']}/s < baseline {base['throughput']}/s")
+            if result["p95_ms"] > base["p95_ms"] * (1 + tolerance) and result["p95_ms"] - base["p95_ms"] > P95_SLACK_MS:
+                failures.append(f"N={size} {stage}: p95 {result['p95_ms']}ms > baseline {base['p95_ms']}ms")
+            if result["peak_mb"] > base["peak_mb"] * (1 + tolerance) and result["peak_mb"] - base["peak_mb"] > PEAK_SLACK_MB:
+                failures.append(f"N={size} {stage}: peak memory {result['peak_mb']}MB > baseline {base['peak_mb']}MB")
+    return failures
+
+
+def format_report(report: Dict) -> str:
+    lines = []
+    for size, stages in report["runs"].items():
+        lines.append(f"N = {size}")
+        lines.append(f"  {'stage':<10} {'items':>6} {'secs':>8} {'items/s':>9} {'ops':>6} {'p50 ms':>8} "
+                     f"{'p95 ms':>8} {'peak MB':>8} {'retries':>7}")
+        for stage, r in stages.items():
+            lines.append(f"  {stage:<10} {r['items']:>6} {r['seconds']:>8} {r['throughput']:>9} {r['operations']:>6} "
+                         f"{r['p50_ms']:>8} {r['p95_ms']:>8} {r['peak_mb']:>8} {r.get('retries', '-'):>7}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sourcing pipeline against local fakes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Candidate counts to run.")
+    parser.add_argument("--http-latency-ms", type=float, default=20, help="Latency of the fake Tavily/RapidAPI.")
+    parser.add_argument("--llm-latency-ms", type=float, default=50, help="Latency of the fake OpenAI client.")
+    parser.add_argument("--server-rps", type=float, default=0,
+                        help="Requests per second the fake server accepts before answering 429 (0 = unlimited).")
+    parser.add_argument("--client-rps", type=float, default=200, help="Client-side rate limit per provider (OpenAI included).")
+    parser.add_argument("--concurrency", type=int, default=16, help="Client-side concurrency per provider (OpenAI included).")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression as a fraction.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write this run's results.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes per size; the best is kept.")
+    parser.add_argument("--skip-memory", action="store_true", help="Skip the tracemalloc pass (peak MB = 0).")
+    args = parser.parse_args()
+
+    recorder = LatencyRecorder()
+    _time_requests(recorder)
+    set_llm_client(FakeOpenAI(latency=args.llm_latency_ms / 1000, on_call=recorder.record))
+    server = FakeProviderServer(latency=args.http_latency_ms / 1000, rate_limit=args.server_rps).start()
+    settings = {k: getattr(args, k) for k in ("http_latency_ms", "llm_latency_ms", "server_rps", "client_rps",
+                                              "concurrency", "repeat", "skip_memory")}
+    report = {"settings": settings, "python": platform.python_version(), "created_at": time.time(), "runs": {}}
+    try:
+        config = bench_config(server, args)
+        for n in args.sizes:
+            results = best_of([run_size(n, config, recorder) for _ in range(max(1, args.repeat))])
+            if not args.skip_memory:
+                tracemalloc.start()
+                try:
+                    traced = run_size(n, config, recorder)
+                finally:
+                    tracemalloc.stop()
+                for stage, result in results.items():
+                    result["peak_mb"] = traced[stage]["peak_mb"]
+            report["runs"][str(n)] = results
+    finally:
+        server.stop()
+        set_llm_client(None)
+
+    print(format_report(report))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print("No baseline saved yet; run with --save-baseline to record one.")
+        return
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    if baseline.get("settings") != settings:
+        print(f"Warning: baseline was recorded with different settings: {baseline.get('settings')}")
+    failures = compare(report, baseline, args.tolerance)
+    if failures:
+        print("Performance regressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"No regressions beyond {args.tolerance:.0%} of the baseline.")
+
+
+if __name__ == "__main__":
+    main()
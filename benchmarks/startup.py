@@ -0,0 +1,89 @@
+"""
+Startup-time regression check.
+Imports each entry point in a fresh interpreter with `python -X importtime`, prints the slowest
+imports, and exits non-zero if an entry point takes longer than the budget or loads one of the
+heavy dependencies that must stay lazy (they are only needed once a stage actually runs).
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --budget-ms 300 --top 20
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What app.py, src/main.py and the batch runner import before doing any work
+ENTRY_POINTS = {
+    "package": "import src",
+    "cli": "import src.main",
+    "app": "import src.config, src.background_run, src.candidate, src.metrics",
+    "batch": "import src.batch",
+}
+
+# Loaded on first use only; importing any of these at startup is a regression
+HEAVY_MODULES = ["langchain", "langchain_openai", "langchain_community", "langchain_core", "kor",
+                 "chromadb", "openai", "tiktoken", "numpy", "pandas", "streamlit"]
+
+_LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def measure(statement: str) -> Tuple[float, List[Tuple[str, int, int]], List[str]]:
+    """
+    Runs `statement` in a fresh interpreter and returns (total ms, [(module, self us, cumulative us)],
+    names of every loaded module).
+    The total sums the cumulative time of top-level imports, as reported by -X importtime.
+    """
+    probe = f"{statement}\nimport sys\nprint(','.join(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    entries, total = [], 0
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = int(match[1]), int(match[2]), match[3], match[4]
+        entries.append((module, self_us, cumulative_us))
+        if not indent:
+            total += cumulative_us
+    loaded = result.stdout.strip().splitlines()[-1].split(",")
+    return total / 1000, entries, loaded
+
+
+def heavy_loaded(loaded: List[str]) -> List[str]:
+    return sorted({name.split(".")[0] for name in loaded if name.split(".")[0] in HEAVY_MODULES})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check import time of the entry points.")
+    parser.add_argument("--budget-ms", type=float, default=500, help="Maximum import time per entry point.")
+    parser.add_argument("--top", type=int, default=10, help="How many of the slowest imports to list.")
+    args = parser.parse_args()
+
+    failures = []
+    report: Dict[str, float] = {}
+    for name, statement in ENTRY_POINTS.items():
+        total_ms, entries, loaded = measure(statement)
+        report[name] = total_ms
+        print(f"{name}: {total_ms:.1f} ms ({statement})")
+        for module, _, cumulative_us in sorted(entries, key=lambda e: -e[2])[:args.top]:
+            print(f"    {cumulative_us / 1000:8.1f} ms  {module}")
+        if total_ms > args.budget_ms:
+            failures.append(f"{name} took {total_ms:.0f} ms, budget is {args.budget_ms:.0f} ms")
+        heavy = heavy_loaded(loaded)
+        if heavy:
+            failures.append(f"{name} imports heavy dependencies at startup: {', '.join(heavy)}")
+
+    if failures:
+        print("Startup regressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"All entry points import in under {args.budget_ms:.0f} ms without heavy dependencies.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from src.kor_extraction import extract_structured_info
+from src.title_generation import generate_alternate_titles
+from src.candidate import Candidate
+from src.messaging import craft_linkedin_messages
+from src.metrics import METRICS
+from src.streaming import StreamingPipeline
+
+
+class BackgroundPipelineRun:
+    """
+    Runs the sourcing pipeline for one JD on a background thread.
+    Each stage publishes its output into `state` as soon as it is ready. Search, enrichment and
+    scoring run as a StreamingPipeline, so URLs, profiles, scored candidates and messages are
+    appended one at a time and a UI can poll `snapshot()` to render partial results while the
+    slow stages are still running.
+    """
+
+    def __init__(self, jd_text: str, config: dict, rubric: str, enrich_limit: int = 10):
+        self.jd_text = jd_text
+        self.config = config
+        self.rubric = rubric
+        self.enrich_limit = enrich_limit
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.state: Dict = {
+            "stage": "pending",
+            "structured_info": None,
+            "titles": None,
+            "linkedin_urls": None,
+            "valid_profiles": None,
+            "shortlisted_profiles": None,
+            "scored_candidates": {},
+            "messages": {},
+            "error": None,
+            "done": False,
+            "started_at": None,
+            "first_candidate_at": None,
+            "finished_at": None,
+        }
+
+    def _update(self, **values) -> None:
+        with self._lock:
+            self.state.update(values)
+
+    def snapshot(self) -> Dict:
+        """
+        Returns a consistent copy of the current state for rendering.
+        """
+        with self._lock:
+            return {k: (dict(v) if isinstance(v, dict) else list(v) if isinstance(v, list) else v)
+                    for k, v in self.state.items()}
+
+    @property
+    def done(self) -> bool:
+        with self._lock:
+            return self.state["done"]
+
+    def start(self) -> "BackgroundPipelineRun":
+        self._update(stage="starting", started_at=time.time())
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _add_message(self, idx: int, result: Dict, structured_info: Dict, candidate: Candidate) -> None:
+        messages = craft_linkedin_messages([result], self.config, structured_info=structured_info,
+                                           profiles=[candidate])
+        # Candidates below the fit-score cutoff get no message
+        if messages:
+            with self._lock:
+                candidate.message = messages[0]["message"]
+                self.state["messages"][idx] = messages[0]
+
+    def _add_url(self, url: str) -> None:
+        with self._lock:
+            self.state["linkedin_urls"].append(url)
+
+    def _add_profile(self, candidate: Candidate, shortlisted: bool) -> None:
+        with self._lock:
+            self.state["valid_profiles"].append(candidate)
+            if shortlisted:
+                self.state["shortlisted_profiles"].append(candidate)
+
+    def _run(self) -> None:
+        config = self.config
+        try:
+            self._update(stage="extracting")
+            structured_info = extract_structured_info(self.jd_text, config)
+            self._update(structured_info=structured_info, stage="generating titles")
+
+            titles = generate_alternate_titles(structured_info, config)
+            # Search, enrichment and scoring overlap; each list below grows as items stream through
+            self._update(titles=titles, linkedin_urls=[], valid_profiles=[], shortlisted_profiles=[],
+                         stage="searching and scoring")
+            pipeline = StreamingPipeline(structured_info, titles, self.rubric, config, limit=self.enrich_limit,
+                                         on_url=self._add_url, on_profile=self._add_profile)
+            # Draft each message as soon as its candidate is scored instead of waiting for the full list
+            with ThreadPoolExecutor(max_workers=2) as message_pool, METRICS.timed("stream_candidates"):
+                for candidate in pipeline.run():
+                    with self._lock:
+                        idx = len(self.state["scored_candidates"])
+                        self.state["scored_candidates"][idx] = candidate.score
+                        if self.state["first_candidate_at"] is None:
+                            self.state["first_candidate_at"] = time.time()
+                    message_pool.submit(self._add_message, idx, candidate.score, structured_info, candidate)
+                self._update(stage="drafting messages")
+            self._update(stage="complete")
+        except Exception as e:
+            self._update(error=str(e), stage="failed")
+        finally:
+            self._update(done=True, finished_at=time.time())
@@ -0,0 +1,138 @@
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import glob
+import json
+import os
+import re
+import time
+from src.candidate import write_scores_csv
+from src.pipeline import PipelineRunner
+from src.shared_results import SharedResults
+from src.stages import build_stages
+
+SUMMARY_NAME = "batch_summary.json"
+# Incremental runs always search again; everything after depends on what the candidate store has seen
+INCREMENTAL_RERUN_FROM = "linkedin_urls"
+
+
+def requisition_name(jd_path: str) -> str:
+    """
+    Output directory name for a JD file, e.g. 'jds/Senior ML Engineer.txt' -> 'senior-ml-engineer'.
+    """
+    stem = os.path.splitext(os.path.basename(jd_path))[0]
+    return re.sub(r"[^a-z0-9]+", "-", stem.lower()).strip("-") or "requisition"
+
+
+def collect_jd_paths(paths: List[str], pattern: str = "*.txt") -> List[str]:
+    """
+    Expands directories into the JD files they contain; files are kept as given.
+    """
+    jd_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            jd_paths.extend(sorted(glob.glob(os.path.join(path, pattern))))
+        else:
+            jd_paths.append(path)
+    return list(dict.fromkeys(jd_paths))
+
+
+def _summarize(name: str, jd_path: str, results: Dict, started: float) -> Dict:
+    failed = [c for c in results["scored_candidates"] if c and c.get("error")]
+    scored = [c for c in results["scored_candidates"] if c and not c.get("error")]
+    best = max(scored, key=lambda c: c.get("fit_score") or 0, default=None)
+    return {
+        "requisition": name,
+        "jd_path": jd_path,
+        "status": "ok",
+        "duration_seconds": round(time.time() - started, 2),
+        "titles": len(results["titles"]),
+        "linkedin_urls": len(results["linkedin_urls"]),
+        "enriched_profiles": len(results["enriched_profiles"]),
+        "shortlisted_profiles": len(results["shortlisted_profiles"]),
+        "scored_candidates": len(scored),
+        "failed_scores": len(failed),
+        "messages": len(results["messages"]),
+        "mean_fit_score": round(sum(c.get("fit_score") or 0 for c in scored) / len(scored), 2) if scored else None,
+        "top_candidate": {"name": best.get("name"), "linkedin_url": best.get("linkedin_url"),
+                          "fit_score": best.get("fit_score")} if best else None,
+    }
+
+
+def _run_requisition(jd_path: str, name: str, config: dict, limit: int, shared: SharedResults,
+                     force: bool, rerun_from: Optional[str], incremental: bool) -> Dict:
+    started = time.time()
+    output_dir = os.path.join(config['OUTPUT_DIR'], name)
+    try:
+        runner = PipelineRunner(output_dir, force=force,
+                                rerun_from=rerun_from or (INCREMENTAL_RERUN_FROM if incremental else None))
+        results = runner.run(build_stages(config, limit=limit, jd_path=jd_path, shared=shared,
+                                          requisition=name if incremental else None))
+        write_scores_csv(results['scored_candidates'], os.path.join(output_dir, 'scored_candidates.csv'))
+        return _summarize(name, jd_path, results, started)
+    except Exception as e:
+        print(f"[{name}] failed: {e}")
+        return {"requisition": name, "jd_path": jd_path, "status": "failed", "error": str(e),
+                "duration_seconds": round(time.time() - started, 2)}
+
+
+def run_batch(jd_paths: List[str], config: dict, limit: int = 10, max_workers: Optional[int] = None,
+              force: bool = False, rerun_from: Optional[str] = None, incremental: bool = False) -> Dict:
+    """
+    Runs the full pipeline for many JDs on a thread pool of BATCH_MAX_WORKERS requisitions.
+    Each requisition gets its own artifact directory under OUTPUT_DIR. Tavily searches and RapidAPI
+    lookups go through one SharedResults memo, so a title or profile needed by several
+    requisitions is fetched once, and every run shares the same client registry, so provider
+    rate and concurrency limits hold for the batch as a whole.
+    With `incremental`, each requisition only processes candidates that are new or changed since
+    its previous runs (see build_stages), so its outputs hold just the delta.
+    Returns the summary report, which is also written to OUTPUT_DIR/batch_summary.json.
+    """
+    if max_workers is None:
+        max_workers = int(config.get('BATCH_MAX_WORKERS', 4))
+    names = {}
+    for jd_path in jd_paths:
+        name = base = requisition_name(jd_path)
+        suffix = 2
+        while name in names.values():
+            name = f"{base}-{suffix}"
+            suffix += 1
+        names[jd_path] = name
+
+    started = time.time()
+    shared = SharedResults()
+    summaries = []
+    if jd_paths:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jd_paths)))) as executor:
+            summaries = list(executor.map(
+                lambda jd_path: _run_requisition(jd_path, names[jd_path], config, limit, shared, force, rerun_from,
+                                                incremental),
+                jd_paths
+            ))
+    report = {
+        "requisitions": summaries,
+        "succeeded": sum(1 for s in summaries if s["status"] == "ok"),
+        "failed": sum(1 for s in summaries if s["status"] != "ok"),
+        "duration_seconds": round(time.time() - started, 2),
+        "shared_lookups": shared.stats(),
+    }
+    os.makedirs(config['OUTPUT_DIR'], exist_ok=True)
+    with open(os.path.join(config['OUTPUT_DIR'], SUMMARY_NAME), "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def format_summary(report: Dict) -> str:
+    """
+    Renders the batch report as a plain-text table, one row per requisition.
+    """
+    lines = [f"{'Requisition':<32} {'Status':<7} {'URLs':>5} {'Enriched':>8} {'Scored':>6} {'Msgs':>5} "
+             f"{'Top fit':>7} {'Secs':>7}"]
+    for s in report["requisitions"]:
+        top = (s.get("top_candidate") or {}).get("fit_score")
+        lines.append(f"{s['requisition'][:32]:<32} {s['status']:<7} {s.get('linkedin_urls', '-'):>5} "
+                     f"{s.get('enriched_profiles', '-'):>8} {s.get('scored_candidates', '-'):>6} "
+                     f"{s.get('messages', '-'):>5} {top if top is not None else '-':>7} {s['duration_seconds']:>7}")
+    shared = report["shared_lookups"]
+    lines.append(f"{report['succeeded']} succeeded, {report['failed']} failed in {report['duration_seconds']}s; "
+                 f"{shared['hits']} search/enrichment lookups reused across requisitions.")
+    return "\n".join(lines)
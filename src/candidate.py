@@ -0,0 +1,140 @@
+from typing import Any, Dict, Iterable, List, Optional
+import csv
+import json
+import zlib
+from src.linkedin_url import normalize_linkedin_url
+
+# Same order as scoring.SCORE_DIMENSIONS (scoring imports this module, so it is not imported here)
+SCORE_COLUMNS = ["education", "trajectory", "company", "skills", "location", "tenure"]
+
+
+def unwrap_profile(profile: Any) -> Dict:
+    """
+    Returns the flat profile dict from a Candidate or a RapidAPI result, which may be nested
+    under one or two 'data' keys.
+    """
+    if isinstance(profile, Candidate):
+        return profile.profile
+    while isinstance(profile, dict) and isinstance(profile.get("data"), dict):
+        profile = profile["data"]
+    return profile
+
+
+def profile_url(profile: Any) -> str:
+    """
+    Returns the linkedin_url of a Candidate or profile dict without decoding the Candidate's payload.
+    """
+    if isinstance(profile, Candidate):
+        return profile.linkedin_url
+    return unwrap_profile(profile).get("linkedin_url") or ""
+
+
+def get_profile_name(profile: Dict) -> str:
+    # Try common name fields
+    for key in ['name', 'full_name']:
+        if key in profile and profile[key]:
+            return profile[key]
+    # Try first_name + last_name
+    if profile.get('first_name') or profile.get('last_name'):
+        return f"{profile.get('first_name', '')} {profile.get('last_name', '')}".strip()
+    # Fallback: use headline or 'N/A'
+    return profile.get('headline', 'N/A')
+
+
+class Candidate:
+    """
+    Compact record for one sourced profile.
+    Only the fields every stage displays are kept as attributes; the full RapidAPI payload is
+    stored zlib-compressed and only decoded when a stage asks for `profile`.
+    """
+    __slots__ = ("linkedin_url", "canonical_url", "name", "headline", "location", "_raw", "score", "message")
+
+    def __init__(self, linkedin_url: str, name: str, headline: str, location: str, raw: bytes,
+                 score: Optional[Dict] = None, message: Optional[str] = None):
+        self.linkedin_url = linkedin_url
+        self.canonical_url = normalize_linkedin_url(linkedin_url)
+        self.name = name
+        self.headline = headline
+        self.location = location
+        self._raw = raw
+        self.score = score
+        self.message = message
+
+    @classmethod
+    def from_rapidapi(cls, payload: Any) -> Optional["Candidate"]:
+        """
+        Normalizes one enrichment result ({'data': ...}, {'data': {'data': ...}} or a flat dict).
+        Returns None if the payload has no linkedin_url.
+        """
+        profile = unwrap_profile(payload)
+        if not isinstance(profile, dict) or not profile.get("linkedin_url"):
+            return None
+        raw = zlib.compress(json.dumps(profile, separators=(",", ":")).encode("utf-8"))
+        return cls(
+            linkedin_url=profile["linkedin_url"],
+            name=get_profile_name(profile),
+            headline=profile.get("headline") or "N/A",
+            location=profile.get("location") or "",
+            raw=raw,
+        )
+
+    @property
+    def profile(self) -> Dict:
+        """
+        The full flat RapidAPI profile, decoded on demand.
+        """
+        return json.loads(zlib.decompress(self._raw))
+
+    @property
+    def fit_score(self) -> Optional[float]:
+        return self.score.get("fit_score") if self.score else None
+
+    def __repr__(self) -> str:
+        return f"Candidate({self.canonical_url!r}, name={self.name!r}, fit_score={self.fit_score!r})"
+
+
+def normalize_candidates(enriched_profiles: Iterable[Any]) -> List[Candidate]:
+    """
+    Converts enrichment results into Candidates, dropping entries without a linkedin_url and
+    repeats of a profile already seen (by canonical URL), so no person is scored twice.
+    """
+    candidates: Dict[str, Candidate] = {}
+    for payload in enriched_profiles:
+        candidate = Candidate.from_rapidapi(payload)
+        if candidate is not None and candidate.canonical_url not in candidates:
+            candidates[candidate.canonical_url] = candidate
+    return list(candidates.values())
+
+
+def score_columns(scored: Iterable[Any]) -> Dict[str, list]:
+    """
+    Turns scored candidates (Candidates with a score or score dicts) into columns:
+    linkedin_url, name, fit_score, one column per rubric dimension and the scoring error, if any
+    (failed candidates have an empty fit_score).
+    """
+    columns: Dict[str, list] = {"linkedin_url": [], "name": [], "fit_score": []}
+    columns.update({dim: [] for dim in SCORE_COLUMNS})
+    columns["error"] = []
+    for item in scored:
+        score = item.score if isinstance(item, Candidate) else item
+        if not score:
+            continue
+        breakdown = score.get("score_breakdown") or {}
+        columns["linkedin_url"].append(score.get("linkedin_url", ""))
+        columns["name"].append(score.get("name", ""))
+        columns["fit_score"].append(score.get("fit_score"))
+        for dim in SCORE_COLUMNS:
+            columns[dim].append(breakdown.get(dim))
+        columns["error"].append(score.get("error", ""))
+    return columns
+
+
+def write_scores_csv(scored: Iterable[Any], path: str) -> None:
+    """
+    Writes the columnar score export to a CSV file.
+    """
+    columns = score_columns(scored)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(list(columns))
+        writer.writerows(zip(*columns.values()))
@@ -0,0 +1,179 @@
+from typing import Dict, Iterable, List, Optional
+import json
+import os
+import sqlite3
+import threading
+import time
+from src.linkedin_url import normalize_linkedin_url
+
+
+class CandidateStore:
+    """
+    SQLite record of every candidate sourced for each requisition: when the profile was first and
+    last seen, the hash of the enriched profile it was last evaluated on, the rubric hash and score
+    it was last scored with, and when it was messaged. Incremental runs use it to enrich only new
+    URLs, re-score only changed profiles or rubrics and never message anyone twice.
+    URLs are stored normalized, so different spellings of one profile share a row.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS candidates (
+                requisition TEXT NOT NULL,
+                linkedin_url TEXT NOT NULL,
+                profile_hash TEXT,
+                rubric_hash TEXT,
+                fit_score REAL,
+                score TEXT,
+                message TEXT,
+                messaged_at REAL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                PRIMARY KEY (requisition, linkedin_url)
+            )
+            """
+        )
+
+    def get(self, requisition: str, urls: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Returns {normalized URL: stored row} for the given URLs this requisition has seen before.
+        """
+        keys = list(dict.fromkeys(normalize_linkedin_url(url) for url in urls if url))
+        rows = {}
+        with self._lock:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                cursor = self._conn.execute(
+                    f"SELECT * FROM candidates WHERE requisition = ? AND linkedin_url IN ({','.join('?' * len(chunk))})",
+                    [requisition, *chunk]
+                )
+                columns = [c[0] for c in cursor.description]
+                for row in cursor.fetchall():
+                    entry = dict(zip(columns, row))
+                    entry["score"] = json.loads(entry["score"]) if entry["score"] else None
+                    rows[entry["linkedin_url"]] = entry
+        return rows
+
+    def seen_urls(self, requisition: str) -> List[str]:
+        """
+        Returns every (normalized) URL this requisition has seen.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT linkedin_url FROM candidates WHERE requisition = ?",
+                                      (requisition,)).fetchall()
+        return [url for (url,) in rows]
+
+    def mark_seen(self, requisition: str, urls: Iterable[str]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT INTO candidates (requisition, linkedin_url, first_seen, last_seen) VALUES (?, ?, ?, ?)
+                ON CONFLICT (requisition, linkedin_url) DO UPDATE SET last_seen = excluded.last_seen
+                """,
+                [(requisition, normalize_linkedin_url(url), now, now) for url in urls if url]
+            )
+
+    def record_evaluated(self, requisition: str, profile_hashes: Dict[str, str]) -> None:
+        """
+        Stores the profile hash of candidates that were evaluated but not scored (dropped by the
+        pre-filter or semantic ranking), so an unchanged profile is not evaluated again.
+        """
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE candidates SET profile_hash = ? WHERE requisition = ? AND linkedin_url = ?",
+                [(profile_hash, requisition, normalize_linkedin_url(url)) for url, profile_hash in profile_hashes.items()]
+            )
+
+    def record_scores(self, requisition: str, scored: List[Dict], profile_hashes: Dict[str, str],
+                      rubric_hash: str) -> None:
+        """
+        Stores each scored candidate with the profile and rubric hashes it was scored against.
+        Failed scores (with an 'error') are not stored, so the candidate is scored again next run.
+        """
+        rows = []
+        for candidate in scored:
+            if not candidate or candidate.get("error"):
+                continue
+            url = normalize_linkedin_url(candidate.get("linkedin_url") or "")
+            if url in profile_hashes:
+                rows.append((profile_hashes[url], rubric_hash, candidate.get("fit_score"), json.dumps(candidate),
+                             requisition, url))
+        with self._lock:
+            self._conn.executemany(
+                """
+                UPDATE candidates SET profile_hash = ?, rubric_hash = ?, fit_score = ?, score = ?
+                WHERE requisition = ? AND linkedin_url = ?
+                """,
+                rows
+            )
+
+    def record_messages(self, requisition: str, messages: List[Dict]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE candidates SET message = ?, messaged_at = ? WHERE requisition = ? AND linkedin_url = ?",
+                [(m["message"], now, requisition, normalize_linkedin_url(m.get("linkedin_url") or ""))
+                 for m in messages if m.get("message")]
+            )
+
+    def unmessaged(self, requisition: str, rubric_hash: str, min_fit_score: float) -> List[Dict]:
+        """
+        Returns the stored scores of candidates scored against `rubric_hash` at or above
+        `min_fit_score` who have not been messaged yet, best first. This includes candidates
+        from earlier runs whose message failed or whose run stopped before messaging.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT score FROM candidates
+                WHERE requisition = ? AND rubric_hash = ? AND fit_score >= ? AND messaged_at IS NULL
+                ORDER BY fit_score DESC
+                """,
+                (requisition, rubric_hash, min_fit_score)
+            ).fetchall()
+        return [json.loads(score) for (score,) in rows if score]
+
+    def summary(self, requisition: str) -> Dict[str, int]:
+        with self._lock:
+            seen, scored, messaged = self._conn.execute(
+                "SELECT COUNT(*), COUNT(rubric_hash), COUNT(messaged_at) FROM candidates WHERE requisition = ?",
+                (requisition,)
+            ).fetchone()
+        return {"seen": seen, "scored": scored, "messaged": messaged}
+
+
+def needs_scoring(row: Optional[Dict], profile_hash: str, rubric_hash: str) -> bool:
+    """
+    A profile is (re-)evaluated if it is new, was never evaluated, its content changed, or it was
+    scored against a different rubric.
+    """
+    if row is None or row["profile_hash"] != profile_hash:
+        return True
+    return row["rubric_hash"] is not None and row["rubric_hash"] != rubric_hash
+
+
+_STORES: Dict[str, CandidateStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_candidate_store(config: dict) -> Optional[CandidateStore]:
+    """
+    Returns the shared CandidateStore at CANDIDATE_STORE_PATH, or None if it is set empty.
+    """
+    path = config.get("CANDIDATE_STORE_PATH")
+    if not path:
+        return None
+    with _STORES_LOCK:
+        if path not in _STORES:
+            _STORES[path] = CandidateStore(path)
+        return _STORES[path]
@@ -0,0 +1,225 @@
+from typing import Any, Dict, Iterator, Tuple
+from contextlib import contextmanager
+import hashlib
+import json
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from src.metrics import METRICS
+from src.rate_limit import TokenBucket, backoff_delay
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Config keys holding each provider's limits, with their defaults
+PROVIDER_SETTINGS = {
+    "rapidapi": {"concurrency": ("RAPIDAPI_MAX_CONCURRENCY", 5), "rate": ("RAPIDAPI_REQUESTS_PER_SECOND", 5),
+                 "retries": ("RAPIDAPI_MAX_RETRIES", 3)},
+    "tavily": {"concurrency": ("TAVILY_MAX_CONCURRENCY", 8), "rate": ("TAVILY_REQUESTS_PER_SECOND", 10),
+               "retries": ("TAVILY_MAX_RETRIES", 2)},
+    # Chat completions, KOR extraction and embeddings; the SDK retries itself
+    "openai": {"concurrency": ("OPENAI_MAX_CONCURRENCY", 8), "rate": ("OPENAI_REQUESTS_PER_SECOND", 8),
+               "retries": ("OPENAI_MAX_RETRIES", 2)},
+}
+
+
+class ClientRegistry:
+    """
+    Long-lived clients shared by every stage: one pooled keep-alive requests.Session and token
+    bucket per HTTP provider, plus reusable OpenAI/LangChain clients. Timeouts, retry policy and
+    concurrency limits all come from the config passed in here.
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.timeout = float(config.get('HTTP_TIMEOUT', 30))
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._limiters: Dict[str, TokenBucket] = {}
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._llm_clients: Dict[Tuple, Any] = {}
+
+    def _setting(self, provider: str, name: str):
+        key, default = PROVIDER_SETTINGS[provider][name]
+        return self.config.get(key, default)
+
+    def concurrency(self, provider: str) -> int:
+        return max(1, int(self._setting(provider, "concurrency")))
+
+    def max_retries(self, provider: str) -> int:
+        return max(0, int(self._setting(provider, "retries")))
+
+    def session(self, provider: str) -> requests.Session:
+        """
+        Returns the provider's keep-alive session, with a connection pool sized to its concurrency.
+        """
+        with self._lock:
+            if provider not in self._sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency(provider))
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[provider] = session
+            return self._sessions[provider]
+
+    def rate_limiter(self, provider: str) -> TokenBucket:
+        """
+        Returns the provider's token bucket; it is shared by every caller using this registry.
+        """
+        with self._lock:
+            if provider not in self._limiters:
+                self._limiters[provider] = TokenBucket(float(self._setting(provider, "rate")))
+            return self._limiters[provider]
+
+    def slots(self, provider: str) -> threading.BoundedSemaphore:
+        """
+        Returns the semaphore capping in-flight requests to the provider at its concurrency
+        limit, across every thread (and every batch requisition) using this registry.
+        """
+        with self._lock:
+            if provider not in self._slots:
+                self._slots[provider] = threading.BoundedSemaphore(self.concurrency(provider))
+            return self._slots[provider]
+
+    @contextmanager
+    def throttle(self, provider: str) -> Iterator[None]:
+        """
+        Waits for the provider's rate limiter and holds one of its slots for the enclosed call,
+        for SDK clients that do their own HTTP (OpenAI, LangChain).
+        """
+        self.rate_limiter(provider).acquire()
+        with self.slots(provider):
+            yield
+
+    def request(self, provider: str, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a rate-limited request on the provider's session, retrying with backoff on
+        429/5xx and network errors. Returns the last response, which may still be an error;
+        raises requests.RequestException if the request never got a response.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        session = self.session(provider)
+        limiter = self.rate_limiter(provider)
+        slots = self.slots(provider)
+        max_retries = self.max_retries(provider)
+        for attempt in range(max_retries + 1):
+            limiter.acquire()
+            try:
+                with slots:
+                    response = session.request(method, url, **kwargs)
+            except requests.RequestException:
+                METRICS.record_http(provider, retry=attempt > 0, error=True)
+                if attempt == max_retries:
+                    raise
+                time.sleep(backoff_delay(attempt))
+                continue
+            METRICS.record_http(provider, retry=attempt > 0, error=response.status_code >= 400)
+            if response.status_code in RETRYABLE_STATUS and attempt < max_retries:
+                time.sleep(backoff_delay(attempt, retry_after=response.headers.get("Retry-After")))
+                continue
+            return response
+        return response
+
+    def _llm_client(self, key: Tuple, factory):
+        with self._lock:
+            if key not in self._llm_clients:
+                self._llm_clients[key] = factory()
+            return self._llm_clients[key]
+
+    def openai(self):
+        """
+        Shared OpenAI client; it keeps its own pooled HTTP connections alive between calls.
+        """
+        def build():
+            from openai import OpenAI
+            return OpenAI(api_key=self.config['OPENAI_API_KEY'], timeout=self.timeout,
+                          max_retries=self.max_retries("openai"))
+        return self._llm_client(("openai",), build)
+
+    def chat_model(self, model: str = "gpt-4", temperature: float = 0.0):
+        """
+        Shared LangChain ChatOpenAI instance for the given model and temperature. Token usage of
+        every call (e.g. KOR extraction) is recorded in METRICS.
+        """
+        def build():
+            from langchain_openai import ChatOpenAI
+            return ChatOpenAI(model=model, temperature=temperature, api_key=self.config['OPENAI_API_KEY'],
+                              timeout=self.timeout, max_retries=self.max_retries("openai"),
+                              callbacks=[_usage_callback(model)])
+        return self._llm_client(("chat", model, temperature), build)
+
+    def embeddings(self, model: str = "text-embedding-3-small"):
+        """
+        Shared LangChain OpenAIEmbeddings instance for the given model. LangChain drops the usage
+        OpenAI reports for embeddings, so the input tokens are counted and recorded in METRICS.
+        Requests share the "openai" rate limit and concurrency slots.
+        """
+        def build():
+            return _metered_embeddings_class(self)(model=model, api_key=self.config['OPENAI_API_KEY'],
+                                                   max_retries=self.max_retries("openai"))
+        return self._llm_client(("embeddings", model), build)
+
+
+def _usage_callback(model: str):
+    """
+    LangChain callback handler recording the token usage of each chat model call.
+    """
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class UsageCallback(BaseCallbackHandler):
+        def on_llm_end(self, response, **kwargs) -> None:
+            usage = (response.llm_output or {}).get("token_usage") or {}
+            prompt_tokens = int(usage.get("prompt_tokens") or 0)
+            completion_tokens = int(usage.get("completion_tokens") or 0)
+            if not usage:
+                # Newer langchain-openai releases report usage on the message instead
+                for generations in response.generations:
+                    for generation in generations:
+                        metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                        prompt_tokens += int(metadata.get("input_tokens") or 0)
+                        completion_tokens += int(metadata.get("output_tokens") or 0)
+            METRICS.record_llm(model, prompt_tokens, completion_tokens)
+
+    return UsageCallback()
+
+
+def _metered_embeddings_class(registry: ClientRegistry):
+    """
+    OpenAIEmbeddings that throttles every embedding request through `registry` and records its
+    input tokens in METRICS (embed_query goes through embed_documents).
+    """
+    from langchain_openai import OpenAIEmbeddings
+
+    class MeteredOpenAIEmbeddings(OpenAIEmbeddings):
+        def _count_tokens(self, texts) -> int:
+            try:
+                import tiktoken
+                encoding = tiktoken.encoding_for_model(self.model)
+            except Exception:
+                # Roughly four characters per token for English text
+                return sum(len(text) for text in texts) // 4
+            return sum(len(encoding.encode(text)) for text in texts)
+
+        def embed_documents(self, texts, *args, **kwargs):
+            with registry.throttle("openai"):
+                vectors = super().embed_documents(texts, *args, **kwargs)
+            METRICS.record_llm(self.model, prompt_tokens=self._count_tokens(texts))
+            return vectors
+
+    return MeteredOpenAIEmbeddings
+
+
+_registries: Dict[str, ClientRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_clients(config: dict) -> ClientRegistry:
+    """
+    Returns the registry for this config, creating it on first use.
+    Configs with identical values share one registry, and so share sessions and rate limits.
+    """
+    key = hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = ClientRegistry(config)
+        return _registries[key]
@@ -0,0 +1,198 @@
+from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+import json
+import re
+
+# Profile fields each rubric dimension needs; anything not listed here never reaches the LLM
+FIELD_ALLOWLIST = {
+    "education": {"educations"},
+    "trajectory": {"headline", "experiences.title", "experiences.dates"},
+    "company": {"experiences.company"},
+    "skills": {"headline", "about", "skills", "experiences.title", "experiences.description"},
+    "location": {"location"},
+    "tenure": {"experiences.dates"},
+}
+
+# Rubric headings -> dimension keys used in score_breakdown
+_RUBRIC_HEADINGS = [
+    ("education", "education"),
+    ("trajectory", "trajectory"),
+    ("company", "company"),
+    ("experience match", "skills"),
+    ("skill", "skills"),
+    ("location", "location"),
+    ("tenure", "tenure"),
+]
+
+# Per-field token budgets
+TEXT_BUDGETS = {"headline": 40, "about": 150, "skills": 80, "experiences.description": 50}
+MAX_EXPERIENCES = 8
+MAX_EDUCATIONS = 4
+DEFAULT_MAX_TOKENS = 600
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # tiktoken missing or its BPE files cannot be downloaded (offline); fall back to a char estimate
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """
+    Counts tokens in `text` with tiktoken, or estimates ~4 characters per token if it is unavailable.
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text))
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str = "gpt-4o") -> str:
+    """
+    Truncates `text` to at most `max_tokens` tokens.
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return text[:max_tokens * 4]
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens]).rstrip() + "…"
+
+
+def rubric_dimensions(rubric: Optional[str]) -> List[str]:
+    """
+    Returns the score dimensions mentioned in the rubric's headings, or every dimension if none are found.
+    """
+    if not rubric:
+        return list(FIELD_ALLOWLIST)
+    headings = " ".join(re.findall(r"\*\*(.+?)\*\*", rubric)).lower() or rubric.lower()
+    found = [dim for heading, dim in _RUBRIC_HEADINGS if heading in headings]
+    return list(dict.fromkeys(found)) or list(FIELD_ALLOWLIST)
+
+
+def rubric_weights(rubric: Optional[str], defaults: Dict[str, float]) -> Dict[str, float]:
+    """
+    Reads 'Heading (NN%)' weights from the rubric, falling back to `defaults` for dimensions it
+    does not weight. Returned weights are normalized to sum to 1.
+    """
+    weights = dict(defaults)
+    for heading_text, percent in re.findall(r"\*\*([^*]+?)\((\d+(?:\.\d+)?)%\)\*\*", rubric or ""):
+        heading_text = heading_text.lower()
+        for heading, dim in _RUBRIC_HEADINGS:
+            if heading in heading_text and dim in weights:
+                weights[dim] = float(percent) / 100
+                break
+    total = sum(weights.values()) or 1.0
+    return {dim: weight / total for dim, weight in weights.items()}
+
+
+def _allowed_fields(dimensions: List[str]) -> set:
+    fields = set()
+    for dim in dimensions:
+        fields |= FIELD_ALLOWLIST.get(dim, set())
+    return fields
+
+
+def _date_range(item: Dict) -> str:
+    start = "/".join(str(item[k]) for k in ("start_month", "start_year") if item.get(k))
+    if item.get("is_current") or (item.get("start_year") and not item.get("end_year")):
+        end = "present"
+    else:
+        end = "/".join(str(item[k]) for k in ("end_month", "end_year") if item.get(k))
+    return f"{start}-{end}" if start or end else ""
+
+
+def _skills_text(skills) -> str:
+    if isinstance(skills, list):
+        return ", ".join(s.get("name", "") if isinstance(s, dict) else str(s) for s in skills)
+    return (skills or "").replace("|", ", ")
+
+
+def _location_text(profile: Dict) -> str:
+    if profile.get("location"):
+        return profile["location"]
+    return ", ".join(p for p in (profile.get("city"), profile.get("state"), profile.get("country")) if p)
+
+
+def compact_profile(profile: Dict, rubric: Optional[str] = None, dimensions: Optional[List[str]] = None,
+                    max_tokens: int = DEFAULT_MAX_TOKENS, model: str = "gpt-4o") -> Tuple[Dict, int]:
+    """
+    Projects a flat RapidAPI profile down to the fields the rubric dimensions need, truncating free
+    text to per-field token budgets, then shedding descriptions, the oldest roles and finally the
+    summary until the serialized profile fits in `max_tokens`. Returns the compact profile and its
+    token count.
+    """
+    fields = _allowed_fields(dimensions or rubric_dimensions(rubric))
+    compact: Dict = {}
+    name = profile.get("full_name") or " ".join(
+        p for p in (profile.get("first_name"), profile.get("last_name")) if p
+    )
+    if name:
+        compact["name"] = name
+    for key in ("headline", "about"):
+        if key in fields and profile.get(key):
+            compact[key] = truncate_tokens(str(profile[key]), TEXT_BUDGETS[key], model)
+    if "location" in fields and _location_text(profile):
+        compact["location"] = _location_text(profile)
+    if "skills" in fields and profile.get("skills"):
+        compact["skills"] = truncate_tokens(_skills_text(profile["skills"]), TEXT_BUDGETS["skills"], model)
+
+    if fields & {"experiences.title", "experiences.company", "experiences.dates", "experiences.description"}:
+        experiences = []
+        for exp in (profile.get("experiences") or [])[:MAX_EXPERIENCES]:
+            if not isinstance(exp, dict):
+                continue
+            entry = {}
+            if "experiences.title" in fields and exp.get("title"):
+                entry["title"] = exp["title"]
+            if "experiences.company" in fields and exp.get("company"):
+                entry["company"] = exp["company"]
+            if "experiences.dates" in fields and _date_range(exp):
+                entry["dates"] = _date_range(exp)
+            if "experiences.description" in fields and exp.get("description"):
+                entry["description"] = truncate_tokens(
+                    str(exp["description"]), TEXT_BUDGETS["experiences.description"], model
+                )
+            if entry:
+                experiences.append(entry)
+        if experiences:
+            compact["experiences"] = experiences
+
+    if "educations" in fields:
+        educations = []
+        for edu in (profile.get("educations") or [])[:MAX_EDUCATIONS]:
+            if not isinstance(edu, dict):
+                continue
+            entry = {k: edu[k] for k in ("school", "degree", "field_of_study") if edu.get(k)}
+            if _date_range(edu):
+                entry["dates"] = _date_range(edu)
+            if entry:
+                educations.append(entry)
+        if educations:
+            compact["educations"] = educations
+
+    tokens = count_tokens(json.dumps(compact), model)
+    # Over budget: shed descriptions first, then the oldest roles, then shorten the summary
+    for exp in reversed(compact.get("experiences", [])):
+        if tokens <= max_tokens:
+            break
+        if exp.pop("description", None) is not None:
+            tokens = count_tokens(json.dumps(compact), model)
+    while tokens > max_tokens and len(compact.get("experiences", [])) > 1:
+        compact["experiences"].pop()
+        tokens = count_tokens(json.dumps(compact), model)
+    if tokens > max_tokens and compact.get("about"):
+        keep = max(0, count_tokens(compact["about"], model) - (tokens - max_tokens))
+        compact["about"] = truncate_tokens(compact["about"], keep, model) if keep else ""
+        if not compact["about"]:
+            del compact["about"]
+        tokens = count_tokens(json.dumps(compact), model)
+    return compact, tokens
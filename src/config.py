@@ -16,6 +16,60 @@ def load_config():
         'JD_PATH': os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'job_description', 'jd1.txt'),
         'CHROMA_DB_PATH': os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'chroma_db'),
         'SCORE_RUBRIC_PATH': os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'score_fit_rubics', 'SWE_ML.txt'),
-        'OUTPUT_DIR': os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'experiments.py'),
+        'EMBED_BATCH_SIZE': int(os.getenv('EMBED_BATCH_SIZE', '100')),
+        'CHROMA_COLLECTION': os.getenv('CHROMA_COLLECTION', 'langchain'),
+        'SEMANTIC_MATCH_ENABLED': os.getenv('SEMANTIC_MATCH_ENABLED', '1') == '1',
+        'SEMANTIC_EMBEDDING': os.getenv('SEMANTIC_EMBEDDING', 'openai'),
+        'SEMANTIC_TOP_K': int(os.getenv('SEMANTIC_TOP_K', '0')),
+        'SEMANTIC_MIN_SIMILARITY': float(os.getenv('SEMANTIC_MIN_SIMILARITY', '0')),
+        'RAPIDAPI_BASE_URL': os.getenv('RAPIDAPI_BASE_URL'),
+        'RAPIDAPI_REQUESTS_PER_SECOND': float(os.getenv('RAPIDAPI_REQUESTS_PER_SECOND', '5')),
+        'RAPIDAPI_MAX_CONCURRENCY': int(os.getenv('RAPIDAPI_MAX_CONCURRENCY', '5')),
+        'RAPIDAPI_MAX_RETRIES': int(os.getenv('RAPIDAPI_MAX_RETRIES', '3')),
+        'HTTP_TIMEOUT': float(os.getenv('HTTP_TIMEOUT', '30')),
+        'TAVILY_SEARCH_URL': os.getenv('TAVILY_SEARCH_URL'),
+        'TAVILY_MAX_TOTAL_RESULTS': int(os.getenv('TAVILY_MAX_TOTAL_RESULTS', '7')),
+        'TAVILY_MAX_RESULTS_PER_TITLE': int(os.getenv('TAVILY_MAX_RESULTS_PER_TITLE', '4')),
+        'QUERY_PLANNER_ENABLED': os.getenv('QUERY_PLANNER_ENABLED', '1') == '1',
+        'QUERY_PLANNER_TARGET': int(os.getenv('QUERY_PLANNER_TARGET', '0')),
+        'QUERY_PLANNER_MAX_QUERIES': int(os.getenv('QUERY_PLANNER_MAX_QUERIES', '12')),
+        'QUERY_PLANNER_MIN_YIELD': float(os.getenv('QUERY_PLANNER_MIN_YIELD', '0.25')),
+        'QUERY_PLANNER_RESULTS_PER_QUERY': int(os.getenv('QUERY_PLANNER_RESULTS_PER_QUERY', '5')),
+        'QUERY_PLANNER_MAX_KEYWORDS': int(os.getenv('QUERY_PLANNER_MAX_KEYWORDS', '3')),
+        'TAVILY_MAX_CONCURRENCY': int(os.getenv('TAVILY_MAX_CONCURRENCY', '8')),
+        'TAVILY_REQUESTS_PER_SECOND': float(os.getenv('TAVILY_REQUESTS_PER_SECOND', '10')),
+        'TAVILY_MAX_RETRIES': int(os.getenv('TAVILY_MAX_RETRIES', '2')),
+        'OPENAI_MAX_RETRIES': int(os.getenv('OPENAI_MAX_RETRIES', '2')),
+        'OPENAI_MAX_CONCURRENCY': int(os.getenv('OPENAI_MAX_CONCURRENCY', '8')),
+        'OPENAI_REQUESTS_PER_SECOND': float(os.getenv('OPENAI_REQUESTS_PER_SECOND', '8')),
+        'SCORING_MODEL': os.getenv('SCORING_MODEL', 'gpt-4o'),
+        'SCORING_BATCH_SIZE': int(os.getenv('SCORING_BATCH_SIZE', '5')),
+        'SCORING_MAX_WORKERS': int(os.getenv('SCORING_MAX_WORKERS', '4')),
+        'SCORING_MAX_RETRIES': int(os.getenv('SCORING_MAX_RETRIES', '2')),
+        'MESSAGE_MIN_FIT_SCORE': float(os.getenv('MESSAGE_MIN_FIT_SCORE', '5.0')),
+        'MESSAGE_MAX_WORKERS': int(os.getenv('MESSAGE_MAX_WORKERS', '4')),
+        'MESSAGE_MAX_RETRIES': int(os.getenv('MESSAGE_MAX_RETRIES', '2')),
+        'MESSAGE_PROFILE_MAX_TOKENS': int(os.getenv('MESSAGE_PROFILE_MAX_TOKENS', '200')),
+        'PROMPT_PROFILE_MAX_TOKENS': int(os.getenv('PROMPT_PROFILE_MAX_TOKENS', '600')),
+        'EXTRACTION_MIN_CONFIDENCE': float(os.getenv('EXTRACTION_MIN_CONFIDENCE', '0.7')),
+        'EXTRACTION_MAX_CHARS': int(os.getenv('EXTRACTION_MAX_CHARS', '2000')),
+        'PREFILTER_TOP_K': int(os.getenv('PREFILTER_TOP_K', '20')),
+        'PREFILTER_MIN_SCORE': float(os.getenv('PREFILTER_MIN_SCORE', '2.0')),
+        'PROFILE_CACHE_PATH': os.getenv('PROFILE_CACHE_PATH', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'profiles.sqlite3')),
+        'PROFILE_CACHE_TTL_SECONDS': float(os.getenv('PROFILE_CACHE_TTL_SECONDS', str(7 * 24 * 3600))),
+        'PROFILE_CACHE_MAX_ENTRIES': int(os.getenv('PROFILE_CACHE_MAX_ENTRIES', '10000')),
+        'IDENTITY_INDEX_PATH': os.getenv('IDENTITY_INDEX_PATH', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'identities.sqlite3')),
+        'IDENTITY_INDEX_MAX_ENTRIES': int(os.getenv('IDENTITY_INDEX_MAX_ENTRIES', '100000')),
+        'CANDIDATE_STORE_PATH': os.getenv('CANDIDATE_STORE_PATH', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'candidates.sqlite3')),
+        'LLM_CACHE_PATH': os.getenv('LLM_CACHE_PATH', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'llm.sqlite3')),
+        'LLM_CACHE_TTL_SECONDS': float(os.getenv('LLM_CACHE_TTL_SECONDS', '0')),
+        'LLM_CACHE_MAX_ENTRIES': int(os.getenv('LLM_CACHE_MAX_ENTRIES', '5000')),
+        'LLM_CACHE_NONZERO_TEMPERATURE': os.getenv('LLM_CACHE_NONZERO_TEMPERATURE', '0') == '1',
+        'STREAM_TOP_N': int(os.getenv('STREAM_TOP_N', '0')),
+        'STREAM_MIN_FIT_SCORE': float(os.getenv('STREAM_MIN_FIT_SCORE', '7.0')),
+        'STREAM_QUEUE_SIZE': int(os.getenv('STREAM_QUEUE_SIZE', '16')),
+        'STREAM_BATCH_WAIT_SECONDS': float(os.getenv('STREAM_BATCH_WAIT_SECONDS', '0.5')),
+        'BATCH_MAX_WORKERS': int(os.getenv('BATCH_MAX_WORKERS', '4')),
+        'OUTPUT_DIR': os.getenv('OUTPUT_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'outputs')),
     }
     return config 
\ No newline at end of file
@@ -0,0 +1,129 @@
+from typing import Dict, List, Optional, Set
+import threading
+import time
+from src.disk_cache import DiskCache
+from src.linkedin_url import normalize_linkedin_url, profile_slug
+
+MAX_VARIANTS = 10
+MAX_QUERIES = 50
+
+_STORES: Dict[str, DiskCache] = {}
+_STORES_LOCK = threading.Lock()
+# Serializes read-merge-write of stored identities between concurrent searches
+_MERGE_LOCK = threading.Lock()
+
+
+def get_identity_store(config: dict) -> Optional[DiskCache]:
+    """
+    Returns the shared on-disk identity store, or None if IDENTITY_INDEX_PATH is empty.
+    """
+    path = config.get("IDENTITY_INDEX_PATH")
+    if not path:
+        return None
+    with _STORES_LOCK:
+        if path not in _STORES:
+            _STORES[path] = DiskCache(path, table="candidate_identities", ttl_seconds=0,
+                                      max_entries=int(config.get("IDENTITY_INDEX_MAX_ENTRIES", 100000)))
+        return _STORES[path]
+
+
+class IdentityIndex:
+    """
+    Merges search hits that point at the same person into one identity keyed by profile slug,
+    so 'uk.linkedin.com/in/x/', 'linkedin.com/in/x?trk=...' and 'www.linkedin.com/in/X' count once.
+    Each identity records the URL spellings seen and the queries that surfaced it (with the best
+    rank per query). With a `store`, identities accumulate across runs.
+    """
+
+    def __init__(self, store: Optional[DiskCache] = None):
+        self.store = store
+        self._entries: Dict[str, Dict] = {}
+        self._best_rank: Dict[str, int] = {}
+        self._run_queries: Dict[str, Set[str]] = {}
+        self._order: List[str] = []
+
+    def _entry(self, slug: str) -> Dict:
+        if slug not in self._entries:
+            stored = self.store.get(slug) if self.store else None
+            self._entries[slug] = stored or {
+                "linkedin_url": f"https://www.linkedin.com/in/{slug}",
+                "variants": [],
+                "queries": {},
+                "runs": 0,
+                "first_seen": time.time(),
+            }
+        return self._entries[slug]
+
+    def add_hit(self, url: str, query: str, rank: int) -> Optional[str]:
+        """
+        Records that `query` returned `url` at position `rank` (0 is best).
+        Returns the identity slug, or None if the URL is not a profile URL.
+        """
+        slug = profile_slug(url)
+        if slug is None:
+            return None
+        entry = self._entry(slug)
+        if slug not in self._best_rank:
+            self._order.append(slug)
+            self._best_rank[slug] = rank
+            self._run_queries[slug] = set()
+            entry["runs"] += 1
+        else:
+            self._best_rank[slug] = min(self._best_rank[slug], rank)
+        self._run_queries[slug].add(query)
+        if url not in entry["variants"]:
+            entry["variants"] = (entry["variants"] + [url])[-MAX_VARIANTS:]
+        queries = entry["queries"]
+        queries[query] = min(queries.get(query, rank), rank)
+        if len(queries) > MAX_QUERIES:
+            entry["queries"] = dict(list(queries.items())[-MAX_QUERIES:])
+        entry["last_seen"] = time.time()
+        return slug
+
+    def sources(self, url: str) -> Dict[str, int]:
+        """
+        Returns {query: best rank} for every query that has surfaced this profile.
+        """
+        slug = profile_slug(url)
+        return dict(self._entries[slug]["queries"]) if slug in self._entries else {}
+
+    def ranked_urls(self) -> List[str]:
+        """
+        Canonical URLs of the identities hit in this run, one per person. Profiles surfaced by
+        more distinct queries of this run come first, then by best rank in this run, then by the
+        order they were first seen. Queries from earlier runs (which may belong to another
+        requisition sharing the store) don't affect the ranking.
+        """
+        position = {slug: i for i, slug in enumerate(self._order)}
+        ranked = sorted(
+            self._order,
+            key=lambda slug: (-len(self._run_queries[slug]), self._best_rank[slug], position[slug])
+        )
+        return [self._entries[slug]["linkedin_url"] for slug in ranked]
+
+    def save(self) -> None:
+        """
+        Writes this run's identities to the store, merging with what other runs saved meanwhile.
+        """
+        if not self.store:
+            return
+        with _MERGE_LOCK:
+            for slug in self._order:
+                entry = self._entries[slug]
+                stored = self.store.get(slug)
+                if stored:
+                    queries = dict(stored["queries"])
+                    for query, rank in entry["queries"].items():
+                        queries[query] = min(queries.get(query, rank), rank)
+                    entry["queries"] = dict(list(queries.items())[-MAX_QUERIES:])
+                    entry["variants"] = list(dict.fromkeys(stored["variants"] + entry["variants"]))[-MAX_VARIANTS:]
+                    entry["runs"] = max(entry["runs"], stored["runs"])
+                    entry["first_seen"] = min(entry["first_seen"], stored["first_seen"])
+                self.store.set(slug, entry)
+
+
+def dedupe_urls(urls: List[str]) -> List[str]:
+    """
+    Canonicalizes URLs and drops repeats of the same profile, keeping first-seen order.
+    """
+    return list(dict.fromkeys(normalize_linkedin_url(url) for url in urls if url))
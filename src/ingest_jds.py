@@ -0,0 +1,24 @@
+import argparse
+import os
+import sys
+
+# Allow `python src/ingest_jds.py` to resolve the `src` package like app.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import load_config
+from src.jd_processing import ingest_jd_directory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embed a directory of job descriptions into ChromaDB.")
+    parser.add_argument("jd_dir", help="Directory containing .txt job descriptions.")
+    args = parser.parse_args()
+
+    config = load_config()
+    summary = ingest_jd_directory(args.jd_dir, config)
+    for name, new_chunks in summary.items():
+        print(f"{name}: {new_chunks} new chunks embedded.")
+    print(f"Ingested {len(summary)} job descriptions, {sum(summary.values())} new chunks in total.")
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,26 @@
-from typing import List, Any
-from langchain.document_loaders import TextLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.vectorstores import Chroma
-from langchain_openai import OpenAIEmbeddings
+from typing import TYPE_CHECKING, List, Any, Dict, Optional
+import hashlib
 import os
+from src.clients import get_clients
+
+if TYPE_CHECKING:
+    from langchain.vectorstores import Chroma
 
 
 def load_jd(jd_path: str) -> str:
     """
     Loads the job description text from a file.
     """
-    loader = TextLoader(jd_path)
-    documents = loader.load()
-    return documents[0].page_content
+    # Plain read instead of langchain's TextLoader, which would import langchain just to open a file
+    with open(jd_path, "r") as f:
+        return f.read()
 
 
 def split_jd(jd_text: str, chunk_size: int = 500, chunk_overlap: int = 50) -> List[Any]:
     """
     Splits the job description text into chunks for embedding.
     """
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
     text_splitter = RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap
@@ -29,16 +31,59 @@ def split_jd(jd_text: str, chunk_size: int = 500, chunk_overlap: int = 50) -> Li
     return text_splitter.split_documents([doc])
 
 
-def embed_and_save_chunks(split_docs: List[Any], config: dict) -> None:
+def chunk_id(text: str) -> str:
     """
-    Embeds the split job description chunks and saves them to ChromaDB.
+    Stable, content-addressed ID for a chunk so identical text always maps to the same vector.
     """
-    # Ensure the API key is set in the environment
-    os.environ['OPENAI_API_KEY'] = config['OPENAI_API_KEY']
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def _get_vectorstore(config: dict) -> "Chroma":
+    from langchain.vectorstores import Chroma
     os.makedirs(config['CHROMA_DB_PATH'], exist_ok=True)
-    embedding_model = OpenAIEmbeddings(model="text-embedding-3-small")
-    Chroma.from_documents(
-        documents=split_docs,
-        embedding=embedding_model,
-        persist_directory=config['CHROMA_DB_PATH']
-    ) 
\ No newline at end of file
+    embedding_model = get_clients(config).embeddings("text-embedding-3-small")
+    return Chroma(
+        persist_directory=config['CHROMA_DB_PATH'],
+        embedding_function=embedding_model
+    )
+
+
+def embed_and_save_chunks(split_docs: List[Any], config: dict, vectorstore: Optional["Chroma"] = None) -> int:
+    """
+    Embeds the split job description chunks and saves them to ChromaDB.
+    Chunks are stored under their content hash; chunks already in the store are skipped and new
+    ones are embedded in batches of EMBED_BATCH_SIZE and upserted. Returns the number of new chunks.
+    """
+    if vectorstore is None:
+        vectorstore = _get_vectorstore(config)
+    # Dedupe within this call too, keeping the first occurrence of each chunk
+    docs_by_id = {}
+    for doc in split_docs:
+        docs_by_id.setdefault(chunk_id(doc.page_content), doc)
+    if not docs_by_id:
+        return 0
+    existing = set(vectorstore.get(ids=list(docs_by_id), include=[])["ids"])
+    new_ids = [cid for cid in docs_by_id if cid not in existing]
+    batch_size = max(1, int(config.get('EMBED_BATCH_SIZE', 100)))
+    for start in range(0, len(new_ids), batch_size):
+        batch_ids = new_ids[start:start + batch_size]
+        vectorstore.add_documents([docs_by_id[cid] for cid in batch_ids], ids=batch_ids)
+    return len(new_ids)
+
+
+def ingest_jd_directory(jd_dir: str, config: dict, pattern: str = ".txt") -> Dict[str, int]:
+    """
+    Loads, splits and embeds every job description in `jd_dir`, skipping chunks that are already stored.
+    Returns a dict of file name -> number of newly embedded chunks.
+    """
+    vectorstore = _get_vectorstore(config)
+    summary = {}
+    for name in sorted(os.listdir(jd_dir)):
+        path = os.path.join(jd_dir, name)
+        if not name.endswith(pattern) or not os.path.isfile(path):
+            continue
+        split_docs = split_jd(load_jd(path))
+        for idx, doc in enumerate(split_docs):
+            doc.metadata.update({"source": name, "chunk_index": idx})
+        summary[name] = embed_and_save_chunks(split_docs, config, vectorstore=vectorstore)
+    return summary
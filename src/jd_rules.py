@@ -0,0 +1,159 @@
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+import re
+
+# The fields KOR extracts; every parser below returns (value, confidence in 0-1)
+JOB_FIELDS = ["title", "location", "keywords"]
+
+_US_STATE_CODES = set(
+    "AL AK AZ AR CA CO CT DE FL GA HI ID IL IN IA KS KY LA ME MD MA MI MN MS MO MT NE NV NH NJ NM NY "
+    "NC ND OH OK OR PA RI SC SD TN TX UT VT VA WA WV WI WY DC".split()
+)
+
+ROLE_WORDS = {
+    "engineer", "developer", "scientist", "researcher", "analyst", "architect", "manager", "designer",
+    "lead", "director", "specialist", "consultant", "administrator", "programmer", "intern",
+}
+
+# Canonical spelling of skills recognized in free text, matched case-insensitively on word boundaries.
+# Entries in AMBIGUOUS_SKILLS are also plain English words ('go the extra mile', 'the rest of the
+# team'), so they only count with their exact spelling and not as the first word of a sentence.
+SKILL_LEXICON = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "C++", "C#", "Scala", "Kotlin", "Swift", "Ruby",
+    "SQL", "NoSQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Kafka", "Spark", "Hadoop", "Airflow", "dbt",
+    "Snowflake", "BigQuery", "AWS", "GCP", "Azure", "Docker", "Kubernetes", "Terraform", "Linux", "Git",
+    "React", "Node.js", "Django", "Flask", "FastAPI", "GraphQL", "REST",
+    "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "Reinforcement Learning", "LLMs", "LLM",
+    "Neural Networks", "Transformers", "Fine-tuning", "RAG", "Embeddings", "MLOps", "Data Engineering",
+    "Distributed Systems", "Recommender Systems", "Statistics", "A/B Testing",
+    "PyTorch", "TensorFlow", "JAX", "Keras", "scikit-learn", "Pandas", "NumPy", "Hugging Face",
+    "LangChain", "OpenAI", "ChromaDB", "CUDA", "Copilot", "ChatGPT",
+]
+AMBIGUOUS_SKILLS = {"Go", "REST", "Spark", "Swift", "Rust", "Ruby", "Git", "Scala"}
+_SENTENCE_START_RE = re.compile(r"(?:^|[.!?:;]|[-•*]|\n)\s*$")
+_SKILL_PATTERNS = [
+    (skill, re.compile(r"(?<![\w+#])" + re.escape(skill) + r"(?![\w+#])",
+                       0 if skill in AMBIGUOUS_SKILLS else re.IGNORECASE))
+    for skill in SKILL_LEXICON
+]
+
+# Label, separator and value must share one line; a label that ends its line heads a list below it
+_LABEL_RE = {
+    "title": re.compile(r"^[ \t]*(?:job[ \t]+)?(?:title|position|role)[ \t]*[:\-–][ \t]*(.*?)[ \t]*$",
+                        re.IGNORECASE | re.MULTILINE),
+    "location": re.compile(r"^[ \t]*(?:job[ \t]+)?location[ \t]*[:\-–][ \t]*(.*?)[ \t]*$", re.IGNORECASE | re.MULTILINE),
+    "keywords": re.compile(r"^[ \t]*(?:required[ \t]+skills|skills|tech(?:nology)?[ \t]+stack|required[ \t]+tools)"
+                           r"[ \t]*[:\-–][ \t]*(.*?)[ \t]*$", re.IGNORECASE | re.MULTILINE),
+}
+_BULLET_RE = re.compile(r"^(?:[-•*▪◦]|\d+[.)])[ \t]+(.+)$")
+_CITY_STATE_RE = re.compile(r"\b([A-Z][a-z]+(?:\s[A-Z][a-z]+){0,2}),\s*([A-Z]{2})\b")
+_REMOTE_RE = re.compile(r"\bremote\b", re.IGNORECASE)
+# Words that open a sentence about the job ('you will own...') rather than name a title or place
+_SENTENCE_OPENERS = {"you", "we", "our", "the", "this", "a", "an", "in", "as", "join", "help", "work"}
+
+
+def _labeled(field: str, text: str) -> List[str]:
+    """
+    Returns the values under the field's label: the rest of the label line, or, when the label
+    ends its line, the bullet lines right below it (or the next line if there are no bullets).
+    """
+    match = _LABEL_RE[field].search(text)
+    if not match:
+        return []
+    if match.group(1):
+        return [match.group(1)]
+    items = []
+    for line in text[match.end():].splitlines()[1:]:
+        line = line.strip()
+        if not line:
+            if items:
+                break
+            continue
+        bullet = _BULLET_RE.match(line)
+        if bullet:
+            items.append(bullet.group(1).strip())
+        elif not items:
+            return [line]
+        else:
+            break
+    return items
+
+
+def _sentence_like(value: str) -> bool:
+    words = value.split()
+    return (not words or len(words) > 10 or value.rstrip().endswith((".", "!", "?", "…"))
+            or words[0].lower() in _SENTENCE_OPENERS or " will " in f" {value.lower()} ")
+
+
+def parse_title(text: str) -> Tuple[str, float]:
+    """
+    A 'Title:'/'Position:' line wins unless its value reads like a sentence; otherwise a short first line naming a role (e.g.
+    'Software Engineer, ML Research') is taken with slightly lower confidence.
+    """
+    labeled = _labeled("title", text)
+    if labeled and not _sentence_like(labeled[0]):
+        return labeled[0], 0.95
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        words = re.findall(r"[a-z]+", line.lower())
+        if len(line) <= 80 and len(words) <= 10 and ROLE_WORDS & set(words) and not line.endswith("."):
+            return line, 0.8
+        break
+    return "", 0.0
+
+
+def parse_location(text: str) -> Tuple[str, float]:
+    """
+    A 'Location:' line wins unless it reads like a sentence; otherwise the 'City, ST' mentioned in the JD, which is only trusted
+    when the JD names a single place. Falls back to 'Remote' if the role says so.
+    """
+    labeled = _labeled("location", text)
+    if labeled and not _sentence_like(labeled[0]):
+        return labeled[0], 0.95
+    places = Counter(f"{city}, {state}" for city, state in _CITY_STATE_RE.findall(text) if state in _US_STATE_CODES)
+    if places:
+        place, _ = places.most_common(1)[0]
+        return place, 0.9 if len(places) == 1 else 0.5
+    if _REMOTE_RE.search(text):
+        return "Remote", 0.75
+    return "", 0.0
+
+
+def _find_skill(skill: str, pattern: "re.Pattern", text: str) -> Optional[int]:
+    for match in pattern.finditer(text):
+        if skill not in AMBIGUOUS_SKILLS or not _SENTENCE_START_RE.search(text[:match.start()]):
+            return match.start()
+    return None
+
+
+def parse_keywords(text: str) -> Tuple[str, float]:
+    """
+    A 'Required skills: a, b, c' line, or the bullet list under a 'Required skills:' header,
+    wins (with lower confidence if the items read like requirements); otherwise skills from SKILL_LEXICON found in
+    the text, in order of first mention. A lexicon scan can't tell required skills from passing
+    mentions, so it stays below the default EXTRACTION_MIN_CONFIDENCE and KOR still runs.
+    """
+    labeled = _labeled("keywords", text)
+    items = [item.strip() for value in labeled for item in re.split(r"[,;|]", value) if item.strip()]
+    if items:
+        # Bullets like '3+ years of Python in production' are requirements, not skill names
+        short = all(len(item.split()) <= 4 and not item.endswith(".") for item in items)
+        return ", ".join(items), 0.9 if short else 0.5
+    found = []
+    for skill, pattern in _SKILL_PATTERNS:
+        position = _find_skill(skill, pattern, text)
+        if position is not None:
+            found.append((position, skill))
+    skills: List[str] = list(dict.fromkeys(skill for _, skill in sorted(found)))
+    if not skills:
+        return "", 0.0
+    return ", ".join(skills), 0.5 if len(skills) >= 3 else 0.3
+
+
+def parse_job_info(text: str) -> Dict[str, Tuple[str, float]]:
+    """
+    Runs the deterministic parsers; returns {field: (value, confidence)} for every JOB_FIELDS entry.
+    """
+    return {"title": parse_title(text), "location": parse_location(text), "keywords": parse_keywords(text)}
@@ -1,54 +1,140 @@
-from kor.extraction import create_extraction_chain
-from kor.nodes import Object, Text
-from langchain_openai import ChatOpenAI
-from typing import Dict
-import os
-
-def get_kor_schema() -> Object:
-    """
-    Returns the KOR schema for extracting job title, location, and skills from a job description.
-    """
-    schema = Object(
-        id="job_info",
-        description="Extract job title, location, and skills from a job description.",
-        attributes=[
-            Text(
-                id="title",
-                description="The job title",
-                examples=[
-                    ("We are looking for an AI Engineer to join our team.", "AI Engineer"),
-                    ("As a Machine Learning Engineer, you will work on cutting-edge models.", "Machine Learning Engineer"),
-                ],
-            ),
-            Text(
-                id="location",
-                description="Job location",
-                examples=[
-                    ("This is a remote role based in the US.", "Remote - US"),
-                    ("The position is in San Francisco, CA.", "San Francisco, CA"),
-                ],
-            ),
-            Text(
-                id="keywords",
-                description="Comma-separated list of required skills or tools",
-                examples=[
-                    ("Required skills: Python, LangChain, OpenAI", "Python, LangChain, OpenAI"),
-                    ("Must know NLP, embeddings, and ChromaDB", "NLP, embeddings, ChromaDB"),
-                ],
-            ),
-        ],
-        many=False,
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+import threading
+from src.clients import get_clients
+from src.jd_processing import split_jd
+from src.jd_rules import JOB_FIELDS, parse_job_info
+from src.llm import cached_call
+from src.metrics import METRICS, instrument
+from src.prefilter import get_job_info
+
+if TYPE_CHECKING:
+    from kor.nodes import Object
+
+
+# Plain-data description of the KOR schema. It is also the cache key, so kor (and langchain)
+# are only imported when a JD actually has to be sent to the LLM.
+JOB_INFO_SCHEMA = {
+    "id": "job_info",
+    "description": "Extract job title, location, and skills from a job description.",
+    "attributes": [
+        {
+            "id": "title",
+            "description": "The job title",
+            "examples": [
+                ("We are looking for an AI Engineer to join our team.", "AI Engineer"),
+                ("As a Machine Learning Engineer, you will work on cutting-edge models.", "Machine Learning Engineer"),
+            ],
+        },
+        {
+            "id": "location",
+            "description": "Job location",
+            "examples": [
+                ("This is a remote role based in the US.", "Remote - US"),
+                ("The position is in San Francisco, CA.", "San Francisco, CA"),
+            ],
+        },
+        {
+            "id": "keywords",
+            "description": "Comma-separated list of required skills or tools",
+            "examples": [
+                ("Required skills: Python, LangChain, OpenAI", "Python, LangChain, OpenAI"),
+                ("Must know NLP, embeddings, and ChromaDB", "NLP, embeddings, ChromaDB"),
+            ],
+        },
+    ],
+    "many": False,
+}
+
+
+def _schema_for(fields: List[str]) -> Dict:
+    return {**JOB_INFO_SCHEMA, "attributes": [a for a in JOB_INFO_SCHEMA["attributes"] if a["id"] in fields]}
+
+
+def get_kor_schema(fields: Optional[List[str]] = None) -> "Object":
+    """
+    Returns the KOR schema for extracting job title, location, and skills from a job description,
+    restricted to `fields` when given.
+    """
+    from kor.nodes import Object, Text
+    schema = _schema_for(fields or JOB_FIELDS)
+    return Object(
+        id=schema["id"],
+        description=schema["description"],
+        attributes=[Text(**attribute) for attribute in schema["attributes"]],
+        many=schema["many"],
     )
-    return schema
 
 
+# Built chains keyed by (chat model, fields). The chain keeps its model alive, so the id stays unique.
+_CHAINS: Dict[Tuple[int, Tuple[str, ...]], Any] = {}
+_CHAINS_LOCK = threading.Lock()
+
+
+def get_extraction_chain(config: dict, fields: List[str]) -> Any:
+    """
+    Returns the KOR extraction chain for `fields`, building it on first use only.
+    """
+    llm = get_clients(config).chat_model("gpt-4", temperature=0)
+    key = (id(llm), tuple(fields))
+    with _CHAINS_LOCK:
+        chain = _CHAINS.get(key)
+        if chain is None:
+            from kor.extraction import create_extraction_chain
+            chain = _CHAINS[key] = create_extraction_chain(llm, get_kor_schema(fields))
+    return chain
+
+
+# Words that mark a chunk as relevant to a field when trimming long JDs
+_FIELD_CUES = {
+    "title": ("title", "role", "position", "looking for", "join"),
+    "location": ("location", "remote", "on-site", "onsite", "hybrid", "based in", "office"),
+    "keywords": ("skill", "requirement", "qualification", "experience", "proficien", "familiar", "knowledge", "stack"),
+}
+
+
+def trim_jd(jd_text: str, fields: List[str], max_chars: int) -> str:
+    """
+    Cuts a long JD down to the split_jd chunks that mention the fields still to extract, plus the
+    opening chunk (title and header line), in their original order and within `max_chars`.
+    Short JDs are returned as they are.
+    """
+    if len(jd_text) <= max_chars:
+        return jd_text
+    chunks = [doc.page_content for doc in split_jd(jd_text)]
+    cues = [cue for field in fields for cue in _FIELD_CUES[field]]
+    relevance = {i: sum(chunks[i].lower().count(cue) for cue in cues) for i in range(1, len(chunks))}
+    keep, size = {0}, len(chunks[0])
+    for i in sorted(relevance, key=lambda i: -relevance[i]):
+        if relevance[i] and size + len(chunks[i]) <= max_chars:
+            keep.add(i)
+            size += len(chunks[i])
+    return "\n\n".join(chunks[i] for i in sorted(keep))
+
+
+@instrument()
 def extract_structured_info(jd_text: str, config: dict) -> Dict:
     """
-    Extracts structured job info from the job description text using KOR and an LLM.
+    Extracts job title, location and skills from the job description text.
+    The rule-based parser in src.jd_rules runs first; only fields it cannot fill with at least
+    EXTRACTION_MIN_CONFIDENCE go to KOR and the LLM, over the JD trimmed to its relevant chunks.
+    LLM results are cached per trimmed text, model and requested fields.
     """
-    os.environ['OPENAI_API_KEY'] = config['OPENAI_API_KEY']
-    llm = ChatOpenAI(model="gpt-4", temperature=0)
-    schema = get_kor_schema()
-    chain = create_extraction_chain(llm, schema)
-    result = chain.invoke(jd_text)
-    return result["data"] 
\ No newline at end of file
+    parsed = parse_job_info(jd_text)
+    min_confidence = config.get('EXTRACTION_MIN_CONFIDENCE', 0.7)
+    job = {field: value for field, (value, confidence) in parsed.items() if confidence >= min_confidence}
+    missing = [field for field in JOB_FIELDS if field not in job]
+    METRICS.record_cache("extraction_rules", hit=not missing)
+
+    if missing:
+        text = trim_jd(jd_text, missing, config.get('EXTRACTION_MAX_CHARS', 2000))
+
+        def run_chain():
+            chain = get_extraction_chain(config, missing)
+            with get_clients(config).throttle("openai"):
+                return chain.invoke(text)["data"]
+
+        extracted = get_job_info(cached_call(config, run_chain, kind="kor_extraction", model="gpt-4", temperature=0,
+                                             schema=_schema_for(missing), text=text))
+        for field in missing:
+            job[field] = extracted.get(field) or parsed[field][0]
+    return {"job_info": [{field: job[field] for field in JOB_FIELDS}]}
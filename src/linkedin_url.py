@@ -0,0 +1,34 @@
+from typing import Optional
+from urllib.parse import urlsplit, unquote
+
+
+def normalize_linkedin_url(url: str) -> str:
+    """
+    Canonicalizes a LinkedIn profile URL so different spellings of the same profile compare equal.
+    Drops locale subdomains (uk., de., ...), query strings, fragments, trailing slashes and
+    sub-pages, e.g. 'uk.linkedin.com/in/Jane-Doe/?trk=x' -> 'https://www.linkedin.com/in/jane-doe'.
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    host = parts.netloc.lower().split("@")[-1].split(":")[0]
+    if host == "linkedin.com" or host.endswith(".linkedin.com"):
+        host = "www.linkedin.com"
+    segments = [s for s in unquote(parts.path).split("/") if s]
+    if len(segments) >= 2 and segments[0].lower() == "in":
+        segments = ["in", segments[1].lower()]
+    path = "/".join(segments)
+    return f"https://{host}/{path}" if path else f"https://{host}"
+
+
+def profile_slug(url: str) -> Optional[str]:
+    """
+    Returns the canonical profile slug ('jane-doe') that identifies a person, or None if `url`
+    is not a LinkedIn /in/ profile URL.
+    """
+    canonical = normalize_linkedin_url(url)
+    prefix = "https://www.linkedin.com/in/"
+    if not canonical.startswith(prefix) or len(canonical) == len(prefix):
+        return None
+    return canonical[len(prefix):]
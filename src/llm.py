@@ -0,0 +1,139 @@
+from typing import Any, Callable, Dict, List, Optional
+import hashlib
+import json
+import re
+import threading
+from src.clients import get_clients
+from src.disk_cache import DiskCache
+from src.metrics import METRICS
+
+_client_override = None
+_caches: Dict[str, DiskCache] = {}
+_lock = threading.Lock()
+
+
+def set_llm_client(client) -> None:
+    """
+    Replaces the OpenAI client used by every stage, e.g. with a local fake in tests or benchmarks.
+    Pass None to go back to the real client.
+    """
+    global _client_override
+    _client_override = client
+
+
+def get_llm_client(config: dict):
+    """
+    Returns the injected client if there is one, otherwise the shared OpenAI client from the registry.
+    """
+    if _client_override is not None:
+        return _client_override
+    return get_clients(config).openai()
+
+
+def get_llm_cache(config: dict) -> Optional[DiskCache]:
+    """
+    Returns the shared LLM response cache, or None if LLM_CACHE_PATH is empty.
+    """
+    path = config.get('LLM_CACHE_PATH')
+    if not path:
+        return None
+    with _lock:
+        if path not in _caches:
+            _caches[path] = DiskCache(
+                path,
+                table="llm_responses",
+                ttl_seconds=float(config.get('LLM_CACHE_TTL_SECONDS', 0)),
+                max_entries=int(config.get('LLM_CACHE_MAX_ENTRIES', 5000)),
+            )
+        return _caches[path]
+
+
+def llm_cache_stats(config: dict) -> Dict:
+    cache = get_llm_cache(config)
+    return cache.stats() if cache else {"hits": 0, "misses": 0, "hit_rate": 0.0, "size": 0}
+
+
+def cache_key(**parts) -> str:
+    """
+    Hashes everything that determines an LLM response (model, temperature, messages, schema...).
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cacheable(config: dict, temperature: float, cache_nonzero_temperature: Optional[bool]) -> bool:
+    # Sampling at temperature > 0 is meant to vary, so only cache it when asked to
+    if temperature == 0:
+        return True
+    if cache_nonzero_temperature is None:
+        return bool(config.get('LLM_CACHE_NONZERO_TEMPERATURE', False))
+    return cache_nonzero_temperature
+
+
+def chat_completion(config: dict, messages: List[Dict], model: str = "gpt-4", temperature: float = 0.0,
+                    response_format: Optional[Dict] = None, cache_nonzero_temperature: Optional[bool] = None,
+                    use_cache: bool = True) -> Optional[str]:
+    """
+    Runs a chat completion through the shared client and returns the message content.
+    Responses are cached on disk keyed by model, temperature, messages and response format;
+    calls with temperature > 0 are only cached when opted in. `use_cache=False` forces a fresh
+    call (the new response still replaces the cached one). Calls share the "openai" rate limit
+    and concurrency slots, so concurrent stages and batch requisitions can't flood the API.
+    """
+    cache = get_llm_cache(config) if _cacheable(config, temperature, cache_nonzero_temperature) else None
+    key = cache_key(model=model, temperature=temperature, messages=messages, response_format=response_format)
+    if cache is not None and use_cache:
+        cached = cache.get(key)
+        METRICS.record_cache("llm", cached is not None)
+        if cached is not None:
+            return cached["content"]
+    kwargs = {"model": model, "messages": messages, "temperature": temperature}
+    if response_format:
+        kwargs["response_format"] = response_format
+    with get_clients(config).throttle("openai"):
+        response = get_llm_client(config).chat.completions.create(**kwargs)
+    METRICS.record_llm_response(model, response)
+    content = response.choices[0].message.content
+    if cache is not None and content:
+        cache.set(key, {"content": content})
+    return content
+
+
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+
+
+def parse_json_response(content: Optional[str]) -> Any:
+    """
+    Parses JSON returned by an LLM, repairing the usual damage locally instead of re-asking:
+    markdown code fences, prose around the object and trailing commas.
+    Raises json.JSONDecodeError if the text still is not valid JSON.
+    """
+    text = _FENCE_RE.sub("", (content or "").strip())
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    start = min((i for i in (text.find("{"), text.find("[")) if i != -1), default=-1)
+    end = max(text.rfind("}"), text.rfind("]"))
+    if start != -1 and end > start:
+        text = text[start:end + 1]
+    return json.loads(_TRAILING_COMMA_RE.sub(r"\1", text))
+
+
+def cached_call(config: dict, fn: Callable[[], Any], **key_parts) -> Any:
+    """
+    Memoizes a deterministic LLM-backed call that does not go through chat_completion
+    (e.g. a KOR chain) under a key built from `key_parts`. Results must be JSON-serializable.
+    """
+    cache = get_llm_cache(config)
+    key = cache_key(**key_parts)
+    if cache is not None:
+        cached = cache.get(key)
+        METRICS.record_cache("llm", cached is not None)
+        if cached is not None:
+            return cached["value"]
+    value = fn()
+    if cache is not None and value:
+        cache.set(key, {"value": value})
+    return value
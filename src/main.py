@@ -1,71 +1,138 @@
-from config import load_config
-from jd_processing import load_jd, split_jd, embed_and_save_chunks
-from kor_extraction import extract_structured_info
-from title_generation import generate_alternate_titles
-from tavily_search import search_linkedin_profiles
-from rapidapi_enrich import enrich_profiles_with_rapidapi
-from scoring import score_candidates
-from messaging import craft_linkedin_messages
+from typing import Optional
+import argparse
 import json
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
+# Allow `python src/main.py` to resolve the `src` package like app.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def main():
-    # 1. Load config
-    config = load_config()
-    print("Loaded config.")
+from src.config import load_config
+from src.batch import INCREMENTAL_RERUN_FROM, collect_jd_paths, format_summary, requisition_name, run_batch
+from src.candidate import write_scores_csv
+from src.jd_processing import load_jd
+from src.kor_extraction import extract_structured_info
+from src.messaging import craft_linkedin_messages
+from src.metrics import METRICS
+from src.pipeline import PipelineRunner
+from src.stages import build_stages
+from src.streaming import StreamingPipeline
+from src.title_generation import generate_alternate_titles
 
-    # 2. Load and process job description
-    jd_text = load_jd(config['JD_PATH'])
-    print("Loaded job description.")
-    split_docs = split_jd(jd_text)
-    print(f"Split JD into {len(split_docs)} chunks.")
-    embed_and_save_chunks(split_docs, config)
-    print("Embedded and saved JD chunks to ChromaDB.")
 
-    # 3. Extract structured info
-    structured_info = extract_structured_info(jd_text, config)
-    print("Extracted structured job info:")
-    print(json.dumps(structured_info, indent=2))
-    with open(os.path.join(config['OUTPUT_DIR'], 'extracted_job_info.json'), 'w') as f:
-        json.dump(structured_info, f, indent=2)
+def write_metrics(output_dir: str) -> None:
+    """
+    Saves the run's timings, retries, cache hits and LLM usage as JSON and Prometheus text.
+    """
+    with open(os.path.join(output_dir, "metrics.json"), "w") as f:
+        f.write(METRICS.to_json())
+    with open(os.path.join(output_dir, "metrics.prom"), "w") as f:
+        f.write(METRICS.to_prometheus())
+    snap = METRICS.snapshot()
+    for name, entry in snap["stages"].items():
+        print(f"  {name}: {entry['calls']} calls, {entry['wall_seconds']}s")
+    print(f"Estimated LLM cost: ${snap['llm_cost_usd']:.4f}")
 
-    # 4. Generate alternate job titles
+
+def run_streaming(config: dict, limit: int = 0, top_n: Optional[int] = None,
+                  min_fit_score: Optional[float] = None) -> None:
+    """
+    Streams search, enrichment and scoring for config['JD_PATH'] and appends each scored candidate,
+    and its outreach message if it clears MESSAGE_MIN_FIT_SCORE, to JSON Lines files as it arrives.
+    Messages are drafted on MESSAGE_MAX_WORKERS threads while scoring continues; at most twice that
+    many drafts are pending, so nothing is held in memory beyond the pipeline's bounded queues.
+    """
+    jd_text = load_jd(config['JD_PATH'])
+    structured_info = extract_structured_info(jd_text, config)
     titles = generate_alternate_titles(structured_info, config)
-    print("Generated alternate job titles:")
-    print(titles)
-    with open(os.path.join(config['OUTPUT_DIR'], 'combined_titles.json'), 'w') as f:
-        json.dump(titles, f, indent=2)
-
-    # 5. Search LinkedIn profiles with Tavily
-    linkedin_urls = search_linkedin_profiles(titles, config)
-    print(f"Found {len(linkedin_urls)} unique LinkedIn profiles.")
-    with open(os.path.join(config['OUTPUT_DIR'], 'final_linkedin_profiles.json'), 'w') as f:
-        json.dump(linkedin_urls, f, indent=2)
-
-    # 6. Enrich profiles with RapidAPI
-    enriched_profiles = enrich_profiles_with_rapidapi(linkedin_urls, config, limit=10)
-    print(f"Enriched {len(enriched_profiles)} profiles with RapidAPI.")
-    with open(os.path.join(config['OUTPUT_DIR'], 'enriched_profiles_rapidapi.json'), 'w') as f:
-        json.dump(enriched_profiles, f, indent=2)
-
-    # 7. Load scoring rubric
     with open(config['SCORE_RUBRIC_PATH'], 'r') as f:
         rubric = f.read()
+    pipeline = StreamingPipeline(structured_info, titles, rubric, config, limit=limit,
+                                 top_n=top_n, min_fit_score=min_fit_score)
+    os.makedirs(config['OUTPUT_DIR'], exist_ok=True)
+    with open(os.path.join(config['OUTPUT_DIR'], 'scored_candidates.jsonl'), 'w') as scored_file, \
+            open(os.path.join(config['OUTPUT_DIR'], 'linkedin_outreach_messages.jsonl'), 'w') as messages_file:
+        message_workers = max(1, int(config.get('MESSAGE_MAX_WORKERS', 4)))
+        pending = threading.BoundedSemaphore(message_workers * 2)
+        write_lock = threading.Lock()
+
+        def draft(candidate):
+            try:
+                messages = craft_linkedin_messages([candidate.score], config, structured_info=structured_info,
+                                                   profiles=[candidate])
+                with write_lock:
+                    for message in messages:
+                        messages_file.write(json.dumps(message) + "\n")
+                    messages_file.flush()
+            finally:
+                pending.release()
 
-    # 8. Score candidates
-    scored_candidates = score_candidates(enriched_profiles, rubric, config)
-    print(f"Scored {len(scored_candidates)} candidates.")
-    with open(os.path.join(config['OUTPUT_DIR'], 'scored_candidates.json'), 'w') as f:
-        json.dump(scored_candidates, f, indent=2)
+        # Drafting runs beside the pipeline so the generator keeps submitting scoring batches
+        with ThreadPoolExecutor(max_workers=message_workers) as message_pool:
+            for candidate in pipeline.run():
+                scored_file.write(json.dumps(candidate.score) + "\n")
+                scored_file.flush()
+                print(f"  {candidate.name}: {candidate.fit_score}")
+                pending.acquire()
+                message_pool.submit(draft, candidate)
+    counts = pipeline.counts
+    print(f"Streamed {counts['urls']} URLs, enriched {counts['enriched']}, scored {counts['scored']}; "
+          f"{counts['qualified']} at or above fit score {pipeline.min_fit_score}.")
 
-    # 9. Craft LinkedIn messages
-    messages = craft_linkedin_messages(scored_candidates, config)
-    print(f"Generated {len(messages)} LinkedIn outreach messages.")
-    with open(os.path.join(config['OUTPUT_DIR'], 'linkedin_outreach_messages.json'), 'w') as f:
-        json.dump(messages, f, indent=2)
 
-    print("Pipeline complete!")
+def main():
+    parser = argparse.ArgumentParser(description="Run the LinkedIn sourcing pipeline.")
+    parser.add_argument("--force", action="store_true", help="Re-run every stage, ignoring saved artifacts.")
+    parser.add_argument("--from-stage", help="Re-run this stage and everything after it.")
+    parser.add_argument("jd_paths", nargs="*",
+                        help="JD files or directories to source for in one batch (default: JD_PATH).")
+    parser.add_argument("--workers", type=int, help="Requisitions to run at once in batch mode.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only enrich, score and message candidates that are new or changed since the last run.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Overlap search, enrichment and scoring and write candidates as they are scored.")
+    parser.add_argument("--top-n", type=int,
+                        help="With --stream, stop once this many candidates reach --min-fit (default: STREAM_TOP_N).")
+    parser.add_argument("--min-fit", type=float, help="With --stream, the fit score that counts towards --top-n.")
+    parser.add_argument("--limit", type=int, default=0, help="With --stream, enrich at most this many profiles.")
+    args = parser.parse_args()
+
+    config = load_config()
+    print("Loaded config.")
+
+    if args.jd_paths:
+        report = run_batch(collect_jd_paths(args.jd_paths), config, max_workers=args.workers,
+                           force=args.force, rerun_from=args.from_stage, incremental=args.incremental)
+        print(format_summary(report))
+        write_metrics(config['OUTPUT_DIR'])
+        print(f"Batch complete! Reports written to {config['OUTPUT_DIR']}")
+        return
+
+    if args.stream:
+        run_streaming(config, limit=args.limit, top_n=args.top_n, min_fit_score=args.min_fit)
+        write_metrics(config['OUTPUT_DIR'])
+        print(f"Streaming run complete! Candidates written to {config['OUTPUT_DIR']}")
+        return
+
+    requisition = requisition_name(config['JD_PATH']) if args.incremental else None
+    runner = PipelineRunner(config['OUTPUT_DIR'], force=args.force,
+                            rerun_from=args.from_stage or (INCREMENTAL_RERUN_FROM if requisition else None))
+    results = runner.run(build_stages(config, requisition=requisition))
+
+    print("Extracted structured job info:")
+    print(json.dumps(results["structured_info"], indent=2))
+    print("Generated alternate job titles:")
+    print(results["titles"])
+    print(f"Found {len(results['linkedin_urls'])} unique LinkedIn profiles.")
+    print(f"Enriched {len(results['enriched_profiles'])} profiles with RapidAPI.")
+    print(f"Pre-filter kept {len(results['shortlisted_profiles'])} profiles for LLM scoring.")
+    print(f"Scored {len(results['scored_candidates'])} candidates.")
+    write_scores_csv(results['scored_candidates'], os.path.join(config['OUTPUT_DIR'], 'scored_candidates.csv'))
+    print(f"Generated {len(results['messages'])} LinkedIn outreach messages.")
+    write_metrics(config['OUTPUT_DIR'])
+    print(f"Pipeline complete! Artifacts written to {config['OUTPUT_DIR']}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
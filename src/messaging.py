@@ -1,32 +1,59 @@
-from typing import List, Dict
-import os
-from openai import OpenAI
+from typing import List, Dict, Optional
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.candidate import profile_url, unwrap_profile
+from src.compaction import compact_profile
+from src.linkedin_url import normalize_linkedin_url
+from src.llm import chat_completion
+from src.metrics import instrument
+from src.prefilter import get_job_info
+from src.rate_limit import backoff_delay
 
-def craft_linkedin_messages(candidates: List[Dict], config: dict) -> List[Dict]:
+# What a recruiter would mention in a first message; education and tenure details are left out
+MESSAGE_DIMENSIONS = ["trajectory", "company", "skills"]
+
+
+def _candidate_summary(profile: Optional[Dict], candidate: Dict, max_tokens: int) -> str:
     """
-    Generates personalized LinkedIn outreach messages for each candidate using OpenAI LLM.
-    Returns a list of dicts with name, linkedin_url, and message.
+    Builds a compact, prompt-ready summary of the candidate from their profile and score breakdown.
     """
-    os.environ['OPENAI_API_KEY'] = config['OPENAI_API_KEY']
-    client = OpenAI()
-    messages = []
-    for candidate in candidates:
-        name = candidate.get("name", "Candidate")
-        url = candidate.get("linkedin_url", "")
-        prompt = f"""
+    summary = {}
+    if profile:
+        summary, _ = compact_profile(unwrap_profile(profile), dimensions=MESSAGE_DIMENSIONS, max_tokens=max_tokens)
+        summary.pop("name", None)
+    breakdown = candidate.get("score_breakdown") or {}
+    ranked = sorted(breakdown.items(), key=lambda kv: -(kv[1] or 0))
+    strengths = [dim for dim, score in ranked if (score or 0) >= 7][:3]
+    if strengths:
+        summary["strongest_fit"] = strengths
+    return json.dumps(summary) if summary else "No profile details available."
+
+
+def _generate_message(candidate: Dict, profile: Optional[Dict], role: str, location: str,
+                      config: dict, max_retries: int, max_tokens: int) -> Dict:
+    name = candidate.get("name", "Candidate")
+    url = candidate.get("linkedin_url", "")
+    role_text = f"a {role} role" if role else "an open role"
+    if location:
+        role_text += f" in {location}"
+    prompt = f"""
 You are an AI sourcing assistant.
 
-Craft a short and friendly LinkedIn message to reach out to this candidate for an ML Research Engineer role in Mountain View, CA.
+Craft a short and friendly LinkedIn message to reach out to this candidate for {role_text}.
 
-Use the candidate's name. Avoid sounding too formal or robotic. Make the message feel personal and warm.
+Use the candidate's name and mention one or two specific things from their background. Avoid sounding too formal or robotic. Make the message feel personal and warm.
 
 Candidate name: {name}
 LinkedIn: {url}
+Candidate summary: {_candidate_summary(profile, candidate, max_tokens)}
 
 Format your reply with ONLY the message text.
 """
+    for attempt in range(max_retries + 1):
         try:
-            response = client.chat.completions.create(
+            content = chat_completion(
+                config,
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You're a recruiter writing LinkedIn connection messages."},
@@ -34,21 +61,46 @@ Format your reply with ONLY the message text.
                 ],
                 temperature=0.7
             )
-            content = response.choices[0].message.content
-            if not content:
-                message = ""
-            else:
-                message = content.strip()
-            messages.append({
-                "name": name,
-                "linkedin_url": url,
-                "message": message
-            })
+            if content and content.strip():
+                return {"name": name, "linkedin_url": url, "message": content.strip()}
+            error = "empty response"
         except Exception as e:
-            print(f"Error generating message for {name}: {e}")
-            messages.append({
-                "name": name,
-                "linkedin_url": url,
-                "message": ""
-            })
-    return messages 
\ No newline at end of file
+            error = e
+        if attempt < max_retries:
+            time.sleep(backoff_delay(attempt))
+    print(f"Error generating message for {name}: {error}")
+    return {"name": name, "linkedin_url": url, "message": ""}
+
+
+@instrument()
+def craft_linkedin_messages(candidates: List[Dict], config: dict, structured_info: Optional[Dict] = None,
+                            profiles: Optional[List[Dict]] = None) -> List[Dict]:
+    """
+    Generates personalized LinkedIn outreach messages for each candidate using OpenAI LLM.
+    Returns a list of dicts with name, linkedin_url, and message, in candidate order.
+    The role and location come from the KOR `structured_info`, and each prompt includes a compact
+    summary of the candidate's enriched profile (matched from `profiles` by URL). Candidates whose
+    fit_score is below MESSAGE_MIN_FIT_SCORE, or who could not be scored, are skipped. Messages are drafted concurrently.
+    """
+    min_fit = float(config.get('MESSAGE_MIN_FIT_SCORE', 5.0))
+    max_workers = max(1, int(config.get('MESSAGE_MAX_WORKERS', 4)))
+    max_retries = int(config.get('MESSAGE_MAX_RETRIES', 2))
+    max_tokens = int(config.get('MESSAGE_PROFILE_MAX_TOKENS', 200))
+    job = get_job_info(structured_info or {})
+    role, location = job.get("title", ""), job.get("location", "")
+    profiles_by_url = {normalize_linkedin_url(profile_url(p)): p for p in profiles or [] if profile_url(p)}
+
+    # Failed scores (fit_score None, with an 'error') are never messaged
+    selected = [c for c in candidates if not c.get("error") and float(c.get("fit_score") or 0) >= min_fit]
+    if len(selected) < len(candidates):
+        print(f"Skipping messages for {len(candidates) - len(selected)} candidates below fit score {min_fit}.")
+    if not selected:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(selected))) as executor:
+        return list(executor.map(
+            lambda c: _generate_message(
+                c, profiles_by_url.get(normalize_linkedin_url(c.get("linkedin_url") or "")),
+                role, location, config, max_retries, max_tokens
+            ),
+            selected
+        ))
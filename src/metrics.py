@@ -0,0 +1,160 @@
+from typing import Any, Callable, Dict, Optional
+from collections import defaultdict
+from contextlib import contextmanager
+import functools
+import json
+import threading
+import time
+
+# Estimated USD per 1M tokens (prompt, completion); unknown models are costed as gpt-4o
+MODEL_PRICES = {
+    "gpt-4": (30.0, 60.0),
+    "gpt-4-turbo": (10.0, 30.0),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-3.5-turbo": (0.5, 1.5),
+    "text-embedding-3-small": (0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.0),
+}
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    prompt_price, completion_price = MODEL_PRICES.get(model, MODEL_PRICES["gpt-4o"])
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+class Metrics:
+    """
+    Process-wide, thread-safe counters for the sourcing pipeline: per-stage wall time and call
+    counts, HTTP requests and retries per provider, cache hits and misses, and LLM token usage
+    with an estimated cost. Export with `snapshot()`, `to_json()` or `to_prometheus()`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages: Dict[str, Dict[str, float]] = defaultdict(
+                lambda: {"calls": 0, "errors": 0, "wall_seconds": 0.0, "max_seconds": 0.0})
+            self._http: Dict[str, Dict[str, int]] = defaultdict(lambda: {"requests": 0, "retries": 0, "errors": 0})
+            self._caches: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+            self._llm: Dict[str, Dict[str, float]] = defaultdict(
+                lambda: {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0})
+            self.started_at = time.time()
+
+    def record_stage(self, stage: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            entry = self._stages[stage]
+            entry["calls"] += 1
+            entry["errors"] += int(error)
+            entry["wall_seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+    def record_http(self, provider: str, retry: bool = False, error: bool = False) -> None:
+        with self._lock:
+            entry = self._http[provider]
+            entry["requests"] += 1
+            entry["retries"] += int(retry)
+            entry["errors"] += int(error)
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        with self._lock:
+            self._caches[cache]["hits" if hit else "misses"] += 1
+
+    def record_llm(self, model: str, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+        with self._lock:
+            entry = self._llm[model]
+            entry["calls"] += 1
+            entry["prompt_tokens"] += prompt_tokens
+            entry["completion_tokens"] += completion_tokens
+            entry["cost_usd"] += estimate_cost(model, prompt_tokens, completion_tokens)
+
+    def record_llm_response(self, model: str, response: Any) -> None:
+        """
+        Records the token usage reported on an OpenAI chat completion response, if any.
+        """
+        usage = getattr(response, "usage", None)
+        self.record_llm(model, int(getattr(usage, "prompt_tokens", 0) or 0),
+                        int(getattr(usage, "completion_tokens", 0) or 0))
+
+    @contextmanager
+    def timed(self, stage: str):
+        """
+        Times the enclosed block as one call of `stage`; exceptions are counted and re-raised.
+        """
+        started = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record_stage(stage, time.perf_counter() - started, error)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            llm = {model: dict(entry, cost_usd=round(entry["cost_usd"], 6)) for model, entry in self._llm.items()}
+            return {
+                "uptime_seconds": round(time.time() - self.started_at, 3),
+                "stages": {name: dict(entry, wall_seconds=round(entry["wall_seconds"], 3),
+                                      max_seconds=round(entry["max_seconds"], 3))
+                           for name, entry in self._stages.items()},
+                "http": {provider: dict(entry) for provider, entry in self._http.items()},
+                "caches": {
+                    name: dict(entry, hit_rate=round(entry["hits"] / max(1, entry["hits"] + entry["misses"]), 3))
+                    for name, entry in self._caches.items()
+                },
+                "llm": llm,
+                "llm_cost_usd": round(sum(entry["cost_usd"] for entry in llm.values()), 6),
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Renders the counters in the Prometheus text exposition format.
+        """
+        snap = self.snapshot()
+        families = [
+            ("sourcing_stage_calls_total", "counter", "Stage invocations.", "stage", snap["stages"], "calls"),
+            ("sourcing_stage_errors_total", "counter", "Stage invocations that raised.", "stage", snap["stages"], "errors"),
+            ("sourcing_stage_seconds_total", "counter", "Wall time spent in each stage.", "stage", snap["stages"], "wall_seconds"),
+            ("sourcing_http_requests_total", "counter", "HTTP attempts per provider.", "provider", snap["http"], "requests"),
+            ("sourcing_http_retries_total", "counter", "HTTP retries per provider.", "provider", snap["http"], "retries"),
+            ("sourcing_cache_hits_total", "counter", "Cache hits.", "cache", snap["caches"], "hits"),
+            ("sourcing_cache_misses_total", "counter", "Cache misses.", "cache", snap["caches"], "misses"),
+            ("sourcing_llm_calls_total", "counter", "LLM API calls.", "model", snap["llm"], "calls"),
+            ("sourcing_llm_prompt_tokens_total", "counter", "LLM prompt tokens.", "model", snap["llm"], "prompt_tokens"),
+            ("sourcing_llm_completion_tokens_total", "counter", "LLM completion tokens.", "model", snap["llm"], "completion_tokens"),
+            ("sourcing_llm_cost_usd_total", "counter", "Estimated LLM cost in USD.", "model", snap["llm"], "cost_usd"),
+        ]
+        lines = []
+        for name, kind, help_text, label, entries, field in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, entry in sorted(entries.items()):
+                escaped = str(key).replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{name}{{{label}="{escaped}"}} {entry[field]}')
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+def instrument(stage: Optional[str] = None) -> Callable:
+    """
+    Decorator that records wall time, calls and errors of a stage function in METRICS.
+    """
+    def decorator(func: Callable) -> Callable:
+        name = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with METRICS.timed(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
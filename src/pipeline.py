@@ -0,0 +1,103 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from dataclasses import dataclass, field
+import hashlib
+import json
+import os
+import time
+
+MANIFEST_NAME = "pipeline_manifest.json"
+
+
+@dataclass
+class Stage:
+    """
+    One step of the pipeline. `func` receives the outputs of `deps` as keyword arguments.
+    `params` are extra inputs (model names, limits, rubric text...) that should invalidate the
+    stage when they change. Stages with an `artifact` file name are persisted and can be skipped.
+    """
+    name: str
+    func: Callable[..., Any]
+    deps: Sequence[str] = ()
+    params: Dict[str, Any] = field(default_factory=dict)
+    artifact: Optional[str] = None
+
+
+def digest(value: Any) -> str:
+    """
+    Stable content hash of a JSON-serializable value.
+    """
+    payload = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _write_json(path: str, value: Any) -> None:
+    # Write to a temp file first so an interrupted run never leaves a half-written artifact
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(value, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class PipelineRunner:
+    """
+    Runs stages in order, fingerprinting each stage's inputs and persisting its output.
+    On later runs a stage whose fingerprint matches the manifest is loaded from disk instead of
+    re-executed, so a failed run resumes from the last completed stage.
+    """
+
+    def __init__(self, output_dir: str, force: bool = False, rerun_from: Optional[str] = None):
+        self.output_dir = output_dir
+        self.force = force
+        self.rerun_from = rerun_from
+        os.makedirs(output_dir, exist_ok=True)
+        self.manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            print("Pipeline manifest unreadable; running all stages.")
+            return {}
+
+    def fingerprint(self, stage: Stage, dep_digests: List[str]) -> str:
+        return digest({"stage": stage.name, "deps": dep_digests, "params": stage.params})
+
+    def run(self, stages: List[Stage]) -> Dict[str, Any]:
+        """
+        Executes (or restores) every stage and returns a dict of stage name -> output.
+        """
+        names = [stage.name for stage in stages]
+        if self.rerun_from and self.rerun_from not in names:
+            raise ValueError(f"Unknown stage '{self.rerun_from}'. Expected one of: {', '.join(names)}")
+        results: Dict[str, Any] = {}
+        digests: Dict[str, str] = {}
+        rerun = self.force
+        for stage in stages:
+            rerun = rerun or stage.name == self.rerun_from
+            fingerprint = self.fingerprint(stage, [digests[dep] for dep in stage.deps])
+            entry = self.manifest.get(stage.name, {})
+            artifact_path = os.path.join(self.output_dir, stage.artifact) if stage.artifact else None
+            if (not rerun and artifact_path and entry.get("fingerprint") == fingerprint
+                    and os.path.exists(artifact_path)):
+                with open(artifact_path, "r") as f:
+                    value = json.load(f)
+                print(f"[{stage.name}] inputs unchanged, loaded {stage.artifact}.")
+            else:
+                started = time.time()
+                value = stage.func(**{dep: results[dep] for dep in stage.deps})
+                if artifact_path:
+                    _write_json(artifact_path, value)
+                    self.manifest[stage.name] = {
+                        "fingerprint": fingerprint,
+                        "artifact": stage.artifact,
+                        "completed_at": time.time(),
+                        "duration_seconds": round(time.time() - started, 3),
+                    }
+                    _write_json(self.manifest_path, self.manifest)
+            results[stage.name] = value
+            digests[stage.name] = digest(value)
+        return results
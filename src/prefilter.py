@@ -0,0 +1,170 @@
+from typing import TYPE_CHECKING, List, Dict, Optional
+import datetime
+import re
+from src.candidate import unwrap_profile
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Rubric weights (percent) of the dimensions that can be computed without an LLM
+PRESCORE_WEIGHTS = {"location": 10, "tenure": 10, "skills": 25}
+
+_US_STATES = {
+    "alabama": "al", "alaska": "ak", "arizona": "az", "arkansas": "ar", "california": "ca", "colorado": "co",
+    "connecticut": "ct", "delaware": "de", "florida": "fl", "georgia": "ga", "hawaii": "hi", "idaho": "id",
+    "illinois": "il", "indiana": "in", "iowa": "ia", "kansas": "ks", "kentucky": "ky", "louisiana": "la",
+    "maine": "me", "maryland": "md", "massachusetts": "ma", "michigan": "mi", "minnesota": "mn",
+    "mississippi": "ms", "missouri": "mo", "montana": "mt", "nebraska": "ne", "nevada": "nv",
+    "new hampshire": "nh", "new jersey": "nj", "new mexico": "nm", "new york": "ny", "north carolina": "nc",
+    "north dakota": "nd", "ohio": "oh", "oklahoma": "ok", "oregon": "or", "pennsylvania": "pa",
+    "rhode island": "ri", "south carolina": "sc", "south dakota": "sd", "tennessee": "tn", "texas": "tx",
+    "utah": "ut", "vermont": "vt", "virginia": "va", "washington": "wa", "west virginia": "wv",
+    "wisconsin": "wi", "wyoming": "wy",
+}
+
+
+def get_job_info(structured_info: Dict) -> Dict:
+    """
+    Returns the first job_info entry from the KOR extraction output.
+    """
+    job_info = structured_info.get("job_info", {}) if structured_info else {}
+    if isinstance(job_info, list):
+        job_info = job_info[0] if job_info else {}
+    return job_info or {}
+
+
+def _split_location(location: str) -> Dict:
+    """
+    Splits 'City, ST' / 'City, State, Country' into lowercased city and state code.
+    """
+    parts = [p.strip().lower() for p in (location or "").split(",") if p.strip()]
+    city = parts[0] if parts else ""
+    state = ""
+    for part in parts[1:]:
+        if part in _US_STATES.values():
+            state = part
+            break
+        if part in _US_STATES:
+            state = _US_STATES[part]
+            break
+    return {"city": city, "state": state, "remote": "remote" in (location or "").lower()}
+
+
+def _profile_location(profile: Dict) -> str:
+    if profile.get("location"):
+        return profile["location"]
+    return ", ".join(p for p in (profile.get("city"), profile.get("state"), profile.get("country")) if p)
+
+
+def _location_score(job_loc: Dict, profile: Dict) -> float:
+    """
+    Mirrors the rubric: exact city 10, same metro (approximated by state) 8, remote-friendly 6.
+    """
+    cand = _split_location(_profile_location(profile))
+    if job_loc["city"] and cand["city"] and (job_loc["city"] in cand["city"] or cand["city"] in job_loc["city"]):
+        return 10.0
+    if job_loc["state"] and job_loc["state"] == cand["state"]:
+        return 8.0
+    if job_loc["remote"]:
+        return 6.0
+    return 0.0
+
+
+def _average_tenure_years(profile: Dict) -> Optional[float]:
+    today = datetime.date.today()
+    durations = []
+    for exp in profile.get("experiences") or []:
+        if not isinstance(exp, dict) or not exp.get("start_year"):
+            continue
+        try:
+            start = int(exp["start_year"]) + (int(exp.get("start_month") or 1) - 1) / 12
+            if exp.get("end_year"):
+                end = int(exp["end_year"]) + (int(exp.get("end_month") or 12) - 1) / 12
+            else:
+                end = today.year + (today.month - 1) / 12
+        except (TypeError, ValueError):
+            continue
+        durations.append(max(end - start, 0.0))
+    return sum(durations) / len(durations) if durations else None
+
+
+def _tenure_score(years: Optional[float]) -> float:
+    """
+    Mirrors the rubric: 2-3 years average 9-10, 1-2 years 6-8, job hopping 3-5.
+    Profiles without dated experience get a neutral 5.
+    """
+    if years is None:
+        return 5.0
+    if years >= 2:
+        return 9.5 if years <= 3 else 8.0
+    if years >= 1:
+        return 6.0 + 2.0 * (years - 1)
+    return 3.0 + 2.0 * years
+
+
+def _profile_text(profile: Dict) -> str:
+    parts = [profile.get("headline") or "", profile.get("about") or "", profile.get("job_title") or ""]
+    skills = profile.get("skills")
+    if isinstance(skills, list):
+        skills = " ".join(s.get("name", "") if isinstance(s, dict) else str(s) for s in skills)
+    parts.append(skills or "")
+    for exp in profile.get("experiences") or []:
+        if isinstance(exp, dict):
+            parts.extend(str(exp.get(k) or "") for k in ("title", "company", "description"))
+    return " ".join(parts).lower()
+
+
+def _keyword_patterns(keywords) -> List[re.Pattern]:
+    if isinstance(keywords, str):
+        keywords = keywords.split(",")
+    terms = dict.fromkeys(k.strip().lower() for k in keywords or [] if k and k.strip())
+    return [re.compile(r"(?<![\w+#])" + re.escape(term) + r"(?![\w+#])") for term in terms]
+
+
+def prescore_candidates(profiles: List[Dict], job_info: Dict) -> "np.ndarray":
+    """
+    Computes the rubric's location, tenure and skills dimensions for every profile.
+    Returns an (n, 4) array: location, tenure, skills and the weighted pre-score, all on a 0-10 scale.
+    """
+    import numpy as np
+    flat = [unwrap_profile(p) for p in profiles]
+    job_loc = _split_location(job_info.get("location", ""))
+    patterns = _keyword_patterns(job_info.get("keywords", ""))
+
+    location = np.array([_location_score(job_loc, p) for p in flat], dtype=float)
+    tenure = np.array([_tenure_score(_average_tenure_years(p)) for p in flat], dtype=float)
+    if patterns:
+        texts = [_profile_text(p) for p in flat]
+        hits = np.array([[bool(pat.search(text)) for pat in patterns] for text in texts], dtype=float)
+        skills = 10.0 * hits.reshape(len(flat), len(patterns)).mean(axis=1)
+    else:
+        skills = np.full(len(flat), 5.0)
+
+    features = np.column_stack([location, tenure, skills]) if flat else np.zeros((0, 3))
+    weights = np.array([PRESCORE_WEIGHTS["location"], PRESCORE_WEIGHTS["tenure"], PRESCORE_WEIGHTS["skills"]], dtype=float)
+    total = features @ weights / weights.sum()
+    return np.column_stack([features, total]) if flat else np.zeros((0, 4))
+
+
+def prefilter_candidates(profiles: List[Dict], structured_info: Dict, config: dict,
+                         top_k: Optional[int] = None, min_score: Optional[float] = None) -> List[Dict]:
+    """
+    Ranks profiles by their local pre-score and keeps only the ones worth sending to the LLM.
+    Drops profiles below `min_score` (config['PREFILTER_MIN_SCORE']) and keeps at most `top_k`
+    (config['PREFILTER_TOP_K'], 0 means no cap). Profiles (dicts or Candidates) are returned
+    unchanged, best first.
+    """
+    if top_k is None:
+        top_k = int(config.get("PREFILTER_TOP_K", 20))
+    if min_score is None:
+        min_score = float(config.get("PREFILTER_MIN_SCORE", 2.0))
+    if not profiles:
+        return []
+    import numpy as np
+    scores = prescore_candidates(profiles, get_job_info(structured_info))[:, 3]
+    # Stable sort so ties keep search order
+    order = np.argsort(-scores, kind="stable")
+    order = order[scores[order] >= min_score]
+    if top_k:
+        order = order[:top_k]
+    return [profiles[i] for i in order]
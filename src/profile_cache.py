@@ -0,0 +1,53 @@
+from typing import Dict, Optional
+import hashlib
+import threading
+from src.disk_cache import DiskCache
+from src.linkedin_url import normalize_linkedin_url
+
+
+class ProfileCache(DiskCache):
+    """
+    Disk-backed cache of enriched LinkedIn profiles stored in SQLite.
+    Entries are keyed by a hash of the normalized profile URL, expire after `ttl_seconds`
+    and are evicted least-recently-used first once `max_entries` is exceeded.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 10000):
+        super().__init__(path, table="enriched_profiles", ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+    @staticmethod
+    def make_key(url: str) -> str:
+        return hashlib.sha256(normalize_linkedin_url(url).encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Returns the cached profile for `url`, or None on a miss or expired entry.
+        """
+        return super().get(self.make_key(url))
+
+    def set(self, url: str, profile: Dict) -> None:
+        """
+        Stores `profile` for `url` and evicts the least recently used entries over the size cap.
+        """
+        super().set(self.make_key(url), profile)
+
+
+_CACHES: Dict[str, ProfileCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_profile_cache(config: dict) -> Optional[ProfileCache]:
+    """
+    Returns the shared ProfileCache for the configured path, or None if caching is disabled.
+    """
+    path = config.get("PROFILE_CACHE_PATH")
+    if not path:
+        return None
+    with _CACHES_LOCK:
+        if path not in _CACHES:
+            _CACHES[path] = ProfileCache(
+                path,
+                ttl_seconds=float(config.get("PROFILE_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+                max_entries=int(config.get("PROFILE_CACHE_MAX_ENTRIES", 10000)),
+            )
+        return _CACHES[path]
@@ -0,0 +1,235 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from dataclasses import dataclass
+import heapq
+import itertools
+import math
+from src.clients import get_clients
+from src.identity_index import IdentityIndex, get_identity_store
+from src.linkedin_url import normalize_linkedin_url, profile_slug
+from src.metrics import instrument
+from src.prefilter import get_job_info
+from src.shared_results import SharedResults
+from src.tavily_search import format_search_query, iter_queries, search_linkedin_profiles
+
+# Expansions of a query start just below its own yield, so proven parents beat unproven children
+EXPANSION_DECAY = 0.8
+
+
+@dataclass(frozen=True)
+class PlannedQuery:
+    """
+    One title x location x keyword combination and the query text sent to Tavily.
+    """
+    title: str
+    location: str = ""
+    keyword: str = ""
+
+    @property
+    def text(self) -> str:
+        return format_search_query(self.title, self.location, self.keyword)
+
+
+class QueryPlanner:
+    """
+    Decides which search queries to run, in rounds, based on how many new unique profiles each
+    query contributed (its yield: new profiles per requested result).
+    Every title is tried first with the job location. Queries whose yield reaches `min_yield` are
+    expanded with the job's top keywords and a broader location, prioritized by that yield.
+    Planning stops once `target` unique profiles are found, `max_queries` have been issued, the
+    last round's yield fell below `min_yield` or nothing is left to try.
+    `known` slugs (profiles an incremental requisition has already seen) are still returned when
+    found, but count neither toward the target nor toward a query's yield.
+    """
+
+    def __init__(self, titles: List[str], location: str = "", keywords: Optional[List[str]] = None,
+                 target: Optional[int] = None, max_queries: int = 12, min_yield: float = 0.25,
+                 results_per_query: int = 5, known: Optional[Iterable[str]] = None):
+        self.location = location.strip()
+        self.keywords = [k for k in (keywords or []) if k]
+        self.target = target or math.inf
+        self.max_queries = max_queries
+        self.min_yield = min_yield
+        self.results_per_query = results_per_query
+        self.seen: Set[str] = set()
+        self.known: Set[str] = set(known or ())
+        self.found = 0
+        self.history: List[Dict] = []
+        self._queued: Set[str] = set()
+        self._pending: List = []
+        self._counter = itertools.count()
+        self._last_round_yield: Optional[float] = None
+        self._round_new = 0
+        self._round_queries = 0
+        for title in titles:
+            self._push(PlannedQuery(title, self.location), 1.0)
+
+    @classmethod
+    def for_job(cls, structured_info: Dict, titles: List[str], max_keywords: int = 3, **kwargs) -> "QueryPlanner":
+        """
+        Seeds the planner with the extracted title and the alternate 'Title, Location' strings
+        from generate_alternate_titles, stripped of their location suffix.
+        """
+        job = get_job_info(structured_info)
+        location = (job.get("location") or "").strip()
+        keywords = [k.strip() for k in str(job.get("keywords") or "").split(",") if k.strip()][:max_keywords]
+        seeds = [job.get("title") or ""]
+        for title in titles:
+            if location and title.endswith(f", {location}"):
+                title = title[:-len(location) - 2]
+            seeds.append(title)
+        unique = list(dict.fromkeys(t.strip() for t in seeds if t and t.strip()))
+        return cls(unique, location, keywords, **kwargs)
+
+    def _push(self, query: PlannedQuery, priority: float) -> None:
+        key = query.text.lower()
+        if key in self._queued:
+            return
+        self._queued.add(key)
+        # heapq pops the smallest; the counter keeps insertion order among equal priorities
+        heapq.heappush(self._pending, (-priority, next(self._counter), query))
+
+    @property
+    def done(self) -> bool:
+        return (self.found >= self.target or len(self.history) >= self.max_queries or not self._pending
+                or (self._last_round_yield is not None and self._last_round_yield < self.min_yield))
+
+    def next_round(self, width: int) -> List[PlannedQuery]:
+        """
+        Pops the most promising queries for the next round: at most `width`, and no more than the
+        observed yield suggests are needed to reach the target.
+        """
+        if self.done:
+            return []
+        size = min(width, self.max_queries - len(self.history), len(self._pending))
+        if self.target != math.inf:
+            expected = self.results_per_query * max(self._last_round_yield or 1.0, self.min_yield)
+            size = min(size, math.ceil((self.target - self.found) / expected))
+        return [heapq.heappop(self._pending)[2] for _ in range(max(1, size))]
+
+    def record(self, query: PlannedQuery, slugs: List[str]) -> List[str]:
+        """
+        Records one query's identity slugs (in rank order), queues expansions if it was
+        productive and returns the slugs it was first to find (known ones included).
+        """
+        first = [slug for slug in dict.fromkeys(slugs) if slug not in self.seen]
+        self.seen.update(first)
+        new = [slug for slug in first if slug not in self.known]
+        self.found += len(new)
+        self._round_new += len(new)
+        self._round_queries += 1
+        query_yield = len(new) / self.results_per_query
+        self.history.append({"query": query.text, "results": len(slugs), "new": len(new),
+                             "yield": round(query_yield, 3)})
+        if query_yield >= self.min_yield:
+            self._expand(query, query_yield * EXPANSION_DECAY)
+        return first
+
+    def end_round(self) -> None:
+        queries, self._round_queries = self._round_queries, 0
+        new, self._round_new = self._round_new, 0
+        self._last_round_yield = new / (self.results_per_query * queries) if queries else 0.0
+
+    def record_round(self, results: List[tuple]) -> None:
+        """
+        Records a round of (PlannedQuery, identity slugs in rank order).
+        """
+        for query, slugs in results:
+            self.record(query, slugs)
+        self.end_round()
+
+    def _expand(self, query: PlannedQuery, priority: float) -> None:
+        if not query.keyword:
+            for i, keyword in enumerate(self.keywords):
+                self._push(PlannedQuery(query.title, query.location, keyword), priority - i * 0.01)
+        # 'Mountain View, CA' widens to 'CA'
+        if query.location and "," in query.location:
+            region = query.location.rsplit(",", 1)[1].strip()
+            self._push(PlannedQuery(query.title, region, query.keyword), priority - 0.05)
+
+
+def _planner_for(structured_info: Dict, titles: List[str], config: dict, target: Optional[int],
+                 known: Optional[Set[str]] = None) -> QueryPlanner:
+    return QueryPlanner.for_job(
+        structured_info, titles,
+        max_keywords=config.get('QUERY_PLANNER_MAX_KEYWORDS', 3),
+        target=target,
+        max_queries=config.get('QUERY_PLANNER_MAX_QUERIES', 12),
+        min_yield=config.get('QUERY_PLANNER_MIN_YIELD', 0.25),
+        results_per_query=config.get('QUERY_PLANNER_RESULTS_PER_QUERY', 5),
+        known=known,
+    )
+
+
+def iter_linkedin_search(structured_info: Dict, titles: List[str], config: dict, target: Optional[int] = None,
+                         shared: Optional[SharedResults] = None,
+                         index: Optional[IdentityIndex] = None,
+                         known: Optional[Set[str]] = None) -> Iterator[str]:
+    """
+    Runs the adaptive QueryPlanner and yields each newly found profile's canonical URL as soon
+    as the query that found it returns, while the rest of the round is still in flight.
+    `target` defaults like plan_linkedin_search and counts profiles outside the `known` slugs.
+    Hits are saved to the identity index when the search finishes or the caller stops iterating.
+    """
+    if target is None:
+        target = config.get('QUERY_PLANNER_TARGET') or config.get('TAVILY_MAX_TOTAL_RESULTS', 7)
+    planner = _planner_for(structured_info, titles, config, target, known)
+    if index is None:
+        index = IdentityIndex(get_identity_store(config))
+    width = get_clients(config).concurrency("tavily")
+    try:
+        while True:
+            queries = planner.next_round(width)
+            if not queries:
+                break
+            texts = [q.text for q in queries]
+            for i, urls in iter_queries(texts, config, planner.results_per_query, shared=shared):
+                first_url = {}
+                for rank, url in enumerate(urls):
+                    slug = index.add_hit(url, texts[i], rank)
+                    if slug:
+                        first_url.setdefault(slug, url)
+                for slug in planner.record(queries[i], list(first_url)):
+                    yield normalize_linkedin_url(first_url[slug])
+            planner.end_round()
+        print(f"Query planner ran {len(planner.history)} queries and found {len(planner.seen)} unique profiles,"
+              f" {planner.found} of them new (target {target or 'none'}).")
+    finally:
+        index.save()
+
+
+@instrument()
+def plan_linkedin_search(structured_info: Dict, titles: List[str], config: dict, target: Optional[int] = None,
+                         shared: Optional[SharedResults] = None,
+                         index: Optional[IdentityIndex] = None,
+                         known: Optional[Set[str]] = None) -> List[str]:
+    """
+    Searches LinkedIn profiles with an adaptive QueryPlanner instead of one fixed query per title.
+    Rounds of queries run concurrently until the target number of unique profiles is reached
+    (`target`, defaulting to QUERY_PLANNER_TARGET, then TAVILY_MAX_TOTAL_RESULTS; 0 means no
+    target) or the yield of new profiles drops off. Returns at most `target` unique profile URLs,
+    ranked like search_linkedin_profiles. Profiles in `known` (slugs an incremental requisition
+    has already seen) don't count toward the target and are returned after it.
+    """
+    if target is None:
+        target = config.get('QUERY_PLANNER_TARGET') or config.get('TAVILY_MAX_TOTAL_RESULTS', 7)
+    if index is None:
+        index = IdentityIndex(get_identity_store(config))
+    known = known or set()
+    for _ in iter_linkedin_search(structured_info, titles, config, target=target, shared=shared, index=index,
+                                  known=known):
+        pass
+    unique_urls = index.ranked_urls()
+    new_urls = [url for url in unique_urls if profile_slug(url) not in known]
+    known_urls = [url for url in unique_urls if profile_slug(url) in known]
+    return (new_urls[:target] if target else new_urls) + known_urls
+
+
+def search_for_job(structured_info: Dict, titles: List[str], config: dict,
+                   shared: Optional[SharedResults] = None, known: Optional[Set[str]] = None) -> List[str]:
+    """
+    Runs the adaptive planner, or one fixed query per title if QUERY_PLANNER_ENABLED is off.
+    `known` slugs only steer the planner; fixed queries return what they find.
+    """
+    if config.get('QUERY_PLANNER_ENABLED', True):
+        return plan_linkedin_search(structured_info, titles, config, shared=shared, known=known)
+    return search_linkedin_profiles(titles, config, shared=shared)
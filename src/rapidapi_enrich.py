@@ -1,41 +1,109 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import requests
-import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 import os
 from dotenv import load_dotenv
+from src.clients import ClientRegistry, get_clients
+from src.identity_index import dedupe_urls
+from src.linkedin_url import normalize_linkedin_url
+from src.metrics import METRICS, instrument
+from src.profile_cache import get_profile_cache
+from src.shared_results import SharedResults
 load_dotenv()
 
 
+def _fetch_profile(clients: ClientRegistry, endpoint: str, headers: Dict, url: str) -> Optional[Dict]:
+    """
+    Fetches a single profile through the shared RapidAPI session, which handles rate limiting
+    and retries. Returns the parsed JSON, or None if the profile could not be fetched.
+    """
+    encoded_url = quote(url, safe='')
+    full_url = f"{endpoint}?linkedin_url={encoded_url}&include_skills=true"
+    try:
+        response = clients.request("rapidapi", "GET", full_url, headers=headers)
+    except requests.RequestException as e:
+        print(f"Error processing {url}: {e}")
+        return None
+    if response.status_code != 200:
+        print(f"RapidAPI failed for {url}: {response.status_code} - {response.text}")
+        return None
+    try:
+        return response.json()
+    except ValueError as e:
+        print(f"Error processing {url}: {e}")
+        return None
+
+
+def _endpoint_and_headers(config: dict) -> Tuple[str, Dict]:
+    rapidapi_key = config.get("RAPIDAPI_KEY") or os.getenv("RAPIDAPI_KEY")
+    rapidapi_host = config.get("RAPIDAPI_HOST") or os.getenv("RAPIDAPI_HOST")
+    base_url = config.get("RAPIDAPI_BASE_URL") or f"https://{rapidapi_host}"
+    endpoint = f"{base_url.rstrip('/')}/get-linkedin-profile"
+    headers = {
+        "X-RapidAPI-Key": rapidapi_key,
+        "X-RapidAPI-Host": rapidapi_host
+    }
+    return endpoint, headers
+
+
+def enrich_profile(linkedin_url: str, config: dict, shared: Optional[SharedResults] = None) -> Optional[Dict]:
+    """
+    Enriches a single profile like enrich_profiles_with_rapidapi, for callers that stream URLs.
+    Returns {'data': ...}, or None if the profile could not be fetched.
+    """
+    url = normalize_linkedin_url(linkedin_url)
+    cache = get_profile_cache(config)
+    profile_data = cache.get(url) if cache else None
+    if cache:
+        METRICS.record_cache("profiles", profile_data is not None)
+    if profile_data is None:
+        endpoint, headers = _endpoint_and_headers(config)
+        clients = get_clients(config)
+        if shared is None:
+            profile_data = _fetch_profile(clients, endpoint, headers, url)
+        else:
+            profile_data = shared.get_or_compute(f"rapidapi:{url}",
+                                                 lambda: _fetch_profile(clients, endpoint, headers, url))
+        if cache and profile_data is not None:
+            cache.set(url, profile_data)
+    return {"data": profile_data} if profile_data is not None else None
 
 
-def enrich_profiles_with_rapidapi(linkedin_urls: List[str], config: dict, limit: int = 10) -> List[Dict]:
+@instrument()
+def enrich_profiles_with_rapidapi(linkedin_urls: List[str], config: dict, limit: int = 10,
+                                  shared: Optional[SharedResults] = None) -> List[Dict]:
     """
     Enriches LinkedIn profiles using RapidAPI. Returns a list of profile data dicts.
     Only processes up to `limit` profiles (default 10 for testing).
     Always wraps the returned profile in a {'data': ...} dictionary for consistency.
+    Requests run concurrently, throttled by the shared RapidAPI token bucket.
+    Profiles found in the local profile cache are served from disk; only misses reach RapidAPI.
+    With `shared`, a profile requested by several runs in a batch is fetched once.
     """
-    rapidapi_key = os.getenv("RAPIDAPI_KEY")
-    rapidapi_host = os.getenv("RAPIDAPI_HOST")
-    endpoint = f"https://{rapidapi_host}/get-linkedin-profile"
-    results = []
-    for url in linkedin_urls[:limit]:
-        encoded_url = quote(url, safe='')
-        full_url = f"{endpoint}?linkedin_url={encoded_url}&include_skills=true"
-        try:
-            response = requests.get(
-                full_url,
-                headers={
-                    "X-RapidAPI-Key": rapidapi_key,
-                    "X-RapidAPI-Host": rapidapi_host
-                }
-            )
-            if response.status_code == 200:
-                profile_data = response.json()
-                results.append({"data": profile_data})  # Always wrap in 'data' key
-            else:
-                print(f"RapidAPI failed for {url}: {response.status_code} - {response.text}")
-            time.sleep(1)  # Respect rate limits
-        except Exception as e:
-            print(f"Error processing {url}: {e}")
-    return results 
\ No newline at end of file
+    endpoint, headers = _endpoint_and_headers(config)
+    clients = get_clients(config)
+
+    def fetch(url: str) -> Optional[Dict]:
+        if shared is None:
+            return _fetch_profile(clients, endpoint, headers, url)
+        return shared.get_or_compute(f"rapidapi:{url}",
+                                     lambda: _fetch_profile(clients, endpoint, headers, url))
+
+    # Never pay twice for one person, however the URL was spelled
+    urls = dedupe_urls(linkedin_urls)[:limit]
+    cache = get_profile_cache(config)
+    profiles = [cache.get(url) if cache else None for url in urls]
+    misses = [i for i, profile_data in enumerate(profiles) if profile_data is None]
+    if cache:
+        for profile_data in profiles:
+            METRICS.record_cache("profiles", profile_data is not None)
+    if misses:
+        with ThreadPoolExecutor(max_workers=clients.concurrency("rapidapi")) as executor:
+            fetched = executor.map(fetch, [urls[i] for i in misses])
+            for i, profile_data in zip(misses, fetched):
+                profiles[i] = profile_data
+                if cache and profile_data is not None:
+                    cache.set(urls[i], profile_data)
+    # Preserve input order and always wrap in 'data' key
+    return [{"data": profile_data} for profile_data in profiles if profile_data is not None]
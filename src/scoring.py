@@ -1,109 +1,277 @@
-from typing import List, Dict
-import os
+from typing import List, Dict, Iterator, Optional, Tuple
+from dataclasses import dataclass, field
 import json
-from openai import OpenAI
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+# get_profile_name used to live here; re-exported so `from src.scoring import get_profile_name` keeps working
+from src.candidate import get_profile_name, unwrap_profile  # noqa: F401
+from src.compaction import compact_profile, rubric_dimensions, rubric_weights
+from src.llm import chat_completion, parse_json_response
+from src.metrics import instrument
 
-def score_candidates(profiles: List[Dict], rubric: str, config: dict) -> List[Dict]:
+SCORE_DIMENSIONS = ["education", "trajectory", "company", "skills", "location", "tenure"]
+
+# Rubric weights (Education 20%, Trajectory 20%, Company 15%, Skills 25%, Location 10%, Tenure 10%)
+SCORE_WEIGHTS = {
+    "education": 0.20, "trajectory": 0.20, "company": 0.15, "skills": 0.25, "location": 0.10, "tenure": 0.10
+}
+
+# Structured-output schema; the model only returns the breakdown, fit_score is computed locally
+SCORE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "candidate_scores",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "candidates": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "candidate_id": {"type": "integer"},
+                            "name": {"type": "string"},
+                            "score_breakdown": {
+                                "type": "object",
+                                "properties": {dim: {"type": "number"} for dim in SCORE_DIMENSIONS},
+                                "required": SCORE_DIMENSIONS,
+                                "additionalProperties": False,
+                            },
+                        },
+                        "required": ["candidate_id", "name", "score_breakdown"],
+                        "additionalProperties": False,
+                    },
+                }
+            },
+            "required": ["candidates"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+@dataclass
+class CandidateScore:
     """
-    Scores each candidate profile using OpenAI LLM and the provided rubric.
-    Returns a list of scored candidate dicts.
-    Expects each profile to be a flat dict (not nested under 'data').
+    Validated score for one candidate. fit_score is the rubric-weighted mean of the breakdown
+    rather than whatever total the model reports. A candidate that could not be scored has an
+    `error`, no breakdown and a fit_score of None, so it is never mistaken for a real 0.0.
     """
-    os.environ['OPENAI_API_KEY'] = config['OPENAI_API_KEY']
-    client = OpenAI()
-    results = []
-    for profile in profiles:
-        url = profile.get('linkedin_url', '')
-        prompt = f"""
+    linkedin_url: str
+    name: str = "Unknown"
+    score_breakdown: Dict[str, float] = field(default_factory=lambda: {dim: 0.0 for dim in SCORE_DIMENSIONS})
+    weights: Dict[str, float] = field(default_factory=lambda: dict(SCORE_WEIGHTS), repr=False)
+    profile_tokens: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def fit_score(self) -> Optional[float]:
+        if self.error:
+            return None
+        return round(sum(self.weights[dim] * self.score_breakdown.get(dim, 0.0) for dim in self.weights), 2)
+
+    @classmethod
+    def failed(cls, linkedin_url: str, error: str, weights: Dict[str, float]) -> "CandidateScore":
+        return cls(linkedin_url=linkedin_url, score_breakdown={}, weights=weights, error=error)
+
+    @classmethod
+    def from_llm(cls, item: Dict, linkedin_url: str, weights: Dict[str, float]) -> "CandidateScore":
+        """
+        Validates one candidate entry from the model. Raises ValueError if any dimension is
+        missing or not a number; scores are clamped to the 0-10 rubric scale.
+        """
+        breakdown = item.get("score_breakdown")
+        if not isinstance(breakdown, dict):
+            raise ValueError("missing score_breakdown")
+        scores = {}
+        for dim in SCORE_DIMENSIONS:
+            value = breakdown.get(dim)
+            if isinstance(value, str):
+                try:
+                    value = float(value)
+                except ValueError:
+                    pass
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or math.isnan(value):
+                raise ValueError(f"invalid score for {dim}: {value!r}")
+            scores[dim] = min(10.0, max(0.0, float(value)))
+        name = item.get("name") if isinstance(item.get("name"), str) and item.get("name") else "Unknown"
+        return cls(linkedin_url=linkedin_url, name=name, score_breakdown=scores, weights=weights)
+
+    def to_dict(self) -> Dict:
+        result = {
+            "name": self.name,
+            "linkedin_url": self.linkedin_url,
+            "fit_score": self.fit_score,
+            "score_breakdown": dict(self.score_breakdown),
+        }
+        if self.profile_tokens is not None:
+            result["profile_tokens"] = self.profile_tokens
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+def _build_prompt(batch: List[Dict], rubric: str) -> str:
+    candidates = [
+        {"candidate_id": i, "linkedin_url": item["linkedin_url"], "profile": item["profile"]}
+        for i, item in enumerate(batch)
+    ]
+    return f"""
 You are an expert technical recruiter.
 
-Your task is to rate a candidate based on the provided LinkedIn profile data and the scoring rubric below.
+Your task is to rate each candidate below based on their LinkedIn profile data and the scoring rubric.
 
 Rubric:
 {rubric}
 
-Profile Data: {json.dumps(profile)}
+Candidates: {json.dumps(candidates)}
 
-Return **only** a valid JSON object in this format:
+Return **only** a valid JSON object in this format, with one entry per candidate:
 {{
-  "name": "Full Name (or 'Unknown' if not present)",
-  "linkedin_url": "{url}",
-  "fit_score": <float from 1.0 to 10.0>,
-  "score_breakdown": {{
-    "education": <float>,
-    "trajectory": <float>,
-    "company": <float>,
-    "skills": <float>,
-    "location": <float>,
-    "tenure": <float>
-  }}
+  "candidates": [
+    {{
+      "candidate_id": <int, copied from the input>,
+      "name": "Full Name (or 'Unknown' if not present)",
+      "score_breakdown": {{
+        "education": <float from 0.0 to 10.0>,
+        "trajectory": <float from 0.0 to 10.0>,
+        "company": <float from 0.0 to 10.0>,
+        "skills": <float from 0.0 to 10.0>,
+        "location": <float from 0.0 to 10.0>,
+        "tenure": <float from 0.0 to 10.0>
+      }}
+    }}
+  ]
 }}
 
 Only return the JSON. Do not include explanations, markdown, or commentary.
 """
+
+
+def _score_batch(config: dict, batch: List[Dict], rubric: str, model: str,
+                 weights: Dict[str, float], use_cache: bool = True) -> List[Optional[CandidateScore]]:
+    """
+    Scores a batch of compacted profiles in a single structured-output request.
+    Returns one result per profile, with None for candidates whose entry was missing or invalid.
+    """
+    urls = [item["linkedin_url"] for item in batch]
+    try:
+        content = chat_completion(
+            config,
+            model=model,
+            messages=[
+                {"role": "system", "content": "You are a JSON-only evaluator assistant. You return valid JSON only."},
+                {"role": "user", "content": _build_prompt(batch, rubric)}
+            ],
+            temperature=0.3,
+            response_format=SCORE_RESPONSE_FORMAT,
+            use_cache=use_cache
+        )
+        parsed = parse_json_response(content)
+    except json.JSONDecodeError:
+        print(f"LLM output was not valid JSON for: {', '.join(urls)}")
+        return [None] * len(batch)
+    except Exception as e:
+        print(f"Unexpected error for {', '.join(urls)}: {e}")
+        return [None] * len(batch)
+
+    results: List[Optional[CandidateScore]] = [None] * len(batch)
+    for item in parsed.get("candidates", []) if isinstance(parsed, dict) else []:
+        idx = item.get("candidate_id") if isinstance(item, dict) else None
+        if not isinstance(idx, int) or not 0 <= idx < len(batch):
+            continue
         try:
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a JSON-only evaluator assistant. You return valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3
-            )
-            content = response.choices[0].message.content
-            if not content:
-                # If the LLM response is empty, append a default result
-                results.append({
-                    "name": "Unknown",
-                    "linkedin_url": url,
-                    "fit_score": 0.0,
-                    "score_breakdown": {
-                        "education": 0.0,
-                        "trajectory": 0.0,
-                        "company": 0.0,
-                        "skills": 0.0,
-                        "location": 0.0,
-                        "tenure": 0.0
-                    }
-                })
-                continue
-            results.append(json.loads(content.strip()))
-        except json.JSONDecodeError:
-            print(f"LLM output was not valid JSON for: {url}")
-            results.append({
-                "name": "Unknown",
-                "linkedin_url": url,
-                "fit_score": 0.0,
-                "score_breakdown": {
-                    "education": 0.0,
-                    "trajectory": 0.0,
-                    "company": 0.0,
-                    "skills": 0.0,
-                    "location": 0.0,
-                    "tenure": 0.0
-                }
-            })
-        except Exception as e:
-            print(f"Unexpected error for {url}: {e}")
-            results.append({
-                "name": "Unknown",
-                "linkedin_url": url,
-                "fit_score": 0.0,
-                "score_breakdown": {
-                    "education": 0.0,
-                    "trajectory": 0.0,
-                    "company": 0.0,
-                    "skills": 0.0,
-                    "location": 0.0,
-                    "tenure": 0.0
-                }
-            })
-    return results 
-
-def get_profile_name(profile):
-    # Try common name fields
-    for key in ['name', 'full_name', 'first_name', 'last_name']:
-        if key in profile and profile[key]:
-            return profile[key]
-    # Fallback: use headline or 'N/A'
-    return profile.get('headline', 'N/A') 
\ No newline at end of file
+            results[idx] = CandidateScore.from_llm(item, urls[idx], weights)
+        except ValueError as e:
+            print(f"Invalid score for {urls[idx]}: {e}")
+    return results
+
+
+def _score_with_retry(config: dict, batch: List[Dict], rubric: str, model: str,
+                      weights: Dict[str, float]) -> List[Dict]:
+    """
+    Scores a batch, then re-scores only the candidates whose entries were missing or invalid,
+    one at a time, up to SCORING_MAX_RETRIES times. Candidates that still fail get a failed
+    CandidateScore (fit_score None, with an `error`) so the output stays aligned with the input.
+    """
+    max_retries = int(config.get('SCORING_MAX_RETRIES', 2))
+    results = _score_batch(config, batch, rubric, model, weights)
+    for i in range(len(results)):
+        for attempt in range(max_retries):
+            if results[i] is not None:
+                break
+            # A cached single-candidate response is only trusted on the first retry
+            results[i] = _score_batch(config, [batch[i]], rubric, model, weights, use_cache=attempt == 0)[0]
+        if results[i] is None:
+            results[i] = CandidateScore.failed(batch[i]["linkedin_url"],
+                                               f"not scored after {max_retries} retries", weights)
+        results[i].profile_tokens = batch[i]["profile_tokens"]
+    return [result.to_dict() for result in results]
+
+
+def _scoring_inputs(profiles: List[Dict], rubric: str, config: dict) -> Tuple[str, Dict[str, float], List[Dict]]:
+    """
+    Returns the scoring model, the rubric weights and the compacted prompt item for each profile.
+    """
+    model = config.get('SCORING_MODEL', 'gpt-4o')
+    max_tokens = int(config.get('PROMPT_PROFILE_MAX_TOKENS', 600))
+    dimensions = rubric_dimensions(rubric)
+    weights = rubric_weights(rubric, SCORE_WEIGHTS)
+    items = []
+    for profile in profiles:
+        flat = unwrap_profile(profile)
+        compact, tokens = compact_profile(flat, dimensions=dimensions, max_tokens=max_tokens, model=model)
+        items.append({"linkedin_url": flat.get("linkedin_url", ""), "profile": compact, "profile_tokens": tokens})
+    return model, weights, items
+
+
+def score_batch(profiles: List[Dict], rubric: str, config: dict) -> List[Dict]:
+    """
+    Scores one batch of profiles in a single request (with per-candidate retries), in order.
+    Used by streaming callers that assemble batches as profiles arrive.
+    """
+    if not profiles:
+        return []
+    model, weights, items = _scoring_inputs(profiles, rubric, config)
+    return _score_with_retry(config, items, rubric, model, weights)
+
+
+def iter_score_candidates(profiles: List[Dict], rubric: str, config: dict) -> Iterator[Tuple[int, Dict]]:
+    """
+    Scores profiles like score_candidates, but yields (index, result) pairs as soon as each
+    batch finishes so callers can show candidates before the whole list is scored.
+    """
+    batch_size = max(1, int(config.get('SCORING_BATCH_SIZE', 5)))
+    max_workers = max(1, int(config.get('SCORING_MAX_WORKERS', 4)))
+    model, weights, items = _scoring_inputs(profiles, rubric, config)
+    starts = range(0, len(items), batch_size)
+    if not starts:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(starts))) as executor:
+        futures = {
+            executor.submit(_score_with_retry, config, items[start:start + batch_size], rubric, model, weights): start
+            for start in starts
+        }
+        for future in as_completed(futures):
+            start = futures[future]
+            for offset, result in enumerate(future.result()):
+                yield start + offset, result
+
+
+@instrument()
+def score_candidates(profiles: List[Dict], rubric: str, config: dict) -> List[Dict]:
+    """
+    Scores each candidate profile using OpenAI LLM and the provided rubric.
+    Returns a list of scored candidate dicts.
+    Accepts Candidates or profile dicts (flat or nested under 'data').
+    Profiles are compacted to the fields the rubric needs and packed into batches of
+    SCORING_BATCH_SIZE that are scored concurrently; results are returned in the same order
+    as `profiles`, each with the token count of its compacted profile. fit_score is computed
+    from the validated breakdown using the rubric weights; candidates that could not be scored
+    have fit_score None and an `error`.
+    """
+    results: List[Optional[Dict]] = [None] * len(profiles)
+    for idx, result in iter_score_candidates(profiles, rubric, config):
+        results[idx] = result
+    return results
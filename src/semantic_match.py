@@ -0,0 +1,126 @@
+from typing import Callable, Dict, List, Optional, Sequence
+import hashlib
+import re
+import numpy as np
+from src.candidate import unwrap_profile
+from src.clients import get_clients
+from src.compaction import compact_profile
+
+# Takes a list of texts and returns one vector per text
+EmbeddingFunction = Callable[[List[str]], List[List[float]]]
+
+# Profile dimensions that say something about what the candidate actually works on
+MATCH_DIMENSIONS = ["skills", "trajectory", "company"]
+
+
+def openai_embedding_function(config: dict, model: str = "text-embedding-3-small") -> EmbeddingFunction:
+    """
+    Returns the OpenAI embedding function used for the persisted JD chunks.
+    """
+    return get_clients(config).embeddings(model).embed_documents
+
+
+def hashing_embedding_function(dim: int = 512) -> EmbeddingFunction:
+    """
+    Returns a deterministic bag-of-words hashing embedder that needs no network access.
+    Useful for offline runs and tests; JD chunks must be embedded with the same function.
+    """
+    def embed(texts: List[str]) -> List[List[float]]:
+        vectors = np.zeros((len(texts), dim))
+        for row, text in enumerate(texts):
+            for token in re.findall(r"[a-z0-9+#]+", text.lower()):
+                bucket = int.from_bytes(hashlib.md5(token.encode("utf-8")).digest()[:4], "little") % dim
+                vectors[row, bucket] += 1.0
+        return vectors.tolist()
+    return embed
+
+
+def get_embedding_function(config: dict) -> EmbeddingFunction:
+    """
+    Picks the embedder named by config['SEMANTIC_EMBEDDING']: 'openai' (default) or 'hashing' for offline use.
+    """
+    if config.get('SEMANTIC_EMBEDDING', 'openai') == 'hashing':
+        return hashing_embedding_function()
+    return openai_embedding_function(config)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def profile_match_text(profile: Dict) -> str:
+    """
+    Flattens the compacted profile fields relevant to matching into one string to embed.
+    """
+    compact, _ = compact_profile(unwrap_profile(profile), dimensions=MATCH_DIMENSIONS)
+    parts = [compact.get("headline", ""), compact.get("about", ""), compact.get("skills", "")]
+    for exp in compact.get("experiences", []):
+        parts.append(" ".join(str(exp.get(k, "")) for k in ("title", "company", "description")))
+    return "\n".join(p for p in parts if p)
+
+
+class JDChunkIndex:
+    """
+    In-memory matrix of unit-normalized JD chunk vectors for cosine scoring with NumPy.
+    """
+
+    def __init__(self, vectors: np.ndarray, texts: Sequence[str]):
+        self.texts = list(texts)
+        if not self.texts:
+            # No chunks (empty JD or none found in Chroma); similarity() scores every profile 0
+            self.vectors = np.zeros((0, 0))
+            return
+        self.vectors = _normalize_rows(np.asarray(vectors, dtype=float).reshape(len(self.texts), -1))
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embed_fn: EmbeddingFunction) -> "JDChunkIndex":
+        return cls(np.asarray(embed_fn(texts), dtype=float), texts)
+
+    @classmethod
+    def from_chroma(cls, config: dict, chunk_ids: Optional[List[str]] = None,
+                    embed_fn: Optional[EmbeddingFunction] = None) -> "JDChunkIndex":
+        """
+        Loads JD chunks from the persisted Chroma store, optionally limited to `chunk_ids`.
+        Stored vectors are used as-is unless `embed_fn` is given, in which case the chunk texts
+        are re-embedded so they live in the same space as the candidate vectors.
+        """
+        import chromadb
+        client = chromadb.PersistentClient(path=config['CHROMA_DB_PATH'])
+        collection = client.get_collection(config.get('CHROMA_COLLECTION', 'langchain'))
+        include = ["documents"] if embed_fn else ["documents", "embeddings"]
+        stored = collection.get(ids=chunk_ids, include=include)
+        texts = stored["documents"] or []
+        if embed_fn:
+            return cls.from_texts(texts, embed_fn)
+        return cls(np.asarray(stored["embeddings"], dtype=float), texts)
+
+    def similarity(self, profiles: List[Dict], embed_fn: EmbeddingFunction, top_n_chunks: int = 3) -> np.ndarray:
+        """
+        Returns one score per profile: the mean cosine similarity to its `top_n_chunks` closest JD chunks.
+        """
+        if not profiles or not self.texts:
+            return np.zeros(len(profiles))
+        profile_vectors = _normalize_rows(np.asarray(embed_fn([profile_match_text(p) for p in profiles]), dtype=float))
+        sims = profile_vectors @ self.vectors.T
+        k = min(top_n_chunks, sims.shape[1])
+        # Partition instead of sorting each row; only the k best chunks matter
+        top = np.partition(sims, sims.shape[1] - k, axis=1)[:, -k:]
+        return top.mean(axis=1)
+
+
+def rank_by_jd_similarity(profiles: List[Dict], index: JDChunkIndex, embed_fn: EmbeddingFunction,
+                          top_k: int = 0, min_similarity: float = 0.0) -> List[Dict]:
+    """
+    Orders profiles by semantic similarity to the JD, best first, dropping those below
+    `min_similarity` and keeping at most `top_k` (0 means no cap). Profiles are returned unchanged.
+    """
+    if not profiles:
+        return []
+    scores = index.similarity(profiles, embed_fn)
+    order = np.argsort(-scores, kind="stable")
+    order = order[scores[order] >= min_similarity]
+    if top_k:
+        order = order[:top_k]
+    return [profiles[i] for i in order]
@@ -0,0 +1,48 @@
+from typing import Any, Callable, Dict
+from concurrent.futures import Future
+import threading
+
+
+class SharedResults:
+    """
+    Thread-safe, in-memory memo shared by concurrent pipeline runs.
+    The first caller for a key computes the value; callers asking for the same key meanwhile
+    wait for that result instead of repeating the work (or the paid API call).
+    Exceptions and empty results (None, [] - what the fetchers return on failure) are handed to
+    the callers already waiting but not kept, so later callers try again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures: Dict[str, Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._futures[key] = future
+                self.misses += 1
+            else:
+                self.hits += 1
+        if owner:
+            try:
+                result = fn()
+            except Exception as e:
+                # Let the next caller try again instead of caching the failure
+                with self._lock:
+                    self._futures.pop(key, None)
+                future.set_exception(e)
+            else:
+                if result is None or result == []:
+                    with self._lock:
+                        self._futures.pop(key, None)
+                future.set_result(result)
+        return future.result()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._futures)}
@@ -0,0 +1,172 @@
+from typing import Optional
+from src.candidate import normalize_candidates, profile_url
+from src.candidate_store import get_candidate_store, needs_scoring
+from src.identity_index import dedupe_urls
+from src.linkedin_url import normalize_linkedin_url, profile_slug
+from src.jd_processing import load_jd, split_jd, embed_and_save_chunks, chunk_id
+from src.kor_extraction import extract_structured_info
+from src.title_generation import generate_alternate_titles
+from src.query_planner import search_for_job
+from src.rapidapi_enrich import enrich_profiles_with_rapidapi
+from src.prefilter import prefilter_candidates
+from src.scoring import score_candidates
+from src.messaging import craft_linkedin_messages
+from src.pipeline import Stage, digest
+from src.profile_cache import get_profile_cache
+from src.shared_results import SharedResults
+
+
+def build_stages(config: dict, limit: int = 10, jd_path: Optional[str] = None,
+                 shared: Optional[SharedResults] = None, requisition: Optional[str] = None) -> list:
+    """
+    Describes the sourcing pipeline as a graph of stages for PipelineRunner.
+    Stage params only include settings that change a stage's output, never API keys.
+    `jd_path` defaults to config['JD_PATH']; `shared` lets batch runs reuse search and enrichment.
+    With a `requisition` name (and CANDIDATE_STORE_PATH set) the run is incremental: only URLs the
+    requisition has not seen (or whose cached profile expired) are enriched, the search target
+    counts only new profiles, only new or changed profiles (or all, after a rubric change) are
+    scored, nobody is messaged twice, and the stage outputs hold just that delta.
+    """
+    jd_path = jd_path or config['JD_PATH']
+    store = get_candidate_store(config) if requisition else None
+
+    def embed_jd(jd_text):
+        split_docs = split_jd(jd_text)
+        new_chunks = embed_and_save_chunks(split_docs, config)
+        print(f"Embedded {new_chunks} new of {len(split_docs)} JD chunks into ChromaDB.")
+        return [doc.page_content for doc in split_docs]
+
+    def known_slugs():
+        # Profiles this requisition already has don't count toward the search target
+        if store is None:
+            return None
+        return {slug for slug in (profile_slug(url) for url in store.seen_urls(requisition)) if slug}
+
+    def enrich(linkedin_urls):
+        if store is None:
+            return enrich_profiles_with_rapidapi(linkedin_urls, config, limit=limit, shared=shared)
+        urls = dedupe_urls(linkedin_urls)
+        known = store.get(requisition, urls)
+        # Known profiles are compared from the profile cache; those missing from it or expired are
+        # fetched again so changes are noticed. `limit` caps paid fetches, new URLs first; the
+        # rest are picked up by the next run
+        cache = get_profile_cache(config)
+        cached = {url: cache.get(url) for url in urls if url in known} if cache else {}
+        new_urls = [url for url in urls if url not in known]
+        stale_urls = [url for url in urls if url in known and cached.get(url) is None]
+        to_fetch = (new_urls + stale_urls)[:limit]
+        fetched = {normalize_linkedin_url(profile_url(p)): p for p in enrich_profiles_with_rapidapi(
+            to_fetch, config, limit=limit, shared=shared)}
+        enriched = []
+        for url in urls:
+            if url in fetched:
+                enriched.append(fetched[url])
+            elif cached.get(url) is not None:
+                enriched.append({"data": cached[url]})
+        # A failed fetch is not marked seen, so the next run tries that profile again
+        store.mark_seen(requisition, [url for url in urls if url in known or url in fetched])
+        refreshed = sum(1 for url in fetched if url in known)
+        print(f"[{requisition}] enriched {len(fetched) - refreshed} new and refreshed {refreshed} expired profiles;"
+              f" {len(known)} seen before.")
+        return enriched
+
+    def shortlist(structured_info, enriched_profiles, rubric):
+        candidates = normalize_candidates(enriched_profiles)
+        if store is not None:
+            known = store.get(requisition, [c.canonical_url for c in candidates])
+            rubric_hash = digest(rubric)
+            candidates = [c for c in candidates
+                          if needs_scoring(known.get(c.canonical_url), digest(c.profile), rubric_hash)]
+        shortlisted = prefilter_candidates(candidates, structured_info, config)
+        if store is not None:
+            kept = {c.canonical_url for c in shortlisted}
+            store.record_evaluated(requisition, {c.canonical_url: digest(c.profile)
+                                                 for c in candidates if c.canonical_url not in kept})
+            print(f"[{requisition}] {len(candidates)} new or changed profiles, {len(shortlisted)} shortlisted.")
+        # Artifacts hold the flat profiles, not the {'data': ...} wrapper returned by enrichment
+        return [c.profile for c in shortlisted]
+
+    def score(ranked_profiles, rubric):
+        scored = score_candidates(ranked_profiles, rubric, config)
+        if store is not None:
+            hashes = {normalize_linkedin_url(profile_url(p)): digest(p) for p in ranked_profiles if profile_url(p)}
+            store.record_scores(requisition, [c for c in scored if c], hashes, digest(rubric))
+        return scored
+
+    def message(scored_candidates, structured_info, ranked_profiles, rubric):
+        candidates = [c for c in scored_candidates if c]
+        profiles = ranked_profiles
+        if store is not None:
+            # Everyone scored (in this run or an earlier one) and not messaged yet, so a failed
+            # message or a run that stopped before this stage is picked up again
+            candidates = store.unmessaged(requisition, digest(rubric), float(config.get('MESSAGE_MIN_FIT_SCORE', 5.0)))
+            in_run = {normalize_linkedin_url(profile_url(p)) for p in ranked_profiles if profile_url(p)}
+            cache = get_profile_cache(config)
+            profiles = list(ranked_profiles)
+            for c in candidates:
+                url = normalize_linkedin_url(c.get("linkedin_url") or "")
+                cached = cache.get(url) if cache and url not in in_run else None
+                if cached is not None:
+                    profiles.append(cached)
+        messages = craft_linkedin_messages(candidates, config, structured_info=structured_info, profiles=profiles)
+        if store is not None:
+            store.record_messages(requisition, messages)
+        return messages
+
+    def rank_semantically(shortlisted_profiles, jd_chunks):
+        if not config.get('SEMANTIC_MATCH_ENABLED', True) or not shortlisted_profiles:
+            return shortlisted_profiles
+        # NumPy and the Chroma client are only loaded when this stage actually runs
+        from src.semantic_match import JDChunkIndex, get_embedding_function, rank_by_jd_similarity
+        embed_fn = get_embedding_function(config)
+        # Stored vectors are OpenAI embeddings; any other embedder re-embeds the chunk texts
+        reuse_stored = config.get('SEMANTIC_EMBEDDING', 'openai') == 'openai'
+        index = JDChunkIndex.from_chroma(config, [chunk_id(text) for text in jd_chunks],
+                                         embed_fn=None if reuse_stored else embed_fn)
+        ranked = rank_by_jd_similarity(shortlisted_profiles, index, embed_fn,
+                                       top_k=config.get('SEMANTIC_TOP_K', 0),
+                                       min_similarity=config.get('SEMANTIC_MIN_SIMILARITY', 0.0))
+        if store is not None:
+            # Profiles cut here were evaluated too; without a hash they'd be re-ranked every run
+            kept = {id(p) for p in ranked}
+            store.record_evaluated(requisition, {normalize_linkedin_url(profile_url(p)): digest(p)
+                                                 for p in shortlisted_profiles
+                                                 if id(p) not in kept and profile_url(p)})
+        return ranked
+
+    def load_rubric():
+        with open(config['SCORE_RUBRIC_PATH'], 'r') as f:
+            return f.read()
+
+    return [
+        Stage("jd_text", lambda: load_jd(jd_path)),
+        Stage("jd_chunks", embed_jd, deps=["jd_text"], artifact="jd_chunks.json"),
+        Stage("structured_info", lambda jd_text: extract_structured_info(jd_text, config),
+              deps=["jd_text"], artifact="extracted_job_info.json"),
+        Stage("titles", lambda structured_info: generate_alternate_titles(structured_info, config),
+              deps=["structured_info"], artifact="combined_titles.json"),
+        Stage("linkedin_urls",
+              lambda structured_info, titles: search_for_job(structured_info, titles, config, shared=shared,
+                                                             known=known_slugs()),
+              deps=["structured_info", "titles"],
+              params={"max_total": config.get('TAVILY_MAX_TOTAL_RESULTS'),
+                      "per_title": config.get('TAVILY_MAX_RESULTS_PER_TITLE'),
+                      "planner": {key: value for key, value in config.items() if key.startswith('QUERY_PLANNER_')}},
+              artifact="final_linkedin_profiles.json"),
+        Stage("enriched_profiles", enrich, deps=["linkedin_urls"], params={"limit": limit, "requisition": requisition},
+              artifact="enriched_profiles_rapidapi.json"),
+        Stage("rubric", load_rubric),
+        Stage("shortlisted_profiles", shortlist, deps=["structured_info", "enriched_profiles", "rubric"],
+              params={"top_k": config.get('PREFILTER_TOP_K'), "min_score": config.get('PREFILTER_MIN_SCORE')},
+              artifact="shortlisted_profiles.json"),
+        Stage("ranked_profiles", rank_semantically, deps=["shortlisted_profiles", "jd_chunks"],
+              params={"enabled": config.get('SEMANTIC_MATCH_ENABLED'), "embedding": config.get('SEMANTIC_EMBEDDING'),
+                      "top_k": config.get('SEMANTIC_TOP_K'), "min_similarity": config.get('SEMANTIC_MIN_SIMILARITY')},
+              artifact="ranked_profiles.json"),
+        Stage("scored_candidates", score, deps=["ranked_profiles", "rubric"],
+              params={"model": config.get('SCORING_MODEL'), "max_tokens": config.get('PROMPT_PROFILE_MAX_TOKENS')},
+              artifact="scored_candidates.json"),
+        Stage("messages", message, deps=["scored_candidates", "structured_info", "ranked_profiles", "rubric"],
+              params={"min_fit_score": config.get('MESSAGE_MIN_FIT_SCORE')},
+              artifact="linkedin_outreach_messages.json"),
+    ]
@@ -0,0 +1,195 @@
+from typing import Callable, Dict, Iterator, List, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+import queue
+import threading
+import time
+from src.candidate import Candidate
+from src.clients import get_clients
+from src.prefilter import prefilter_candidates
+from src.query_planner import iter_linkedin_search
+from src.scoring import score_batch
+from src.shared_results import SharedResults
+
+# Marks the end of a stage's output on its queue
+_END = object()
+
+
+class StreamingPipeline:
+    """
+    Runs search, enrichment, pre-filter and scoring as concurrent stages joined by bounded queues:
+    a URL from the query planner is enriched while other searches are still in flight, and
+    profiles are scored in batches of SCORING_BATCH_SIZE as soon as they pass the pre-filter.
+    Each queue holds at most STREAM_QUEUE_SIZE items and at most SCORING_MAX_WORKERS batches are
+    scored at once; a full queue blocks the stage feeding it, so memory stays flat however many
+    candidates flow through.
+    `run()` yields each scored Candidate (with `.score` set). With `top_n`, the run stops once
+    that many candidates reach `min_fit_score`; queued searches and enrichments are abandoned,
+    and batches already sent to the LLM are still yielded. `limit` caps how many profiles are
+    enriched (otherwise the planner searches until its yield drops off). The pre-filter applies
+    PREFILTER_MIN_SCORE per profile; PREFILTER_TOP_K needs the whole list and is not applied.
+    """
+
+    def __init__(self, structured_info: Dict, titles: List[str], rubric: str, config: dict,
+                 limit: Optional[int] = None, top_n: Optional[int] = None, min_fit_score: Optional[float] = None,
+                 shared: Optional[SharedResults] = None,
+                 on_url: Optional[Callable[[str], None]] = None,
+                 on_profile: Optional[Callable[[Candidate, bool], None]] = None):
+        self.structured_info = structured_info
+        self.titles = titles
+        self.rubric = rubric
+        self.config = config
+        self.limit = limit
+        self.top_n = config.get('STREAM_TOP_N', 0) if top_n is None else top_n
+        self.min_fit_score = float(config.get('STREAM_MIN_FIT_SCORE', 7.0) if min_fit_score is None else min_fit_score)
+        self.shared = shared
+        self.on_url = on_url
+        self.on_profile = on_profile
+        self.queue_size = max(1, int(config.get('STREAM_QUEUE_SIZE', 16)))
+        self.batch_size = max(1, int(config.get('SCORING_BATCH_SIZE', 5)))
+        self.batch_wait = float(config.get('STREAM_BATCH_WAIT_SECONDS', 0.5))
+        self.score_workers = max(1, int(config.get('SCORING_MAX_WORKERS', 4)))
+        self.enrich_workers = get_clients(config).concurrency("rapidapi")
+        self.counts = {"urls": 0, "enriched": 0, "shortlisted": 0, "scored": 0, "qualified": 0}
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._error: Optional[Exception] = None
+        self._enrich_running = 0
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        # Blocks while the queue is full (back-pressure), but gives up once the run is stopped
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue):
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _guard(self, fn: Callable, *args) -> None:
+        try:
+            fn(*args)
+        except Exception as e:
+            with self._lock:
+                self._error = self._error or e
+            self._stop.set()
+
+    def _search(self, urls: queue.Queue) -> None:
+        try:
+            for url in iter_linkedin_search(self.structured_info, self.titles, self.config,
+                                            target=self.limit or 0, shared=self.shared):
+                if not self._put(urls, url):
+                    break
+                self._count("urls")
+                if self.on_url:
+                    self.on_url(url)
+                if self.limit and self.counts["urls"] >= self.limit:
+                    break
+        finally:
+            for _ in range(self.enrich_workers):
+                self._put(urls, _END)
+
+    def _enrich(self, urls: queue.Queue, profiles: queue.Queue) -> None:
+        # Imported here so the streaming module stays cheap to import
+        from src.rapidapi_enrich import enrich_profile
+        try:
+            while True:
+                url = self._get(urls)
+                if url is _END:
+                    break
+                payload = enrich_profile(url, self.config, shared=self.shared)
+                candidate = Candidate.from_rapidapi(payload) if payload else None
+                if candidate is None:
+                    continue
+                self._count("enriched")
+                kept = bool(prefilter_candidates([candidate], self.structured_info, self.config, top_k=0))
+                if self.on_profile:
+                    self.on_profile(candidate, kept)
+                if kept:
+                    self._count("shortlisted")
+                    if not self._put(profiles, candidate):
+                        break
+        finally:
+            with self._lock:
+                self._enrich_running -= 1
+                last = self._enrich_running == 0
+            if last:
+                self._put(profiles, _END)
+
+    def _finish(self, future: Future, batch: List[Candidate]) -> Iterator[Candidate]:
+        for candidate, result in zip(batch, future.result()):
+            candidate.score = result
+            self._count("scored")
+            if float(result.get("fit_score") or 0) >= self.min_fit_score:
+                self._count("qualified")
+                if self.top_n and self.counts["qualified"] >= self.top_n:
+                    self._stop.set()
+            yield candidate
+
+    def run(self) -> Iterator[Candidate]:
+        """
+        Starts the stages and yields scored candidates as their batches complete.
+        """
+        urls: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        profiles: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        self._enrich_running = self.enrich_workers
+        threads = [threading.Thread(target=self._guard, args=(self._search, urls), daemon=True)]
+        threads += [threading.Thread(target=self._guard, args=(self._enrich, urls, profiles), daemon=True)
+                    for _ in range(self.enrich_workers)]
+        for thread in threads:
+            thread.start()
+
+        pending: Dict[Future, List[Candidate]] = {}
+        batch: List[Candidate] = []
+        batch_started = 0.0
+        upstream_done = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.score_workers) as executor:
+                while not self._stop.is_set():
+                    # Only pull more profiles while a scoring slot is free
+                    if not upstream_done and len(pending) < self.score_workers:
+                        try:
+                            item = profiles.get(timeout=0.05)
+                        except queue.Empty:
+                            item = None
+                        if item is _END:
+                            upstream_done = True
+                        elif item is not None:
+                            if not batch:
+                                batch_started = time.monotonic()
+                            batch.append(item)
+                    if batch and (len(batch) >= self.batch_size or upstream_done
+                                  or time.monotonic() - batch_started >= self.batch_wait):
+                        pending[executor.submit(score_batch, batch, self.rubric, self.config)] = batch
+                        batch = []
+                    if pending:
+                        saturated = len(pending) >= self.score_workers or upstream_done
+                        done, _ = wait(pending, timeout=0.1 if saturated else 0, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield from self._finish(future, pending.pop(future))
+                    elif upstream_done and not batch:
+                        break
+                # Batches already sent to the LLM are paid for, so hand them over too
+                for future in as_completed(pending):
+                    yield from self._finish(future, pending[future])
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+        if self._error is not None:
+            raise self._error
+
@@ -1,27 +1,46 @@
-from typing import List
-import os
+from typing import Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import zip_longest
 import requests
+from src.clients import ClientRegistry, get_clients
+from src.metrics import instrument
+from src.identity_index import IdentityIndex, get_identity_store
+from src.shared_results import SharedResults
 
-def search_linkedin_profiles(titles: List[str], config: dict, max_results_per_title: int = 4) -> List[str]:
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+
+def format_search_query(title: str, location: str = "", keyword: str = "") -> str:
     """
-    Searches LinkedIn profiles using the Tavily API for each title/location combination.
-    Returns a list of unique LinkedIn profile URLs.
+    Builds the Tavily query for a title, optionally narrowed by location and a skill keyword.
     """
-    tavily_api_key = config['TAVILY_API_KEY']
-    if not tavily_api_key:
-        raise ValueError("TAVILY_API_KEY not set in config.")
+    terms = [term.strip() for term in (title, location, keyword) if term and term.strip()]
+    return f'site:linkedin.com/in/ {" ".join(terms)}'
+
+
+def build_search_query(title: str) -> str:
+    """
+    Builds the Tavily query for a 'Title, Location' string.
+    """
+    # Split title and location (if comma is present)
+    if "," in title:
+        short_title, short_location = title.split(",", 1)
+    else:
+        short_title = title
+        short_location = ""
+    return f'site:linkedin.com/in/ {short_title.strip()} {short_location.strip()}'
+
 
-    all_linkedin_urls = []
-    for title in titles:
-        # Split title and location (if comma is present)
-        if "," in title:
-            short_title, short_location = title.split(",", 1)
-        else:
-            short_title = title
-            short_location = ""
-        query = f'site:linkedin.com/in/ {short_title.strip()} {short_location.strip()}'
-        response = requests.post(
-            "https://api.tavily.com/search",
+def _search_one(clients: ClientRegistry, query: str, tavily_api_key: str,
+                max_results: int, search_url: str) -> List[str]:
+    """
+    Runs a single Tavily query and returns the LinkedIn profile URLs it found, in rank order.
+    """
+    try:
+        response = clients.request(
+            "tavily",
+            "POST",
+            search_url,
             headers={
                 "Authorization": f"Bearer {tavily_api_key}",
                 "Content-Type": "application/json"
@@ -30,15 +49,92 @@ def search_linkedin_profiles(titles: List[str], config: dict, max_results_per_ti
                 "query": query,
                 "search_depth": "basic",
                 "include_answer": False,
-                "max_results": max_results_per_title
+                "max_results": max_results
             }
         )
-        if response.status_code == 200:
-            data = response.json()
-            urls = [r["url"] for r in data.get("results", []) if "linkedin.com/in/" in r["url"]]
-            all_linkedin_urls.extend(urls)
-        else:
-            print(f"Tavily API failed for '{title}': {response.status_code} - {response.text}")
-    # Deduplicate
-    unique_urls = list(set(all_linkedin_urls))[:7]
-    return unique_urls 
\ No newline at end of file
+    except requests.RequestException as e:
+        print(f"Tavily API failed for '{query}': {e}")
+        return []
+    if response.status_code != 200:
+        print(f"Tavily API failed for '{query}': {response.status_code} - {response.text}")
+        return []
+    data = response.json()
+    return [r["url"] for r in data.get("results", []) if "linkedin.com/in/" in r["url"]]
+
+
+def iter_queries(queries: List[str], config: dict, max_results: int,
+                 shared: Optional[SharedResults] = None) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Runs Tavily queries concurrently over the shared, rate-limited session and yields
+    (query index, profile URLs in rank order) as each query completes.
+    With `shared`, results are reused across a batch.
+    """
+    tavily_api_key = config['TAVILY_API_KEY']
+    if not tavily_api_key:
+        raise ValueError("TAVILY_API_KEY not set in config.")
+    if not queries:
+        return
+    clients = get_clients(config)
+    search_url = config.get('TAVILY_SEARCH_URL') or TAVILY_SEARCH_URL
+
+    def search(query: str) -> List[str]:
+        if shared is None:
+            return _search_one(clients, query, tavily_api_key, max_results, search_url)
+        return shared.get_or_compute(
+            f"tavily:{max_results}:{query.lower()}",
+            lambda: _search_one(clients, query, tavily_api_key, max_results, search_url)
+        )
+
+    with ThreadPoolExecutor(max_workers=min(len(queries), clients.concurrency("tavily"))) as executor:
+        futures = {executor.submit(search, query): i for i, query in enumerate(queries)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def run_queries(queries: List[str], config: dict, max_results: int,
+                shared: Optional[SharedResults] = None) -> List[List[str]]:
+    """
+    Like iter_queries, but waits for every query and returns their URL lists in query order.
+    """
+    results: List[List[str]] = [[] for _ in queries]
+    for i, urls in iter_queries(queries, config, max_results, shared=shared):
+        results[i] = urls
+    return results
+
+
+@instrument()
+def search_linkedin_profiles(titles: List[str], config: dict, max_results_per_title: Optional[int] = None,
+                             max_total: Optional[int] = None, offset: int = 0,
+                             shared: Optional[SharedResults] = None,
+                             index: Optional[IdentityIndex] = None) -> List[str]:
+    """
+    Searches LinkedIn profiles using the Tavily API for each title/location combination.
+    Returns a list of unique LinkedIn profile URLs.
+    All queries run concurrently over the shared, rate-limited Tavily session. Hits are merged
+    into one entry per person by an IdentityIndex (persisted at IDENTITY_INDEX_PATH), ranked by how
+    many distinct queries surfaced them and then by rank (round-robin across titles), then paged
+    with `offset` and capped at `max_total` (defaults to config['TAVILY_MAX_TOTAL_RESULTS'];
+    0 means no cap). Each title asks Tavily for `max_results_per_title` hits (defaults to
+    config['TAVILY_MAX_RESULTS_PER_TITLE']; Tavily returns at most 20). Pass `index` to read each profile's query provenance afterwards.
+    With `shared`, each title's results are reused by every run in the batch that asks for it.
+    """
+    if max_total is None:
+        max_total = config.get('TAVILY_MAX_TOTAL_RESULTS', 7)
+    if max_results_per_title is None:
+        max_results_per_title = config.get('TAVILY_MAX_RESULTS_PER_TITLE', 4)
+    if not titles:
+        return []
+    per_title = run_queries([build_search_query(title) for title in titles], config,
+                            max_results_per_title, shared=shared)
+
+    # Record hits interleaved by rank so ties keep every title's best hits near the top
+    if index is None:
+        index = IdentityIndex(get_identity_store(config))
+    for rank, row in enumerate(zip_longest(*per_title)):
+        for title, url in zip(titles, row):
+            if url:
+                index.add_hit(url, build_search_query(title), rank)
+    index.save()
+    unique_urls = index.ranked_urls()
+    end = offset + max_total if max_total else None
+    return unique_urls[offset:end]
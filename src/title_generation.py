@@ -1,14 +1,13 @@
 from typing import Dict, List
-import os
-from openai import OpenAI
+from src.llm import chat_completion
+from src.metrics import instrument
 
+@instrument()
 def generate_alternate_titles(structured_info: Dict, config: dict) -> List[str]:
     """
     Generates alternate job titles using OpenAI's GPT model based on structured job info.
     Returns a list of suggested titles.
     """
-    os.environ['OPENAI_API_KEY'] = config['OPENAI_API_KEY']
-    client = OpenAI()
     job_data = structured_info["job_info"][0]
     title = job_data["title"]
     location = job_data["location"]
@@ -31,7 +30,8 @@ Tasks:
    - Title 4
    - Title 5
 """
-    response = client.chat.completions.create(
+    content = chat_completion(
+        config,
         model="gpt-4",
         messages=[
             {"role": "system", "content": "You're a sourcing assistant helping find candidates on LinkedIn."},
@@ -39,7 +39,6 @@ Tasks:
         ],
         temperature=0.7
     )
-    content = response.choices[0].message.content
     if not content:
         # If the LLM response is empty, return an empty list
         return []
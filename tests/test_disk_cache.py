@@ -0,0 +1,61 @@
+import pytest
+import src.disk_cache
+from src.disk_cache import DiskCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(src.disk_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_round_trips_json_values(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"))
+    cache.set("k", {"a": [1, 2], "b": None})
+    assert cache.get("k") == {"a": [1, 2], "b": None}
+    reopened = DiskCache(str(tmp_path / "cache.sqlite3"))
+    assert reopened.get("k") == {"a": [1, 2], "b": None}
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = DiskCache(":memory:", ttl_seconds=60)
+    cache.set("k", 1)
+    clock[0] += 59
+    assert cache.get("k") == 1
+    clock[0] += 2
+    assert cache.get("k") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_zero_ttl_never_expires(clock):
+    cache = DiskCache(":memory:", ttl_seconds=0)
+    cache.set("k", 1)
+    clock[0] += 10 ** 9
+    assert cache.get("k") == 1
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    cache = DiskCache(":memory:", max_entries=2)
+    cache.set("a", 1)
+    clock[0] += 1
+    cache.set("b", 2)
+    clock[0] += 1
+    assert cache.get("a") == 1
+    clock[0] += 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["size"] == 2
+
+
+def test_hit_and_miss_counters(clock):
+    cache = DiskCache(":memory:", ttl_seconds=10)
+    assert cache.get("missing") is None
+    cache.set("k", "v")
+    cache.get("k")
+    cache.get("k")
+    clock[0] += 11
+    cache.get("k")
+    assert cache.stats() == {"hits": 2, "misses": 2, "hit_rate": 0.5, "size": 0}
@@ -0,0 +1,40 @@
+from src.disk_cache import DiskCache
+from src.identity_index import IdentityIndex, dedupe_urls
+
+
+def test_url_spellings_merge_into_one_identity():
+    index = IdentityIndex()
+    index.add_hit("https://uk.linkedin.com/in/Jane-Doe/?trk=x", "q1", 2)
+    index.add_hit("linkedin.com/in/jane-doe", "q2", 0)
+    assert index.ranked_urls() == ["https://www.linkedin.com/in/jane-doe"]
+    assert index.sources("www.linkedin.com/in/jane-doe/") == {"q1": 2, "q2": 0}
+    assert index.add_hit("https://www.linkedin.com/company/acme", "q1", 0) is None
+
+
+def test_ranking_prefers_more_queries_then_best_rank():
+    index = IdentityIndex()
+    index.add_hit("https://www.linkedin.com/in/a", "q1", 3)
+    index.add_hit("https://www.linkedin.com/in/b", "q1", 0)
+    index.add_hit("https://www.linkedin.com/in/c", "q1", 1)
+    index.add_hit("https://www.linkedin.com/in/a", "q2", 4)
+    assert [url.rsplit("/", 1)[1] for url in index.ranked_urls()] == ["a", "b", "c"]
+
+
+def test_queries_from_earlier_runs_do_not_affect_ranking():
+    store = DiskCache(":memory:", table="identities")
+    earlier = IdentityIndex(store)
+    for query in ("pastry chef", "pastry chef paris", "head baker"):
+        earlier.add_hit("https://www.linkedin.com/in/baker", query, 0)
+    earlier.save()
+
+    current = IdentityIndex(store)
+    current.add_hit("https://www.linkedin.com/in/ml-lead", "ml engineer", 0)
+    current.add_hit("https://www.linkedin.com/in/baker", "ml engineer", 4)
+    assert [url.rsplit("/", 1)[1] for url in current.ranked_urls()] == ["ml-lead", "baker"]
+    # Provenance still accumulates across runs
+    assert len(current.sources("https://www.linkedin.com/in/baker")) == 4
+
+
+def test_dedupe_urls_keeps_first_spelling_order():
+    urls = ["https://www.linkedin.com/in/b/", "linkedin.com/in/a", "https://de.linkedin.com/in/B", ""]
+    assert dedupe_urls(urls) == ["https://www.linkedin.com/in/b", "https://www.linkedin.com/in/a"]
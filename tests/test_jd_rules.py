@@ -0,0 +1,82 @@
+from pathlib import Path
+from src.jd_rules import parse_job_info, parse_keywords, parse_location, parse_title
+
+JD1 = (Path(__file__).resolve().parent.parent / "src" / "job_description" / "jd1.txt").read_text()
+MIN_CONFIDENCE = 0.7
+
+
+def test_parse_title_prefers_labeled_line():
+    assert parse_title("About us\nTitle: Data Engineer\nWe build pipelines.") == ("Data Engineer", 0.95)
+
+
+def test_parse_title_takes_short_role_first_line():
+    assert parse_title("Senior Backend Engineer\n\nWe are hiring.") == ("Senior Backend Engineer", 0.8)
+
+
+def test_parse_title_ignores_sentences_and_non_roles():
+    assert parse_title("We are hiring an engineer to join us.\nMore text") == ("", 0.0)
+    assert parse_title("Head of the line\nMore text") == ("", 0.0)
+
+
+def test_parse_location_labeled_and_city_state():
+    assert parse_location("Location: Berlin, Germany\n") == ("Berlin, Germany", 0.95)
+    assert parse_location("Our office is in Mountain View, CA.") == ("Mountain View, CA", 0.9)
+
+
+def test_parse_location_multiple_places_and_remote():
+    assert parse_location("Offices in Austin, TX and Seattle, WA, mostly Austin, TX.") == ("Austin, TX", 0.5)
+    assert parse_location("This role is fully remote.") == ("Remote", 0.75)
+    assert parse_location("No place given.") == ("", 0.0)
+
+
+def test_parse_keywords_labeled_line_skips_kor():
+    value, confidence = parse_keywords("Required skills: Go, Kubernetes; PostgreSQL\n")
+    assert value == "Go, Kubernetes, PostgreSQL"
+    assert confidence >= MIN_CONFIDENCE
+
+
+def test_parse_keywords_ignores_english_words():
+    text = "We go the extra mile with the rest of the team to spark ideas. Python is a must."
+    assert parse_keywords(text) == ("Python", 0.3)
+
+
+def test_parse_keywords_ambiguous_skills_need_exact_spelling_mid_sentence():
+    text = "Go the extra mile. Rust never sleeps.\nExperience with Go, REST APIs and Spark is a plus."
+    assert parse_keywords(text)[0] == "Go, REST, Spark"
+
+
+def test_parse_keywords_lexicon_scan_stays_below_threshold():
+    value, confidence = parse_keywords("Python, PyTorch, Docker and Kubernetes in production.")
+    assert value == "Python, PyTorch, Docker, Kubernetes"
+    assert confidence < MIN_CONFIDENCE
+
+
+def test_jd1_keywords_fall_back_to_kor():
+    info = parse_job_info(JD1)
+    assert info["title"][1] >= MIN_CONFIDENCE
+    assert info["location"] == ("Mountain View, CA", 0.9)
+    assert info["keywords"][1] < MIN_CONFIDENCE
+
+
+def test_skills_header_collects_bullets_below_it():
+    text = "About the team\n\nRequired Skills:\n- Python\n- PyTorch\n* CUDA\n\nBenefits:\n- Free lunch\n"
+    assert parse_keywords(text) == ("Python, PyTorch, CUDA", 0.9)
+
+
+def test_skills_header_with_requirement_bullets_falls_back_to_kor():
+    text = "Required skills:\n- 3+ years of Python in production.\n- Experience training large models\n"
+    value, confidence = parse_keywords(text)
+    assert value.startswith("3+ years of Python")
+    assert confidence < MIN_CONFIDENCE
+
+
+def test_label_value_does_not_span_lines():
+    assert parse_title("Role:\nYou will own our training infrastructure.\n")[1] < MIN_CONFIDENCE
+    assert parse_location("Location:\nMountain View, CA\n") == ("Mountain View, CA", 0.95)
+
+
+def test_sentence_like_title_and_location_are_rejected():
+    assert parse_title("Role: you will own training infra for our research team")[1] < MIN_CONFIDENCE
+    assert parse_title("Staff Data Engineer\nRole: we are looking for someone great.") == ("Staff Data Engineer", 0.8)
+    assert parse_location("Location: we are flexible about where you work.") == ("", 0.0)
+    assert parse_location("Location: our HQ in Austin, TX is nice.") == ("Austin, TX", 0.9)
@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+import json
+import pytest
+from src.llm import chat_completion, parse_json_response, set_llm_client
+
+
+def test_parse_plain_json():
+    assert parse_json_response('{"a": 1}') == {"a": 1}
+
+
+def test_parse_strips_markdown_fences():
+    assert parse_json_response('```json\n{"a": [1, 2]}\n```') == {"a": [1, 2]}
+    assert parse_json_response('```\n[1]\n```') == [1]
+
+
+def test_parse_drops_prose_around_the_object():
+    assert parse_json_response('Here are the scores:\n{"a": 1}\nLet me know!') == {"a": 1}
+
+
+def test_parse_repairs_trailing_commas():
+    assert parse_json_response('{"a": [1, 2,], "b": {"c": 3,},}') == {"a": [1, 2], "b": {"c": 3}}
+
+
+@pytest.mark.parametrize("content", [None, "", "no json here", "{broken"])
+def test_parse_raises_on_unrecoverable_text(content):
+    with pytest.raises(json.JSONDecodeError):
+        parse_json_response(content)
+
+
+class _CountingClient:
+    """
+    Minimal stand-in for the OpenAI client: answers every call with a new numbered reply.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        message = SimpleNamespace(content=f"reply {self.calls}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+@pytest.fixture
+def client():
+    fake = _CountingClient()
+    set_llm_client(fake)
+    yield fake
+    set_llm_client(None)
+
+
+def _config(tmp_path, **overrides):
+    return dict({"LLM_CACHE_PATH": str(tmp_path / "llm.sqlite3")}, **overrides)
+
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def test_zero_temperature_calls_are_cached(client, tmp_path):
+    config = _config(tmp_path)
+    assert chat_completion(config, MESSAGES, temperature=0) == "reply 1"
+    assert chat_completion(config, MESSAGES, temperature=0) == "reply 1"
+    assert client.calls == 1
+    assert chat_completion(config, MESSAGES, model="gpt-4o", temperature=0) == "reply 2"
+
+
+def test_nonzero_temperature_is_not_cached_unless_opted_in(client, tmp_path):
+    config = _config(tmp_path)
+    assert chat_completion(config, MESSAGES, temperature=0.7) == "reply 1"
+    assert chat_completion(config, MESSAGES, temperature=0.7) == "reply 2"
+    assert chat_completion(config, MESSAGES, temperature=0.7, cache_nonzero_temperature=True) == "reply 3"
+    assert chat_completion(config, MESSAGES, temperature=0.7, cache_nonzero_temperature=True) == "reply 3"
+    opted_in = _config(tmp_path, LLM_CACHE_NONZERO_TEMPERATURE=True)
+    assert chat_completion(opted_in, MESSAGES, temperature=0.7) == "reply 3"
+
+
+def test_use_cache_false_bypasses_and_refreshes_the_cache(client, tmp_path):
+    config = _config(tmp_path)
+    assert chat_completion(config, MESSAGES) == "reply 1"
+    assert chat_completion(config, MESSAGES, use_cache=False) == "reply 2"
+    assert chat_completion(config, MESSAGES) == "reply 2"
+    assert client.calls == 2
+
+
+def test_empty_cache_path_disables_caching(client):
+    config = {"LLM_CACHE_PATH": ""}
+    chat_completion(config, MESSAGES)
+    chat_completion(config, MESSAGES)
+    assert client.calls == 2
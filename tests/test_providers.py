@@ -0,0 +1,85 @@
+import pytest
+from benchmarks.fakes import FakeProviderServer
+from src.candidate import unwrap_profile
+from src.clients import get_clients
+from src.rapidapi_enrich import enrich_profile, enrich_profiles_with_rapidapi
+from src.tavily_search import run_queries, search_linkedin_profiles
+
+
+@pytest.fixture
+def server():
+    fake = FakeProviderServer(latency=0.001).start()
+    yield fake
+    fake.stop()
+
+
+def _config(server, **overrides):
+    config = {
+        "TAVILY_API_KEY": "fake", "RAPIDAPI_KEY": "fake", "RAPIDAPI_HOST": "fake",
+        "TAVILY_SEARCH_URL": f"{server.base_url}/search", "RAPIDAPI_BASE_URL": server.base_url,
+        "TAVILY_REQUESTS_PER_SECOND": 1000, "RAPIDAPI_REQUESTS_PER_SECOND": 1000,
+        "PROFILE_CACHE_PATH": "", "HTTP_TIMEOUT": 5,
+    }
+    config.update(overrides)
+    return config
+
+
+def test_request_retries_429_after_retry_after():
+    fake = FakeProviderServer(latency=0.001, rate_limit=5).start()
+    try:
+        clients = get_clients(_config(fake, RAPIDAPI_MAX_RETRIES=3))
+        url = f"{fake.base_url}/get-linkedin-profile?linkedin_url=x"
+        # Drain the server's bucket so the next request is throttled
+        while fake.limiter.try_acquire():
+            pass
+        response = clients.request("rapidapi", "GET", url)
+        assert response.status_code == 200
+        assert fake.counts["throttled"] >= 1
+    finally:
+        fake.stop()
+
+
+def test_request_returns_last_error_when_retries_run_out():
+    fake = FakeProviderServer(latency=0.001, rate_limit=0.01).start()
+    try:
+        clients = get_clients(_config(fake, RAPIDAPI_MAX_RETRIES=1))
+        fake.limiter.try_acquire()
+        response = clients.request("rapidapi", "GET", f"{fake.base_url}/get-linkedin-profile?linkedin_url=x")
+        assert response.status_code == 429
+        assert fake.counts["throttled"] == 2
+    finally:
+        fake.stop()
+
+
+def test_enrichment_wraps_profiles_in_data_and_keeps_input_order(server):
+    urls = ["https://www.linkedin.com/in/c", "https://uk.linkedin.com/in/a/", "https://www.linkedin.com/in/b",
+            "linkedin.com/in/A"]
+    profiles = enrich_profiles_with_rapidapi(urls, _config(server))
+    assert all(set(profile) == {"data"} for profile in profiles)
+    assert [unwrap_profile(p)["linkedin_url"].rsplit("/", 1)[1] for p in profiles] == ["c", "a", "b"]
+    assert server.counts["profile"] == 3
+
+
+def test_enrichment_honours_limit(server):
+    urls = [f"https://www.linkedin.com/in/p{i}" for i in range(5)]
+    assert len(enrich_profiles_with_rapidapi(urls, _config(server), limit=2)) == 2
+
+
+def test_enrich_profile_returns_data_wrapper(server):
+    result = enrich_profile("https://www.linkedin.com/in/jane", _config(server))
+    assert set(result) == {"data"}
+    assert unwrap_profile(result)["linkedin_url"] == "https://www.linkedin.com/in/jane"
+
+
+def test_search_results_come_back_in_query_order(server):
+    queries = ["ml engineer", "data scientist", "research engineer"]
+    results = run_queries(queries, _config(server), max_results=3)
+    assert [urls[0] for urls in results] == [server.search_results(q, 3)[0]["url"] for q in queries]
+
+
+def test_results_per_title_come_from_config(server):
+    config = _config(server, TAVILY_MAX_TOTAL_RESULTS=0, IDENTITY_INDEX_PATH="")
+    titles = ["ML Engineer", "Research Engineer"]
+    assert len(search_linkedin_profiles(titles, config)) <= 8
+    config["TAVILY_MAX_RESULTS_PER_TITLE"] = 15
+    assert len(search_linkedin_profiles(titles, config)) > 20
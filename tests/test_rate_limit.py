@@ -0,0 +1,35 @@
+import time
+import pytest
+from src.rate_limit import TokenBucket, backoff_delay
+
+
+def test_token_bucket_allows_a_burst_then_waits():
+    bucket = TokenBucket(rate=20, capacity=2)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    started = time.monotonic()
+    waited = bucket.acquire()
+    assert waited > 0
+    assert time.monotonic() - started >= 0.04
+
+
+def test_token_bucket_try_acquire_does_not_block():
+    bucket = TokenBucket(rate=1)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_backoff_is_exponential_and_capped():
+    assert [backoff_delay(attempt) for attempt in range(4)] == [0.5, 1.0, 2.0, 4.0]
+    assert backoff_delay(10, cap=30.0) == 30.0
+
+
+def test_backoff_honours_numeric_retry_after():
+    assert backoff_delay(3, retry_after="0.2") == 0.2
+    assert backoff_delay(0, retry_after="120", cap=30.0) == 30.0
+    assert backoff_delay(1, retry_after="Wed, 21 Oct 2015 07:28:00 GMT") == 1.0
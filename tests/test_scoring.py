@@ -0,0 +1,58 @@
+import pytest
+from src.llm import set_llm_client
+from src.scoring import SCORE_DIMENSIONS, SCORE_WEIGHTS, CandidateScore, score_batch
+
+
+def _item(**scores):
+    breakdown = {dim: 5 for dim in SCORE_DIMENSIONS}
+    breakdown.update(scores)
+    return {"name": "Ada Lovelace", "score_breakdown": breakdown}
+
+
+def test_fit_score_is_weighted_by_rubric():
+    score = CandidateScore.from_llm(_item(skills=10, location=0), "u", SCORE_WEIGHTS)
+    assert score.fit_score == pytest.approx(5 + 0.25 * 5 - 0.10 * 5)
+    custom = CandidateScore.from_llm(_item(skills=10), "u", {"skills": 1.0})
+    assert custom.fit_score == 10.0
+
+
+def test_scores_are_clamped_and_coerced():
+    score = CandidateScore.from_llm(_item(education=14, tenure=-3, skills="7.5"), "u", SCORE_WEIGHTS)
+    assert score.score_breakdown["education"] == 10.0
+    assert score.score_breakdown["tenure"] == 0.0
+    assert score.score_breakdown["skills"] == 7.5
+    assert score.name == "Ada Lovelace"
+
+
+@pytest.mark.parametrize("value", [None, "high", True, float("nan")])
+def test_invalid_dimension_is_rejected(value):
+    with pytest.raises(ValueError):
+        CandidateScore.from_llm(_item(skills=value), "u", SCORE_WEIGHTS)
+
+
+def test_failed_score_is_not_a_zero():
+    result = CandidateScore.failed("u", "not scored", SCORE_WEIGHTS).to_dict()
+    assert result["fit_score"] is None
+    assert result["error"] == "not scored"
+    assert result["score_breakdown"] == {}
+
+
+class _FailingClient:
+    class chat:
+        class completions:
+            @staticmethod
+            def create(**kwargs):
+                raise RuntimeError("OpenAI is down")
+
+
+def test_unscored_candidates_are_marked_failed():
+    set_llm_client(_FailingClient())
+    try:
+        config = {"LLM_CACHE_PATH": "", "SCORING_MAX_RETRIES": 1}
+        results = score_batch([{"linkedin_url": "https://www.linkedin.com/in/ada", "full_name": "Ada"}], "", config)
+    finally:
+        set_llm_client(None)
+    assert len(results) == 1
+    assert results[0]["linkedin_url"] == "https://www.linkedin.com/in/ada"
+    assert results[0]["fit_score"] is None
+    assert results[0]["error"]
@@ -0,0 +1,37 @@
+import numpy as np
+from src.semantic_match import JDChunkIndex, hashing_embedding_function, rank_by_jd_similarity
+
+EMBED = hashing_embedding_function()
+JD_CHUNKS = [
+    "We are hiring a machine learning engineer to train large language models in python and pytorch",
+    "You will build distributed training infrastructure on kubernetes",
+]
+PROFILES = [
+    {"linkedin_url": "https://www.linkedin.com/in/chef", "headline": "Pastry chef and restaurant owner"},
+    {"linkedin_url": "https://www.linkedin.com/in/mle", "headline": "Machine learning engineer, python and pytorch",
+     "about": "I train large language models on kubernetes"},
+    {"linkedin_url": "https://www.linkedin.com/in/swe", "headline": "Software engineer working in python"},
+]
+
+
+def _urls(profiles):
+    return [p["linkedin_url"].rsplit("/", 1)[1] for p in profiles]
+
+
+def test_rank_by_jd_similarity_orders_best_match_first():
+    index = JDChunkIndex.from_texts(JD_CHUNKS, EMBED)
+    assert _urls(rank_by_jd_similarity(PROFILES, index, EMBED)) == ["mle", "swe", "chef"]
+
+
+def test_rank_by_jd_similarity_applies_top_k_and_min_similarity():
+    index = JDChunkIndex.from_texts(JD_CHUNKS, EMBED)
+    assert _urls(rank_by_jd_similarity(PROFILES, index, EMBED, top_k=1)) == ["mle"]
+    assert "chef" not in _urls(rank_by_jd_similarity(PROFILES, index, EMBED, min_similarity=0.1))
+
+
+def test_empty_index_scores_zero_and_keeps_order():
+    index = JDChunkIndex.from_texts([], EMBED)
+    assert index.vectors.shape == (0, 0)
+    assert np.array_equal(index.similarity(PROFILES, EMBED), np.zeros(len(PROFILES)))
+    assert _urls(rank_by_jd_similarity(PROFILES, index, EMBED)) == ["chef", "mle", "swe"]
+    assert JDChunkIndex(None, []).texts == []
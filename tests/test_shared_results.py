@@ -0,0 +1,32 @@
+from src.shared_results import SharedResults
+
+
+def test_results_are_memoized():
+    shared = SharedResults()
+    calls = []
+    assert shared.get_or_compute("k", lambda: calls.append(1) or ["a"]) == ["a"]
+    assert shared.get_or_compute("k", lambda: calls.append(1) or ["b"]) == ["a"]
+    assert len(calls) == 1
+    assert shared.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_empty_results_are_retried():
+    shared = SharedResults()
+    assert shared.get_or_compute("profile", lambda: None) is None
+    assert shared.get_or_compute("profile", lambda: {"data": 1}) == {"data": 1}
+    assert shared.get_or_compute("search", lambda: []) == []
+    assert shared.get_or_compute("search", lambda: ["url"]) == ["url"]
+    assert shared.stats()["misses"] == 4
+
+
+def test_exceptions_are_retried():
+    shared = SharedResults()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    try:
+        shared.get_or_compute("k", fail)
+    except RuntimeError:
+        pass
+    assert shared.get_or_compute("k", lambda: 1) == 1